@@ -1,3 +1,22 @@
+from .dates import *
 from .aircraft import *
 from .passenger import *
-from .flight import *
\ No newline at end of file
+from .flight import *
+from .registry import *
+from .database import *
+from .schema import *
+from .importer import *
+from .stats import *
+from .report import *
+from .schedule import *
+from .booking import *
+from .api import *
+from .journal import *
+from .analytics import *
+from .profiling import *
+from .manifests import *
+from .cache import *
+from .routes import *
+from .search import *
+from .history import *
+from .sharding import *
\ No newline at end of file
@@ -1,11 +1,14 @@
+import sys
 from abc import ABC, abstractmethod
 
 __all__ = ['Aircraft']
 
 
 class Aircraft(ABC):
+    __slots__ = ('_model', '_capacity', '_registration', '_is_available')
+
     def __init__(self, model: str, capacity: int, registration: str):
-        self._model = model
+        self._model = sys.intern(model)
         self._capacity = capacity
         self._registration = registration
         self._is_available = True
@@ -38,6 +41,8 @@ class Aircraft(ABC):
 
 
 class Aircraft(Aircraft):
+    __slots__ = ()
+
     def get_aircraft_info(self):
         return (f"Самолёт: {self._model}\n"
                 f"Регистрация: {self._registration}\n"
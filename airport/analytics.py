@@ -0,0 +1,148 @@
+import heapq
+from array import array
+from functools import lru_cache
+
+__all__ = ['FlightColumns', 'LoadFactorAnalytics']
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class _Codes:
+    __slots__ = ('codes', 'names')
+
+    def __init__(self):
+        self.codes = {}
+        self.names = []
+
+    def __call__(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+class FlightColumns:
+    FIELDS = ('route', 'model', 'hour', 'month', 'booked', 'capacity', 'cancelled')
+
+    def __init__(self):
+        self.numbers = []
+        self._routes = _Codes()
+        self._models = _Codes()
+        self._months = _Codes()
+        self._columns = {field: array('l') for field in self.FIELDS}
+
+    @property
+    def routes(self):
+        return self._routes.names
+    @property
+    def models(self):
+        return self._models.names
+    @property
+    def months(self):
+        return self._months.names
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def append(self, number, departure, destination, hour, month, model, booked, capacity, cancelled):
+        self.numbers.append(number)
+        columns = self._columns
+        columns['route'].append(self._routes((departure, destination)))
+        columns['model'].append(self._models(model))
+        columns['hour'].append(hour)
+        columns['month'].append(self._months(month))
+        columns['booked'].append(booked)
+        columns['capacity'].append(capacity)
+        columns['cancelled'].append(1 if cancelled else 0)
+
+    def column(self, field):
+        values = self._columns[field]
+        np = _numpy()
+        return np.frombuffer(values, dtype=f'i{values.itemsize}') if np is not None else values
+
+    @classmethod
+    def from_database(cls, db, batch_size: int = 10000):
+        columns = cls()
+        cursor = db.connection().cursor()
+        cursor.execute('''
+            SELECT f.flight_number, f.departure, f.destination,
+                   CAST(strftime('%H', f.departure_time) AS INTEGER), strftime('%Y-%m', f.departure_time),
+                   a.model, COALESCE(b.booked, 0), a.capacity, f.is_cancelled
+            FROM flights f
+            JOIN aircrafts a ON a.registration = f.aircraft_registration
+            LEFT JOIN (SELECT flight_id, COUNT(*) AS booked FROM bookings GROUP BY flight_id) b ON b.flight_id = f.rowid
+        ''')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return columns
+            for row in rows:
+                columns.append(*row)
+
+    @classmethod
+    def from_flights(cls, flights):
+        columns = cls()
+        for f in flights:
+            columns.append(f.flight_number, f.departure, f.destination, f.departure_time.hour,
+                           f.departure_time.strftime('%Y-%m'), f.aircraft.model, f.passenger_count,
+                           f.aircraft.capacity, f.is_cancelled)
+        return columns
+
+
+class LoadFactorAnalytics:
+    def __init__(self, columns: FlightColumns):
+        self._columns = columns
+
+    def _group(self, field, names):
+        c = self._columns
+        keys, booked, capacity, cancelled = (c.column(name) for name in (field, 'booked', 'capacity', 'cancelled'))
+        size = len(names)
+        np = _numpy()
+        if np is not None:
+            active = cancelled == 0
+            keys = keys[active]
+            flights = np.bincount(keys, minlength=size)
+            passengers = np.bincount(keys, weights=booked[active], minlength=size)
+            seats = np.bincount(keys, weights=capacity[active], minlength=size)
+        else:
+            flights, passengers, seats = [0] * size, [0] * size, [0] * size
+            for key, b, cap, cancel in zip(keys, booked, capacity, cancelled):
+                if not cancel:
+                    flights[key] += 1
+                    passengers[key] += b
+                    seats[key] += cap
+        return {names[i]: {'flights': int(flights[i]), 'passengers': int(passengers[i]), 'seats': int(seats[i]),
+                           'load_factor': passengers[i] / seats[i] * 100 if seats[i] else 0.0}
+                for i in range(size) if flights[i]}
+
+    def by_route(self):
+        return self._group('route', self._columns.routes)
+    def by_model(self):
+        return self._group('model', self._columns.models)
+    def by_hour(self):
+        return self._group('hour', list(range(24)))
+    def by_month(self):
+        return self._group('month', self._columns.months)
+
+    def underfilled(self, n: int = 10):
+        c = self._columns
+        booked, capacity, cancelled = c.column('booked'), c.column('capacity'), c.column('cancelled')
+        np = _numpy()
+        if np is not None:
+            rates = np.where(cancelled == 0, booked / capacity * 100, np.inf)
+            count = min(n, int((cancelled == 0).sum()))
+            if count == 0:
+                return []
+            top = np.argpartition(rates, count - 1)[:count]
+            top = top[np.argsort(rates[top], kind='stable')]
+            return [(c.numbers[i], float(rates[i])) for i in top]
+        rates = ((b / cap * 100, i) for i, (b, cap, cancel) in enumerate(zip(booked, capacity, cancelled)) if not cancel)
+        return [(c.numbers[i], rate) for rate, i in heapq.nsmallest(n, rates)]
@@ -0,0 +1,259 @@
+import json
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit, parse_qs, unquote
+
+__all__ = ['ApiServer', 'LatencyMetrics', 'flight_to_dict', 'passenger_to_dict']
+
+from airport import Passenger
+from airport import Flight
+from airport import parse_datetime
+
+STATUS_TEXT = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 409: 'Conflict', 500: 'Internal Server Error'}
+
+
+def flight_to_dict(flight: Flight):
+    return {'flight_number': flight.flight_number,
+            'departure': flight.departure,
+            'destination': flight.destination,
+            'departure_time': flight.departure_time.strftime('%Y-%m-%d %H:%M'),
+            'arrival_time': flight.arrival_time.strftime('%Y-%m-%d %H:%M'),
+            'duration_minutes': flight.duration_min,
+            'aircraft': flight.aircraft.registration,
+            'capacity': flight.aircraft.capacity,
+            'passengers': flight.passenger_count,
+            'available_seats': flight.available_seats,
+            'is_cancelled': flight.is_cancelled}
+
+
+def passenger_to_dict(passenger: Passenger):
+    return {'passport': passenger.passport,
+            'name': passenger.name,
+            'surname': passenger.surname,
+            'patronymic': passenger.patronymic,
+            'date_of_birth': passenger.date_of_birth.strftime('%Y-%m-%d')}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyMetrics:
+    def __init__(self, window: int = 10000):
+        self._window = window
+        self._samples = {}
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None:
+                samples = self._samples[route] = deque(maxlen=self._window)
+            samples.append(seconds)
+            self._counts[route] = self._counts.get(route, 0) + 1
+            self._totals[route] = self._totals.get(route, 0.0) + seconds
+
+    @staticmethod
+    def percentile(ordered, q):
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self):
+        with self._lock:
+            samples = {route: sorted(values) for route, values in self._samples.items()}
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+        return {route: {'count': counts[route],
+                        'total_ms': totals[route] * 1000,
+                        'p50_ms': self.percentile(ordered, 50) * 1000,
+                        'p95_ms': self.percentile(ordered, 95) * 1000,
+                        'p99_ms': self.percentile(ordered, 99) * 1000,
+                        'max_ms': ordered[-1] * 1000}
+                for route, ordered in samples.items()}
+
+
+class ApiServer:
+    def __init__(self, system, host: str = '127.0.0.1', port: int = 8080, workers: int = 4):
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        self._asyncio = asyncio
+        self._system = system
+        self._host = host
+        self._port = port
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='airport-api')
+        self._resolve_lock = threading.Lock()
+        self._metrics = LatencyMetrics()
+        self._server = None
+
+    @property
+    def metrics(self):
+        return self._metrics
+    @property
+    def port(self):
+        return self._port
+
+    async def start(self):
+        self._server = await self._asyncio.start_server(self._handle_connection, self._host, self._port)
+        self._port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func, *args):
+        return await self._asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write((f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                      f"Content-Type: application/json; charset=utf-8\r\n"
+                      f"Content-Length: {len(data)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + data)
+        await writer.drain()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Некорректный HTTP-запрос"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload, route = await self._dispatch(method, target, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, self._asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        started = time.perf_counter()
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.split('/') if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        route = '/' + '/'.join(parts[:1] + ['{id}' for _ in parts[1:2]] + parts[2:])
+        try:
+            if method == 'GET' and parts == ['flights']:
+                status, payload = 200, await self._run(self._list_flights, query)
+            elif method == 'GET' and len(parts) == 2 and parts[0] == 'flights':
+                status, payload = 200, await self._run(self._get_flight, parts[1])
+            elif method == 'GET' and len(parts) == 3 and parts[0] == 'flights' and parts[2] == 'passengers':
+                status, payload = 200, await self._run(self._manifest, parts[1])
+            elif method == 'GET' and len(parts) == 3 and parts[0] == 'passengers' and parts[2] == 'history':
+                status, payload = 200, await self._run(self._history, parts[1], query)
+            elif method == 'GET' and len(parts) == 3 and parts[0] == 'passengers' and parts[2] == 'summary':
+                status, payload = 200, await self._run(self._history_summary, parts[1], query)
+            elif method == 'POST' and parts == ['bookings']:
+                data = json.loads(body or b'{}')
+                if not isinstance(data, dict):
+                    raise HttpError(400, "Ожидается JSON-объект")
+                status, payload = 201, await self._run(self._book, data)
+            elif method == 'GET' and parts == ['statistics']:
+                status, payload = 200, self._system.stats.snapshot().as_dict()
+            elif method == 'GET' and parts == ['metrics']:
+                status, payload = 200, self._metrics.summary()
+            elif method == 'GET' and parts == ['cache']:
+                status, payload = 200, self._system.cache_stats()
+            else:
+                raise HttpError(404, "Ресурс не найден")
+        except HttpError as e:
+            status, payload = e.status, {'error': str(e)}
+        except (ValueError, KeyError) as e:
+            status, payload = 400, {'error': f"Ошибка в данных: {e}"}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+        self._metrics.record(f"{method} {route}", time.perf_counter() - started)
+        return status, payload, route
+
+    def _flight(self, flight_number):
+        with self._resolve_lock:
+            flight = self._system.get_flight(flight_number)
+        if flight is None:
+            raise HttpError(404, f"Рейс {flight_number} не найден")
+        return flight
+
+    def _list_flights(self, query):
+        page_size = self._page_size(query)
+        active_only = query.get('active', '0') in ('1', 'true')
+        after = query.get('after')
+        with self._resolve_lock:
+            for page in self._system.flight_pages(active_only, page_size, after):
+                return {'flights': [flight_to_dict(f) for f in page],
+                        'next': page[-1].flight_number if len(page) == page_size else None}
+        return {'flights': [], 'next': None}
+
+    def _get_flight(self, flight_number):
+        return flight_to_dict(self._flight(flight_number))
+
+    def _manifest(self, flight_number):
+        flight = self._flight(flight_number)
+        with self._resolve_lock:
+            passengers = flight.get_passengers()
+        return {'flight_number': flight_number, 'passengers': [passenger_to_dict(p) for p in passengers]}
+
+    @staticmethod
+    def _page_size(query):
+        try:
+            page_size = int(query.get('page_size', 50))
+        except ValueError:
+            raise HttpError(400, f"Некорректный размер страницы: {query['page_size']}")
+        return max(1, min(page_size, 500))
+
+    @staticmethod
+    def _period(query):
+        start, end = query.get('start'), query.get('end')
+        return parse_datetime(start) if start else None, parse_datetime(end) if end else None
+
+    def _history(self, passport, query):
+        page_size = self._page_size(query)
+        page = self._system.history.page(passport, *self._period(query), page_size, query.get('after'))
+        return {'passport': passport, 'flights': [entry.as_dict() for entry in page],
+                'next': page[-1].flight_number if len(page) == page_size else None}
+
+    def _history_summary(self, passport, query):
+        return {'passport': passport, **self._system.history.summary(passport, *self._period(query))}
+
+    def _book(self, data):
+        flight = self._flight(data['flight_number'])
+        with self._resolve_lock:
+            passenger = self._system.get_passenger(data['passport'])
+        if passenger is None:
+            raise HttpError(404, f"Пассажир {data['passport']} не найден")
+        if not self._system.booking.book(flight, passenger):
+            raise HttpError(409, "Не удалось забронировать: рейс заполнен, отменён или пассажир уже на рейсе")
+        return {'flight_number': flight.flight_number, 'passport': passenger.passport,
+                'available_seats': flight.available_seats}
@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+__all__ = ['BookingService', 'CancellationReport']
+
+from airport import Passenger
+from airport import Flight
+from airport import Database
+from airport import timestamp
+from airport import RESERVE_BOOKING
+
+
+class CancellationReport:
+    def __init__(self, flights, bookings):
+        self._flights = list(flights)
+        self._bookings = list(bookings)
+
+    @property
+    def flights(self):
+        return self._flights
+    @property
+    def bookings(self):
+        return self._bookings
+    @property
+    def released(self):
+        return len(self._bookings)
+    @property
+    def passengers(self):
+        return list({p.passport: p for _, p in self._bookings}.values())
+    @property
+    def affected(self):
+        result = {}
+        for flight_number, passenger in self._bookings:
+            result.setdefault(passenger.passport, []).append(flight_number)
+        return result
+
+    def __str__(self):
+        return (f"Отменено рейсов: {len(self._flights)}, снято бронирований: {self.released}, "
+                f"затронуто пассажиров: {len(self.affected)}")
+
+
+class BookingService:
+    def __init__(self, db: Database):
+        self._db = db
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def lock_for(self, flight_number: str):
+        with self._guard:
+            lock = self._locks.get(flight_number)
+            if lock is None:
+                lock = self._locks[flight_number] = threading.RLock()
+            return lock
+
+    def reserve(self, flight_number: str, passport: str) -> bool:
+        with self._db.transaction() as conn:
+            try:
+                cursor = conn.execute(RESERVE_BOOKING,
+                                      (passport, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), flight_number))
+            except sqlite3.IntegrityError:
+                return False
+            return cursor.rowcount == 1
+
+    def release(self, flight_number: str, passport: str) -> bool:
+        with self.lock_for(flight_number):
+            cursor = self._db.execute('DELETE FROM bookings WHERE flight_number = ? AND passenger_passport = ?',
+                                      (flight_number, passport))
+            return cursor.rowcount == 1
+
+    def book(self, flight: Flight, passenger: Passenger) -> bool:
+        with self._db.transaction(), self.lock_for(flight.flight_number):
+            if flight.is_cancelled or passenger in flight:
+                return False
+            if not self.reserve(flight.flight_number, passenger.passport):
+                return False
+            if not flight.add_passenger(passenger):
+                self.release(flight.flight_number, passenger.passport)
+                return False
+            return True
+
+    def cancel_booking(self, flight: Flight, passenger: Passenger) -> bool:
+        with self._db.transaction(), self.lock_for(flight.flight_number):
+            released = self.release(flight.flight_number, passenger.passport)
+            flight.remove_passenger(passenger)
+            return released
+
+    def booked_count(self, flight_number: str) -> int:
+        return self._db.query('SELECT COUNT(*) FROM bookings WHERE flight_number = ?', (flight_number,))[0][0]
+
+    @staticmethod
+    def cancellation_filter(airport=None, departure=None, destination=None, start=None, end=None,
+                            aircraft=None, flight_numbers=None):
+        clauses, params = [], []
+        if airport is not None:
+            clauses.append('(departure = ? OR destination = ?)')
+            params += [airport, airport]
+        for column, value in (('departure', departure), ('destination', destination),
+                              ('aircraft_registration', aircraft)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if start is not None:
+            clauses.append('departure_ts >= ?')
+            params.append(timestamp(start))
+        if end is not None:
+            clauses.append('departure_ts < ?')
+            params.append(timestamp(end))
+        if flight_numbers is not None:
+            clauses.append('flight_number IN (SELECT value FROM json_each(?))')
+            params.append(json.dumps(list(flight_numbers)))
+        if not clauses:
+            raise ValueError("Не задано ни одного условия отмены")
+        return ' AND '.join(['is_cancelled = 0'] + clauses), params
+
+    def cancel_flights(self, **predicates):
+        where, params = self.cancellation_filter(**predicates)
+        selected = f'SELECT flight_number FROM flights WHERE {where}'
+        with self._db.transaction() as conn:
+            bookings = conn.execute(f'''
+                SELECT b.flight_number, p.passport, p.name, p.surname, p.patronymic, p.date_of_birth
+                FROM bookings b JOIN passengers p ON p.passport = b.passenger_passport
+                WHERE b.flight_number IN ({selected})
+                ORDER BY b.id
+            ''', params).fetchall()
+            conn.execute(f'DELETE FROM bookings WHERE flight_number IN ({selected})', params)
+            flights = [row[0] for row in conn.execute(
+                f'UPDATE flights SET is_cancelled = 1 WHERE {where} RETURNING flight_number', params)]
+        return flights, bookings
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+
+__all__ = ['ObjectCache']
+
+
+class ObjectCache:
+    def __init__(self, max_size: int = 10000, ttl: float = None, clock=time.monotonic):
+        if max_size <= 0:
+            raise ValueError("Размер кэша должен быть положительным")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def max_size(self):
+        return self._max_size
+    @property
+    def ttl(self):
+        return self._ttl
+    @property
+    def hits(self):
+        return self._hits
+    @property
+    def misses(self):
+        return self._misses
+    @property
+    def hit_rate(self):
+        total = self._hits + self._misses
+        return self._hits / total * 100 if total else 0.0
+
+    def _fresh(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored = entry
+        if self._ttl is not None and self._clock() - stored > self._ttl:
+            del self._entries[key]
+            self._expirations += 1
+            return None
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._fresh(key)
+            if value is None:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def peek(self, key, default=None):
+        with self._lock:
+            value = self._fresh(key)
+            return default if value is None else value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+        if value is None:
+            value = loader(key)
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'max_size': self._max_size, 'ttl': self._ttl,
+                    'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                    'expirations': self._expirations, 'hit_rate': self.hit_rate}
+
+    def __contains__(self, key):
+        return self.peek(key) is not None
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+__all__ = ['Database']
+
+
+class Database:
+    def __init__(self, db_name: str, synchronous: str = 'NORMAL', cache_size: int = -20000, timeout: float = 30.0):
+        self._db_name = db_name
+        self._timeout = timeout
+        self._synchronous = synchronous
+        self._cache_size = cache_size
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._trace = None
+        self._begin_hook = None
+        self._functions = {}
+
+    @property
+    def db_name(self):
+        return self._db_name
+
+    def _connect(self):
+        conn = sqlite3.connect(self._db_name, timeout=self._timeout, isolation_level=None,
+                               check_same_thread=False)
+        if self._db_name != ':memory:':
+            conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f'PRAGMA synchronous = {self._synchronous}')
+        conn.execute(f'PRAGMA cache_size = {int(self._cache_size)}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.set_trace_callback(self._trace)
+        for name, (nargs, func) in self._functions.items():
+            conn.create_function(name, nargs, func, deterministic=True)
+        return conn
+
+    def set_trace(self, callback):
+        with self._lock:
+            self._trace = callback
+            for conn in self._connections:
+                conn.set_trace_callback(callback)
+
+    def set_begin_hook(self, callback):
+        self._begin_hook = callback
+
+    def create_function(self, name: str, nargs: int, func):
+        with self._lock:
+            self._functions[name] = (nargs, func)
+            for conn in self._connections:
+                conn.create_function(name, nargs, func, deterministic=True)
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @property
+    def in_transaction(self):
+        return getattr(self._local, 'depth', 0) > 0
+    @property
+    def total_changes(self):
+        conn = getattr(self._local, 'conn', None)
+        return conn.total_changes if conn is not None else 0
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        if self._local.depth == 0:
+            conn.execute('BEGIN IMMEDIATE')
+        self._local.depth += 1
+        try:
+            if self._local.depth == 1 and self._begin_hook is not None:
+                self._begin_hook(conn)
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute('ROLLBACK')
+            raise
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            conn.execute('COMMIT')
+
+    def execute(self, sql: str, params=()):
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql: str, rows):
+        with self.transaction() as conn:
+            return conn.executemany(sql, rows)
+
+    def query(self, sql: str, params=()):
+        return self.connection().execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
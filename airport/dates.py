@@ -0,0 +1,41 @@
+import re
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+__all__ = ['parse_date', 'parse_datetime', 'today', 'DATE_FORMAT', 'DATETIME_FORMAT']
+
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+_ISO_DATE = re.compile(r'(\d{4})-(\d\d)-(\d\d)', re.ASCII)
+_ISO_DATETIME = re.compile(r'(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d)', re.ASCII)
+
+
+@lru_cache(maxsize=65536)
+def parse_date(value: str) -> date:
+    match = _ISO_DATE.fullmatch(value)
+    if match is None:
+        return datetime.strptime(value, DATE_FORMAT).date()
+    return date(*map(int, match.groups()))
+
+
+@lru_cache(maxsize=65536)
+def parse_datetime(value: str) -> datetime:
+    match = _ISO_DATETIME.fullmatch(value)
+    if match is None:
+        return datetime.strptime(value, DATETIME_FORMAT)
+    return datetime(*map(int, match.groups()))
+
+
+_today = None
+_midnight = 0.0
+
+
+def today() -> date:
+    global _today, _midnight
+    if time.time() >= _midnight:
+        current = datetime.now().date()
+        _midnight = datetime.combine(current + timedelta(days=1), datetime.min.time()).timestamp()
+        _today = current
+    return _today
@@ -1,3 +1,4 @@
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 
@@ -5,19 +6,41 @@ __all__ = ['Flight']
 
 from airport import Aircraft
 from airport import Passenger
+from airport import parse_datetime
 
 
 class Flight(ABC):
+    __slots__ = ('_flight_number', '_departure', '_destination', '_departure_time', '_aircraft',
+                 '_duration_min', '_passengers', '_passenger_loader', '_observer', '_is_cancelled')
+
     def __init__(self, flight_number: str, departure: str, destination: str, departure_time: str, aircraft: Aircraft, duration_min: int):
         self._flight_number = flight_number
-        self._departure = departure
-        self._destination = destination
-        self._departure_time = datetime.strptime(departure_time, "%Y-%m-%d %H:%M")
+        self._departure = sys.intern(departure)
+        self._destination = sys.intern(destination)
+        self._departure_time = parse_datetime(departure_time)
         self._aircraft = aircraft
         self._duration_min = duration_min
-        self._passengers = []
+        self._passengers = {}
+        self._passenger_loader = None
+        self._observer = None
         self._is_cancelled = False
 
+    @classmethod
+    def from_row(cls, flight_number: str, departure: str, destination: str, departure_time, aircraft: Aircraft,
+                 duration_min: int, is_cancelled: bool = False):
+        flight = cls.__new__(cls)
+        flight._flight_number = flight_number
+        flight._departure = sys.intern(departure)
+        flight._destination = sys.intern(destination)
+        flight._departure_time = (departure_time if isinstance(departure_time, datetime)
+                                  else parse_datetime(departure_time))
+        flight._aircraft = aircraft
+        flight._duration_min = duration_min
+        flight._passengers = {}
+        flight._passenger_loader = None
+        flight._observer = None
+        flight._is_cancelled = bool(is_cancelled)
+        return flight
 
     @property
     def flight_number(self):
@@ -45,9 +68,13 @@ class Flight(ABC):
         return self._is_cancelled
     @is_cancelled.setter
     def is_cancelled(self, value: bool):
+        changed = self._is_cancelled != value
         self._is_cancelled = value
+        if changed and self._observer is not None:
+            self._observer.flight_status_changed(self)
     @property
     def passenger_count(self):
+        self._load_passengers()
         return len(self._passengers)
     @property
     def available_seats(self):
@@ -57,25 +84,47 @@ class Flight(ABC):
         return self.passenger_count / self._aircraft.capacity * 100
 
 
+    def set_passenger_loader(self, loader):
+        self._passenger_loader = loader
+    def set_observer(self, observer):
+        self._observer = observer
+
+    def _load_passengers(self):
+        if self._passenger_loader is not None:
+            loader, self._passenger_loader = self._passenger_loader, None
+            for passenger in loader(self):
+                if passenger.passport not in self._passengers:
+                    self._passengers[passenger.passport] = passenger
+
     def add_passenger(self, passenger: 'Passenger') -> bool:
         if self.passenger_count >= self._aircraft.capacity:
             return False
-        if passenger not in self._passengers:
-            self._passengers.append(passenger)
-            passenger.book_flight(self._flight_number)
+        if passenger.passport not in self._passengers:
+            self._passengers[passenger.passport] = passenger
+            if self._observer is not None:
+                self._observer.passenger_added(self, passenger)
             return True
         return False
 
     def remove_passenger(self, passenger:'Passenger'):
-        if passenger in self._passengers:
-            self._passengers.remove(passenger)
+        self._load_passengers()
+        removed = self._passengers.pop(passenger.passport, None)
+        if removed is not None:
+            if self._observer is not None:
+                self._observer.passenger_removed(self, passenger)
 
     def get_passengers(self):
-        return self._passengers.copy()
+        self._load_passengers()
+        return list(self._passengers.values())
 
     def cancel_flight(self):
+        self._load_passengers()
+        was_cancelled = self._is_cancelled
+        passenger_count = len(self._passengers)
         self._is_cancelled = True
         self._passengers.clear()
+        if self._observer is not None:
+            self._observer.flight_cancelled(self, passenger_count, was_cancelled)
 
     def get_flight_info(self):
         status = "Отменён" if self._is_cancelled else "По расписанию"
@@ -94,6 +143,7 @@ class Flight(ABC):
     def __repr__(self):
         return f"Flight(number='{self._flight_number}', departure='{self._departure}', destination='{self._destination}')"
     def __contains__(self, passenger):
-        return passenger in self._passengers
+        self._load_passengers()
+        return isinstance(passenger, Passenger) and passenger.passport in self._passengers
     def __len__(self):
-        return len(self._passengers)
\ No newline at end of file
+        return self.passenger_count
\ No newline at end of file
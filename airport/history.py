@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+__all__ = ['BookingHistory', 'HistoryEntry']
+
+from airport import Database
+from airport import parse_datetime, timestamp
+
+
+class HistoryEntry:
+    __slots__ = ('_flight_number', '_departure', '_destination', '_departure_time', '_duration', '_booking_time')
+
+    def __init__(self, flight_number, departure, destination, departure_time, duration_min, booking_time):
+        self._flight_number = flight_number
+        self._departure = departure
+        self._destination = destination
+        self._departure_time = parse_datetime(departure_time)
+        self._duration = duration_min
+        self._booking_time = booking_time
+
+    @property
+    def flight_number(self):
+        return self._flight_number
+    @property
+    def departure(self):
+        return self._departure
+    @property
+    def destination(self):
+        return self._destination
+    @property
+    def route(self):
+        return self._departure, self._destination
+    @property
+    def departure_time(self):
+        return self._departure_time
+    @property
+    def arrival_time(self):
+        return self._departure_time + timedelta(minutes=self._duration)
+    @property
+    def duration_min(self):
+        return self._duration
+    @property
+    def booking_time(self):
+        return self._booking_time
+
+    def as_dict(self):
+        return {'flight_number': self._flight_number, 'departure': self._departure,
+                'destination': self._destination,
+                'departure_time': self._departure_time.strftime('%Y-%m-%d %H:%M'),
+                'duration_min': self._duration, 'booking_time': self._booking_time}
+
+    def __str__(self):
+        return (f"{self._flight_number}: {self._departure} → {self._destination}, "
+                f"{self._departure_time.strftime('%Y-%m-%d %H:%M')}")
+    def __repr__(self):
+        return f"HistoryEntry('{self._flight_number}', '{self._departure}', '{self._destination}')"
+
+
+class BookingHistory:
+    PAGE_SIZE = 20
+    FROM = '''
+        FROM bookings b JOIN flights f ON f.rowid = b.flight_id
+        WHERE b.passenger_passport = ? AND f.is_cancelled = 0
+    '''
+
+    def __init__(self, db: Database):
+        self._db = db
+
+    def _where(self, passport, start=None, end=None):
+        query, params = self.FROM, [passport]
+        if start is not None:
+            query += ' AND f.departure_ts >= ?'
+            params.append(timestamp(start))
+        if end is not None:
+            query += ' AND f.departure_ts < ?'
+            params.append(timestamp(end))
+        return query, params
+
+    def count(self, passport: str, start=None, end=None) -> int:
+        where, params = self._where(passport, start, end)
+        return self._db.query(f'SELECT COUNT(*) {where}', params)[0][0]
+
+    def flight_numbers(self, passport: str, start=None, end=None):
+        where, params = self._where(passport, start, end)
+        return [row[0] for row in self._db.query(f'SELECT f.flight_number {where} ORDER BY b.id', params)]
+
+    def cursor(self, flight_number: str):
+        rows = self._db.query('SELECT departure_ts FROM flights WHERE flight_number = ?', (flight_number,))
+        return (rows[0][0], flight_number) if rows else None
+
+    def page(self, passport: str, start=None, end=None, page_size: int = None, after=None):
+        where, params = self._where(passport, start, end)
+        if isinstance(after, str):
+            after = self.cursor(after)
+            if after is None:
+                return []
+        if after is not None:
+            where += ' AND (f.departure_ts, f.flight_number) < (?, ?)'
+            params += list(after)
+        rows = self._db.query(f'''
+            SELECT f.flight_number, f.departure, f.destination, f.departure_time, f.duration_minutes, b.booking_time
+            {where}
+            ORDER BY f.departure_ts DESC, f.flight_number DESC
+            LIMIT ?
+        ''', params + [page_size or self.PAGE_SIZE])
+        return [HistoryEntry(*row) for row in rows]
+
+    def pages(self, passport: str, start=None, end=None, page_size: int = None):
+        page_size = page_size or self.PAGE_SIZE
+        after = None
+        while True:
+            page = self.page(passport, start, end, page_size, after)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after = page[-1].flight_number
+
+    def flights_per_year(self, passport: str, start=None, end=None):
+        where, params = self._where(passport, start, end)
+        return {int(year): count for year, count in self._db.query(f'''
+            SELECT substr(f.departure_time, 1, 4) AS year, COUNT(*) {where}
+            GROUP BY year ORDER BY year
+        ''', params)}
+
+    def top_routes(self, passport: str, n: int = 5, start=None, end=None):
+        where, params = self._where(passport, start, end)
+        return [((dep, dest), count) for dep, dest, count in self._db.query(f'''
+            SELECT f.departure, f.destination, COUNT(*) AS flights {where}
+            GROUP BY f.departure, f.destination
+            ORDER BY flights DESC, f.departure, f.destination
+            LIMIT ?
+        ''', params + [n])]
+
+    def summary(self, passport: str, start=None, end=None, routes: int = 5):
+        return {'flights': self.count(passport, start, end),
+                'per_year': self.flights_per_year(passport, start, end),
+                'top_routes': [{'departure': dep, 'destination': dest, 'flights': count}
+                               for (dep, dest), count in self.top_routes(passport, routes, start, end)]}
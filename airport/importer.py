@@ -0,0 +1,210 @@
+import csv
+import json
+import os
+import sqlite3
+from datetime import datetime
+from itertools import islice
+
+__all__ = ['BulkImporter', 'ImportReport']
+
+from airport import Aircraft
+from airport import Passenger
+from airport import Flight
+from airport import Database
+from airport.schema import UPSERT_AIRCRAFT, UPSERT_PASSENGER, UPSERT_FLIGHT, RESERVE_BOOKING
+
+SQLITE_MAX_PARAMS = 900
+
+
+class ImportReport:
+    def __init__(self, kind: str):
+        self._kind = kind
+        self._accepted = 0
+        self._rejected = []
+
+    @property
+    def kind(self):
+        return self._kind
+    @property
+    def accepted(self):
+        return self._accepted
+    @property
+    def rejected(self):
+        return self._rejected.copy()
+
+    def accept(self, count: int):
+        self._accepted += count
+    def reject(self, line: int, reason: str):
+        self._rejected.append((line, reason))
+
+    def __str__(self):
+        return f"Импорт {self._kind}: принято {self._accepted}, отклонено {len(self._rejected)}"
+
+
+class BulkImporter:
+    KINDS = ('aircrafts', 'passengers', 'flights', 'bookings')
+
+    def __init__(self, db: Database, registry=None, chunk_size: int = 5000, schedule=None):
+        self._db = db
+        self._registry = registry
+        self._schedule = schedule
+        self._chunk_size = chunk_size
+
+    @staticmethod
+    def read_rows(path: str):
+        if os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson'):
+            with open(path, encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    if line.strip():
+                        yield line_no, json.loads(line)
+        else:
+            with open(path, encoding='utf-8', newline='') as f:
+                for line_no, row in enumerate(csv.DictReader(f), 2):
+                    yield line_no, row
+
+    def chunks(self, rows):
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self._chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def import_file(self, kind: str, path: str) -> ImportReport:
+        return self.import_rows(kind, self.read_rows(path))
+
+    def import_rows(self, kind: str, rows) -> ImportReport:
+        if kind not in self.KINDS:
+            raise ValueError(f"Неизвестный тип данных: {kind}")
+        report = ImportReport(kind)
+        handler = getattr(self, f"_import_{kind}")
+        for chunk in self.chunks(rows):
+            handler(chunk, report)
+        return report
+
+    def _existing(self, table: str, key: str, columns: str, values):
+        values = list(set(values))
+        found = {}
+        for i in range(0, len(values), SQLITE_MAX_PARAMS):
+            part = values[i:i + SQLITE_MAX_PARAMS]
+            marks = ', '.join('?' * len(part))
+            for row in self._db.query(f'SELECT {columns} FROM {table} WHERE {key} IN ({marks})', part):
+                found[row[0]] = row
+        return found
+
+    def _import_aircrafts(self, chunk, report):
+        accepted = []
+        for line_no, row in chunk:
+            try:
+                capacity = int(row['capacity'])
+                if capacity <= 0:
+                    raise ValueError("вместимость должна быть положительной")
+                accepted.append(Aircraft(row['model'], capacity, row['registration']))
+            except (KeyError, ValueError, TypeError) as e:
+                report.reject(line_no, str(e))
+        with self._db.transaction() as conn:
+            conn.executemany(UPSERT_AIRCRAFT, [(a.registration, a.model, a.capacity) for a in accepted])
+        if self._registry is not None:
+            for aircraft in accepted:
+                self._registry.add_aircraft(aircraft)
+        report.accept(len(accepted))
+
+    def _import_passengers(self, chunk, report):
+        accepted = []
+        for line_no, row in chunk:
+            try:
+                accepted.append(Passenger(row['passport'], row['name'], row['surname'],
+                                          row['patronymic'], row['date_of_birth']))
+            except (KeyError, ValueError, TypeError) as e:
+                report.reject(line_no, str(e))
+        with self._db.transaction() as conn:
+            conn.executemany(UPSERT_PASSENGER, [(p.passport, p.name, p.surname, p.patronymic, p.date_of_birth.strftime('%Y-%m-%d'))
+                  for p in accepted])
+        if self._registry is not None:
+            for passenger in accepted:
+                self._registry.add_passenger(passenger)
+        report.accept(len(accepted))
+
+    def _aircraft_lookup(self, registrations):
+        aircrafts = {}
+        missing = []
+        for reg in set(registrations):
+            aircraft = self._registry.get_aircraft(reg) if self._registry is not None else None
+            if aircraft is not None:
+                aircrafts[reg] = aircraft
+            else:
+                missing.append(reg)
+        for reg, (_, model, capacity) in self._existing('aircrafts', 'registration',
+                                                         'registration, model, capacity', missing).items():
+            aircrafts[reg] = Aircraft(model, capacity, reg)
+        return aircrafts
+
+    def _import_flights(self, chunk, report):
+        aircrafts = self._aircraft_lookup(row.get('aircraft_registration') for _, row in chunk)
+        accepted = []
+        for line_no, row in chunk:
+            try:
+                aircraft = aircrafts.get(row['aircraft_registration'])
+                if aircraft is None:
+                    raise ValueError(f"самолёт {row['aircraft_registration']} не найден")
+                duration = int(row['duration_minutes'])
+                if duration <= 0:
+                    raise ValueError("длительность должна быть положительной")
+                flight = Flight(row['flight_number'], row['departure'], row['destination'],
+                                row['departure_time'], aircraft, duration)
+                flight.is_cancelled = str(row.get('is_cancelled') or 0) not in ('0', 'False', 'false')
+                if self._schedule is not None:
+                    conflicts = [] if flight.is_cancelled else self._schedule.flight_conflicts(flight)
+                    if conflicts:
+                        raise ValueError(f"самолёт {aircraft.registration} занят рейсами {', '.join(conflicts)}")
+                    self._schedule.add_flight(flight)
+                accepted.append(flight)
+            except (KeyError, ValueError, TypeError) as e:
+                report.reject(line_no, str(e))
+        with self._db.transaction() as conn:
+            conn.executemany(UPSERT_FLIGHT, [(f.flight_number, f.departure, f.destination, f.departure_time.strftime('%Y-%m-%d %H:%M'),
+                   f.aircraft.registration, f.duration_min, int(f.is_cancelled)) for f in accepted])
+        if self._registry is not None:
+            for flight in accepted:
+                self._registry.add_flight(flight)
+        report.accept(len(accepted))
+
+    def _import_bookings(self, chunk, report):
+        flights = self._existing('flights', 'flight_number', 'flight_number, is_cancelled',
+                                 (row.get('flight_number') for _, row in chunk))
+        passports = self._existing('passengers', 'passport', 'passport',
+                                   (row.get('passenger_passport') for _, row in chunk))
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        accepted = []
+        for line_no, row in chunk:
+            flight_number = row.get('flight_number')
+            passport = row.get('passenger_passport')
+            if flight_number not in flights:
+                report.reject(line_no, f"рейс {flight_number} не найден")
+                continue
+            if flights[flight_number][1]:
+                report.reject(line_no, f"рейс {flight_number} отменён")
+                continue
+            if passport not in passports:
+                report.reject(line_no, f"пассажир {passport} не найден")
+                continue
+            accepted.append((line_no, flight_number, passport, row.get('booking_time') or now))
+        inserted = []
+        with self._db.transaction() as conn:
+            for line_no, flight_number, passport, booking_time in accepted:
+                try:
+                    cursor = conn.execute(RESERVE_BOOKING, (passport, booking_time, flight_number))
+                except sqlite3.IntegrityError:
+                    report.reject(line_no, f"пассажир {passport} уже на рейсе {flight_number}")
+                    continue
+                if cursor.rowcount != 1:
+                    report.reject(line_no, f"рейс {flight_number} заполнен")
+                    continue
+                inserted.append((flight_number, passport))
+        if self._registry is not None:
+            for flight_number, passport in inserted:
+                flight = self._registry.get_flight(flight_number)
+                passenger = self._registry.get_passenger(passport)
+                if flight is not None and passenger is not None:
+                    flight.add_passenger(passenger)
+        report.accept(len(inserted))
@@ -0,0 +1,93 @@
+import json
+import os
+
+__all__ = ['Journal']
+
+
+class Journal:
+    EVENTS = ('aircraft_saved', 'passenger_saved', 'flight_saved', 'booking_added', 'booking_removed',
+              'flight_cancelled', 'flight_status_changed')
+
+    def __init__(self, directory: str, snapshot_interval: int = 10000, fsync: bool = False):
+        self._directory = directory
+        self._snapshot_interval = snapshot_interval
+        self._fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._journal_path = os.path.join(directory, 'journal.jsonl')
+        self._snapshot_path = os.path.join(directory, 'snapshot.json')
+        self._seq = 0
+        self._watermark = None
+        self._since_snapshot = 0
+        self._file = None
+
+    @property
+    def seq(self):
+        return self._seq
+    @property
+    def watermark(self):
+        return self._watermark
+    @property
+    def pending(self):
+        return self._since_snapshot
+    @property
+    def needs_snapshot(self):
+        return self._since_snapshot >= self._snapshot_interval
+
+    def exists(self):
+        return os.path.exists(self._snapshot_path) or os.path.exists(self._journal_path)
+
+    def load(self):
+        snapshot = None
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        last = snapshot['seq'] if snapshot else 0
+        watermark = snapshot.get('watermark') if snapshot else None
+        events = []
+        if os.path.exists(self._journal_path):
+            with open(self._journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        seq, event, data, *rest = json.loads(line)
+                    except ValueError:
+                        break
+                    if seq > last:
+                        events.append((event, data))
+                        last = seq
+                        watermark = rest[0] if rest else None
+        self._seq = last
+        self._watermark = watermark
+        self._since_snapshot = len(events)
+        return snapshot, events
+
+    def append(self, event: str, data, watermark: int = None):
+        if event not in self.EVENTS:
+            raise ValueError(f"Неизвестное событие: {event}")
+        if self._file is None:
+            self._file = open(self._journal_path, 'a', encoding='utf-8')
+        self._seq += 1
+        self._since_snapshot += 1
+        self._watermark = watermark
+        self._file.write(json.dumps([self._seq, event, data, watermark], ensure_ascii=False) + '\n')
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def write_snapshot(self, state: dict, watermark: int = None):
+        state = dict(state, seq=self._seq, watermark=watermark)
+        self._watermark = watermark
+        tmp_path = self._snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._journal_path, 'w', encoding='utf-8')
+        self._since_snapshot = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,176 @@
+import copy
+import csv
+import json
+import os
+
+__all__ = ['ManifestGenerator']
+
+from airport import Aircraft
+from airport import Passenger
+from airport import Flight
+from airport import Database
+from airport import timestamp
+
+SHARD_FLIGHTS = '''
+    SELECT f.flight_number, f.departure, f.destination, f.departure_time, f.duration_minutes, f.is_cancelled,
+           a.registration, a.model, a.capacity
+    FROM flights f JOIN aircrafts a ON a.registration = f.aircraft_registration
+    WHERE f.flight_number IN (SELECT value FROM json_each(?))
+    ORDER BY f.departure_ts, f.flight_number
+'''
+SHARD_PASSENGERS = '''
+    SELECT b.flight_number, p.passport, p.name, p.surname, p.patronymic, p.date_of_birth
+    FROM bookings b JOIN passengers p ON p.passport = b.passenger_passport
+    WHERE b.flight_number IN (SELECT value FROM json_each(?))
+    ORDER BY b.id
+'''
+
+
+def _load_shard(db_name, numbers):
+    db = Database(db_name)
+    try:
+        aircrafts, flights = {}, []
+        for number, dep, dest, dep_time, duration, cancelled, reg, model, capacity in db.query(
+                SHARD_FLIGHTS, (json.dumps(numbers),)):
+            aircraft = aircrafts.get(reg)
+            if aircraft is None:
+                aircraft = aircrafts[reg] = Aircraft(model, capacity, reg)
+            flights.append(Flight.from_row(number, dep, dest, dep_time, aircraft, duration, cancelled))
+        by_number = {f.flight_number: f for f in flights}
+        for number, *row in db.query(SHARD_PASSENGERS, (json.dumps(numbers),)):
+            flight = by_number[number]
+            if not flight.is_cancelled:
+                flight.add_passenger(Passenger.from_row(*row))
+        return flights
+    finally:
+        db.close()
+
+
+def _passenger_lines(flight):
+    passengers = flight.get_passengers()
+    if not passengers:
+        return ["На рейсе нет пассажиров"]
+    return ["Пассажиры:"] + [f"  - {p.full_name} (Паспорт: {p.passport})" for p in passengers]
+
+
+def _write_txt(path, flights):
+    with open(path, 'w', encoding='utf-8') as f:
+        for flight in flights:
+            f.write('\n'.join([flight.get_flight_info(), *_passenger_lines(flight)]) + '\n\n')
+
+
+def _write_csv(path, flights):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['Рейс', 'Откуда', 'Куда', 'Вылет', 'Паспорт', 'ФИО'])
+        for flight in flights:
+            dep_time = flight.departure_time.strftime('%Y-%m-%d %H:%M')
+            writer.writerows((flight.flight_number, flight.departure, flight.destination, dep_time, p.passport, p.full_name)
+                             for p in flight.get_passengers())
+
+
+def _write_docx(path, flights):
+    from docx import Document
+    doc = Document()
+    for flight in flights:
+        doc.add_heading(f"Рейс № {flight.flight_number}", level=1)
+        doc.add_paragraph(flight.get_flight_info().partition('\n')[2])
+        for line in _passenger_lines(flight):
+            doc.add_paragraph(line)
+    doc.save(path)
+
+
+WRITERS = {'docx': _write_docx, 'csv': _write_csv, 'txt': _write_txt}
+
+
+def _render_shard(db_name, numbers, directory, fmt, part):
+    flights = _load_shard(db_name, numbers)
+    write = WRITERS[fmt]
+    if part is not None:
+        path = os.path.join(directory, part)
+        write(path, flights)
+        return [path]
+    paths = []
+    for flight in flights:
+        paths.append(os.path.join(directory, f"{flight.flight_number}.{fmt}"))
+        write(paths[-1], [flight])
+    return paths
+
+
+class ManifestGenerator:
+    FORMATS = tuple(WRITERS)
+
+    def __init__(self, db_name: str, workers: int = None, fmt: str = 'docx', shards_per_worker: int = 4):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Неизвестный формат манифеста: {fmt}")
+        self._db_name = db_name
+        self._workers = workers or os.cpu_count() or 1
+        self._fmt = fmt
+        self._shards_per_worker = shards_per_worker
+
+    @property
+    def workers(self):
+        return self._workers
+
+    def flight_numbers(self, start=None, end=None):
+        query, params = 'SELECT flight_number FROM flights WHERE 1 = 1', []
+        if start is not None:
+            query += ' AND departure_ts >= ?'
+            params.append(timestamp(start))
+        if end is not None:
+            query += ' AND departure_ts < ?'
+            params.append(timestamp(end))
+        db = Database(self._db_name)
+        try:
+            return [row[0] for row in db.query(query + ' ORDER BY departure_ts, flight_number', params)]
+        finally:
+            db.close()
+
+    def shards(self, numbers):
+        count = min(len(numbers), self._workers * self._shards_per_worker if self._workers > 1 else 1) or 1
+        size, extra = divmod(len(numbers), count)
+        result, start = [], 0
+        for i in range(count):
+            end = start + size + (i < extra)
+            result.append(numbers[start:end])
+            start = end
+        return [shard for shard in result if shard]
+
+    def generate(self, directory: str, start=None, end=None, merged: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        shards = self.shards(self.flight_numbers(start, end))
+        parts = [f".part{i:04d}.{self._fmt}" if merged else None for i in range(len(shards))]
+        if self._workers == 1 or len(shards) <= 1:
+            results = [_render_shard(self._db_name, shard, directory, self._fmt, part)
+                       for shard, part in zip(shards, parts)]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self._workers) as pool:
+                results = list(pool.map(_render_shard, [self._db_name] * len(shards), shards,
+                                        [directory] * len(shards), [self._fmt] * len(shards), parts))
+        paths = [path for result in results for path in result]
+        if merged:
+            return [self._merge(paths, os.path.join(directory, f"MANIFESTS.{self._fmt}"))]
+        return paths
+
+    def _merge(self, parts, path):
+        if self._fmt == 'docx':
+            from docx import Document
+            merged = Document(parts[0]) if parts else Document()
+            body = merged.element.body
+            for part in parts[1:]:
+                for element in Document(part).element.body:
+                    if not element.tag.endswith('}sectPr'):
+                        body.insert(len(body) - 1, copy.deepcopy(element))
+            merged.save(path)
+        else:
+            encoding = 'utf-8-sig' if self._fmt == 'csv' else 'utf-8'
+            with open(path, 'w', encoding=encoding, newline='') as out:
+                for i, part in enumerate(parts):
+                    with open(part, encoding=encoding, newline='') as f:
+                        if i and self._fmt == 'csv':
+                            f.readline()
+                        out.write(f.read())
+        for part in parts:
+            os.remove(part)
+        return path
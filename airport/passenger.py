@@ -1,16 +1,30 @@
-from datetime import datetime
+import sys
+from datetime import date
 
 __all__ = ['Passenger']
 
+from airport import parse_date, today
+
 
 class Passenger:
+    __slots__ = ('_passport', '_name', '_surname', '_patronymic', '_date_of_birth')
+
     def __init__(self, passport: str, name: str, surname: str, patronymic: str, date_of_birth: str):
         self._passport = passport
-        self._name = name
-        self._surname = surname
-        self._patronymic = patronymic
-        self._date_of_birth = datetime.strptime(date_of_birth, "%Y-%m-%d").date()
-        self._booked_flights = []
+        self._name = sys.intern(name)
+        self._surname = sys.intern(surname)
+        self._patronymic = sys.intern(patronymic)
+        self._date_of_birth = parse_date(date_of_birth)
+
+    @classmethod
+    def from_row(cls, passport: str, name: str, surname: str, patronymic: str, date_of_birth):
+        passenger = cls.__new__(cls)
+        passenger._passport = passport
+        passenger._name = sys.intern(name)
+        passenger._surname = sys.intern(surname)
+        passenger._patronymic = sys.intern(patronymic)
+        passenger._date_of_birth = date_of_birth if isinstance(date_of_birth, date) else parse_date(date_of_birth)
+        return passenger
 
     @property
     def passport(self):
@@ -32,13 +46,8 @@ class Passenger:
         return self._date_of_birth
     @property
     def age(self):
-        today = datetime.now().date()
-        return today.year - self._date_of_birth.year - ((today.month, today.day) < (self._date_of_birth.month, self._date_of_birth.day))
-
-    def book_flight(self, flight_number: str):
-        self._booked_flights.append(flight_number)
-    def get_booked_flights(self):
-        return self._booked_flights.copy()
+        current = today()
+        return current.year - self._date_of_birth.year - ((current.month, current.day) < (self._date_of_birth.month, self._date_of_birth.day))
 
     def __str__(self):
         return f"Пассажир: {self.full_name} (Паспорт: {self._passport})"
@@ -47,4 +56,6 @@ class Passenger:
     def __eq__(self, other):
         if isinstance(other, Passenger):
             return self._passport == other._passport
-        return False
\ No newline at end of file
+        return False
+    def __hash__(self):
+        return hash(self._passport)
\ No newline at end of file
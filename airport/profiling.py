@@ -0,0 +1,163 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+__all__ = ['Profiler', 'PROFILE_ENV']
+
+from airport import Flight
+from airport import ReportExporter
+from airport import LatencyMetrics
+
+PROFILE_ENV = 'AIRPORT_PROFILE'
+
+
+class _Counter:
+    __slots__ = ('statements', 'changes')
+
+    def __init__(self, changes):
+        self.statements = 0
+        self.changes = changes
+
+
+class Profiler:
+    SYSTEM_OPERATIONS = ('save_aircraft', 'save_passenger', 'save_flight', 'save_booking', 'save_flight_status',
+                         'load_from_database', 'restore_from_journal', 'export_report', 'add_passenger_to_flight')
+    CLASS_OPERATIONS = ((Flight, 'add_passenger'), (ReportExporter, 'export'))
+
+    def __init__(self, window: int = 10000, path: str = None):
+        self._path = path
+        self._timings = LatencyMetrics(window)
+        self._sql = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._systems = {}
+        self._patched = []
+
+    @classmethod
+    def from_env(cls, environ=None):
+        value = (environ if environ is not None else os.environ).get(PROFILE_ENV, '')
+        if not value or value == '0':
+            return None
+        return cls(path=None if value.lower() in ('1', 'true', 'yes') else value)
+
+    @property
+    def path(self):
+        return self._path
+    @property
+    def timings(self):
+        return self._timings
+    @property
+    def attached(self):
+        return len(self._systems)
+
+    def _active(self):
+        active = getattr(self._local, 'active', None)
+        if active is None:
+            active = self._local.active = []
+        return active
+
+    def _changes(self):
+        with self._lock:
+            databases = list(self._systems.values())
+        return sum(db.total_changes for db in databases)
+
+    def _trace(self, statement):
+        if statement.startswith('--'):
+            return
+        for counter in getattr(self._local, 'active', ()):
+            counter.statements += 1
+
+    @contextmanager
+    def operation(self, name: str):
+        active = self._active()
+        counter = _Counter(self._changes())
+        active.append(counter)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            active.pop()
+            changes = self._changes() - counter.changes
+            self._timings.record(name, elapsed)
+            with self._lock:
+                sql = self._sql.setdefault(name, [0, 0])
+                sql[0] += counter.statements
+                sql[1] += max(changes, 0)
+
+    def wrap(self, name: str, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.operation(name):
+                return func(*args, **kwargs)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def attach(self, system):
+        with self._lock:
+            if system in self._systems:
+                return self
+            self._systems[system] = system.db
+            first = len(self._systems) == 1
+        system.db.set_trace(self._trace)
+        for name in self.SYSTEM_OPERATIONS:
+            setattr(system, name, self.wrap(name, getattr(system, name)))
+        system.booking.book = self.wrap('booking.book', system.booking.book)
+        if first:
+            for cls, name in self.CLASS_OPERATIONS:
+                original = cls.__dict__[name]
+                setattr(cls, name, self.wrap(f"{cls.__name__}.{name}", original))
+                self._patched.append((cls, name, original))
+        return self
+
+    def detach(self, system):
+        with self._lock:
+            db = self._systems.pop(system, None)
+            last = not self._systems
+        if db is None:
+            return
+        db.set_trace(None)
+        for name in self.SYSTEM_OPERATIONS:
+            system.__dict__.pop(name, None)
+        system.booking.__dict__.pop('book', None)
+        if last:
+            while self._patched:
+                cls, name, original = self._patched.pop()
+                setattr(cls, name, original)
+
+    def as_dict(self):
+        summary = self._timings.summary()
+        with self._lock:
+            sql = {name: list(values) for name, values in self._sql.items()}
+        for name, stats in summary.items():
+            stats['sql_statements'], stats['sql_rows'] = sql.get(name, (0, 0))
+        return summary
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        lines = ['# HELP airport_operation_seconds Длительность операций AirportSystem',
+                 '# TYPE airport_operation_seconds summary']
+        stats = sorted(self.as_dict().items())
+        for name, s in stats:
+            for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                lines.append(f'airport_operation_seconds{{operation="{name}",quantile="{quantile}"}} {s[key] / 1000:.9f}')
+            lines.append(f'airport_operation_seconds_sum{{operation="{name}"}} {s["total_ms"] / 1000:.9f}')
+            lines.append(f'airport_operation_seconds_count{{operation="{name}"}} {s["count"]}')
+        for metric, key, text in (('airport_sql_statements_total', 'sql_statements', 'SQL-запросы по операциям'),
+                                  ('airport_sql_rows_total', 'sql_rows', 'Изменённые строки по операциям')):
+            lines.append(f'# HELP {metric} {text}')
+            lines.append(f'# TYPE {metric} counter')
+            lines.extend(f'{metric}{{operation="{name}"}} {s[key]}' for name, s in stats)
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str = None):
+        path = path or self._path
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
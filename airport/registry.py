@@ -0,0 +1,75 @@
+from collections import defaultdict
+
+__all__ = ['Registry']
+
+from airport import Aircraft
+from airport import Passenger
+from airport import Flight
+
+
+class Registry:
+    def __init__(self):
+        self._aircrafts = {}
+        self._passengers = {}
+        self._flights = {}
+        self._by_route = defaultdict(dict)
+        self._by_date = defaultdict(dict)
+
+    @property
+    def aircrafts(self):
+        return list(self._aircrafts.values())
+    @property
+    def passengers(self):
+        return list(self._passengers.values())
+    @property
+    def flights(self):
+        return list(self._flights.values())
+
+    def add_aircraft(self, aircraft: Aircraft):
+        self._aircrafts[aircraft.registration] = aircraft
+    def add_passenger(self, passenger: Passenger):
+        self._passengers[passenger.passport] = passenger
+    def add_passengers(self, passengers):
+        self._passengers.update((p.passport, p) for p in passengers)
+
+    def add_flight(self, flight: Flight):
+        old = self._flights.get(flight.flight_number)
+        if old is not None:
+            self._unindex_flight(old)
+        self._flights[flight.flight_number] = flight
+        self._by_route[(flight.departure, flight.destination)][flight.flight_number] = flight
+        self._by_date[flight.departure_time.date()][flight.flight_number] = flight
+
+    def _unindex_flight(self, flight: Flight):
+        route = (flight.departure, flight.destination)
+        self._by_route[route].pop(flight.flight_number, None)
+        if not self._by_route[route]:
+            del self._by_route[route]
+        day = flight.departure_time.date()
+        self._by_date[day].pop(flight.flight_number, None)
+        if not self._by_date[day]:
+            del self._by_date[day]
+
+    def remove_flight(self, flight_number: str):
+        flight = self._flights.pop(flight_number, None)
+        if flight is not None:
+            self._unindex_flight(flight)
+        return flight
+
+    def get_aircraft(self, registration: str):
+        return self._aircrafts.get(registration)
+    def get_passenger(self, passport: str):
+        return self._passengers.get(passport)
+    def get_flight(self, flight_number: str):
+        return self._flights.get(flight_number)
+
+    def flights_by_route(self, departure: str, destination: str):
+        return list(self._by_route.get((departure, destination), {}).values())
+    def flights_by_date(self, day):
+        return list(self._by_date.get(day, {}).values())
+
+    def has_flight(self, flight_number: str):
+        return flight_number in self._flights
+
+    def __len__(self):
+        return len(self._flights)
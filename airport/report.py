@@ -0,0 +1,140 @@
+import csv
+import threading
+from datetime import datetime
+
+__all__ = ['ReportExporter', 'ReportJob']
+
+from airport import Database
+
+
+class ReportJob:
+    def __init__(self, path: str, total: int):
+        self._path = path
+        self._total = total
+        self._done = 0
+        self._error = None
+        self._finished = threading.Event()
+        self._thread = None
+
+    @property
+    def path(self):
+        return self._path
+    @property
+    def total(self):
+        return self._total
+    @property
+    def done(self):
+        return self._done
+    @property
+    def progress(self):
+        return self._done / self._total * 100 if self._total else 100.0
+    @property
+    def error(self):
+        return self._error
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def __str__(self):
+        state = "готов" if self.finished else f"{self.progress:.0f}%"
+        return f"Отчёт {self._path}: {state}"
+
+
+class ReportExporter:
+    FORMATS = ('docx', 'csv')
+    FLIGHTS_QUERY = '''
+        SELECT f.flight_number, f.departure, f.destination, f.departure_time, f.is_cancelled,
+               CASE WHEN f.is_cancelled THEN 0
+                    ELSE (SELECT COUNT(*) FROM bookings b WHERE b.flight_number = f.flight_number) END,
+               a.capacity
+        FROM flights f JOIN aircrafts a ON a.registration = f.aircraft_registration
+        ORDER BY f.departure_ts, f.flight_number
+    '''
+
+    def __init__(self, db: Database, snapshot, aircrafts, batch_size: int = 1000):
+        self._db = db
+        self._snapshot = snapshot
+        self._aircrafts = list(aircrafts)
+        self._batch_size = batch_size
+
+    @staticmethod
+    def default_filename(fmt: str):
+        return f"REPORT_{datetime.now().strftime('%Y%m%d_%H%M')}.{fmt}"
+
+    def flight_count(self):
+        return self._db.query('SELECT COUNT(*) FROM flights')[0][0]
+
+    def iter_flights(self):
+        cursor = self._db.connection().cursor()
+        cursor.execute(self.FLIGHTS_QUERY)
+        while True:
+            rows = cursor.fetchmany(self._batch_size)
+            if not rows:
+                return
+            yield rows
+
+    def summary_lines(self):
+        s = self._snapshot
+        return [f"Всего самолётов: {s.aircrafts}",
+                f"Всего пассажиров: {s.passengers}",
+                f"Всего рейсов: {s.flights}",
+                f"Активных рейсов: {s.active_flights}",
+                f"Отменённых рейсов: {s.cancelled_flights}",
+                f"Средняя заполненность: {s.average_occupancy:.1f}%"]
+
+    def write_docx(self, path: str, job: ReportJob = None):
+        from docx import Document
+        doc = Document()
+        doc.add_heading('СТАТИСТИКА', 0)
+        doc.add_paragraph('\n'.join(self.summary_lines()))
+        doc.add_heading('Самолёты:', level=1)
+        for a in self._aircrafts:
+            status = "Доступен" if a.is_available else "Не доступен"
+            doc.add_paragraph(f" - {a} {status}")
+        doc.add_heading('Рейсы:', level=1)
+        for rows in self.iter_flights():
+            for number, dep, dest, _, cancelled, booked, capacity in rows:
+                status = "ОТМЕНЁН" if cancelled else "АКТИВЕН"
+                doc.add_paragraph(f"  - {number}: {dep} → {dest} ({status})\nПассажиров: {booked}/{capacity}")
+            if job is not None:
+                job._done += len(rows)
+        doc.save(path)
+
+    def write_csv(self, path: str, job: ReportJob = None):
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(['Рейс', 'Откуда', 'Куда', 'Вылет', 'Статус', 'Пассажиров', 'Мест'])
+            for rows in self.iter_flights():
+                writer.writerows((number, dep, dest, dep_time, "ОТМЕНЁН" if cancelled else "АКТИВЕН", booked, capacity)
+                                 for number, dep, dest, dep_time, cancelled, booked, capacity in rows)
+                if job is not None:
+                    job._done += len(rows)
+
+    def export(self, fmt: str = 'docx', path: str = None, job: ReportJob = None):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Неизвестный формат отчёта: {fmt}")
+        path = path or self.default_filename(fmt)
+        getattr(self, f"write_{fmt}")(path, job)
+        return path
+
+    def start(self, fmt: str = 'docx', path: str = None, on_done=None) -> ReportJob:
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Неизвестный формат отчёта: {fmt}")
+        job = ReportJob(path or self.default_filename(fmt), self.flight_count())
+
+        def worker():
+            try:
+                self.export(fmt, job.path, job)
+            except Exception as e:
+                job._error = e
+            finally:
+                job._finished.set()
+                if on_done is not None:
+                    on_done(job)
+
+        job._thread = threading.Thread(target=worker, name=f"report-{fmt}", daemon=True)
+        job._thread.start()
+        return job
@@ -0,0 +1,153 @@
+import heapq
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+__all__ = ['RouteNetwork', 'Itinerary']
+
+from airport import Flight
+
+
+class Itinerary:
+    __slots__ = ('_flights',)
+
+    def __init__(self, flights):
+        self._flights = list(flights)
+
+    @property
+    def flights(self):
+        return self._flights
+    @property
+    def legs(self):
+        return len(self._flights)
+    @property
+    def departure_time(self):
+        return self._flights[0].departure_time
+    @property
+    def arrival_time(self):
+        return self._flights[-1].arrival_time
+    @property
+    def duration(self):
+        return self.arrival_time - self.departure_time
+    @property
+    def connections(self):
+        return [b.departure_time - a.arrival_time for a, b in zip(self._flights, self._flights[1:])]
+    @property
+    def available_seats(self):
+        return min(f.available_seats for f in self._flights)
+    @property
+    def cities(self):
+        return [self._flights[0].departure] + [f.destination for f in self._flights]
+
+    def __str__(self):
+        hours, minutes = divmod(int(self.duration.total_seconds()) // 60, 60)
+        legs = ', '.join(f.flight_number for f in self._flights)
+        return (f"{' → '.join(self.cities)}: {self.departure_time.strftime('%Y-%m-%d %H:%M')} - "
+                f"{self.arrival_time.strftime('%Y-%m-%d %H:%M')} ({hours} ч {minutes} мин, рейсы: {legs})")
+    def __repr__(self):
+        return f"Itinerary({[f.flight_number for f in self._flights]})"
+    def __len__(self):
+        return len(self._flights)
+
+
+class RouteNetwork:
+    def __init__(self, resolve, min_connection_min: int = 45):
+        self._resolve = resolve
+        self._min_connection = timedelta(minutes=min_connection_min)
+        self._edges = {}
+        self._flights = {}
+
+    @property
+    def min_connection(self):
+        return self._min_connection
+    @property
+    def cities(self):
+        return sorted(set(self._edges) | {dest for edges in self._edges.values() for dest in edges})
+
+    def add(self, flight_number: str, departure: str, destination: str, departure_time, arrival_time):
+        self.remove_flight(flight_number)
+        self._flights[flight_number] = (departure, destination, departure_time, arrival_time)
+        insort(self._edges.setdefault(departure, {}).setdefault(destination, []), (departure_time, flight_number))
+
+    def add_flight(self, flight: Flight):
+        if flight.is_cancelled:
+            self.remove_flight(flight.flight_number)
+        else:
+            self.add(flight.flight_number, flight.departure, flight.destination,
+                     flight.departure_time, flight.arrival_time)
+
+    def remove_flight(self, flight_number: str):
+        entry = self._flights.pop(flight_number, None)
+        if entry is None:
+            return False
+        departure, destination, departure_time, _ = entry
+        departures = self._edges[departure][destination]
+        del departures[bisect_left(departures, (departure_time, flight_number))]
+        if not departures:
+            del self._edges[departure][destination]
+            if not self._edges[departure]:
+                del self._edges[departure]
+        return True
+
+    def departures(self, city: str, destination: str):
+        return list(self._edges.get(city, {}).get(destination, ()))
+
+    def _bookable(self, flight_number, seats):
+        flight = self._resolve(flight_number)
+        return flight is not None and not flight.is_cancelled and flight.available_seats >= seats
+
+    def _itinerary(self, numbers):
+        return Itinerary([self._resolve(number) for number in numbers])
+
+    def earliest_arrival(self, origin: str, destination: str, after, seats: int = 1, max_legs: int = None):
+        best = {origin: after}
+        heap = [(after, 0, origin, ())]
+        while heap:
+            time, legs, city, path = heapq.heappop(heap)
+            if city == destination and path:
+                return self._itinerary(path)
+            if time > best.get(city, time) or (max_legs is not None and legs >= max_legs):
+                continue
+            ready = time + self._min_connection if path else time
+            for dest, departures in self._edges.get(city, {}).items():
+                for departure_time, number in departures[bisect_left(departures, (ready, '')):]:
+                    limit = best.get(dest)
+                    if limit is not None and departure_time >= limit:
+                        break
+                    arrival_time = self._flights[number][3]
+                    if (limit is None or arrival_time < limit) and self._bookable(number, seats):
+                        best[dest] = arrival_time
+                        heapq.heappush(heap, (arrival_time, legs + 1, dest, path + (number,)))
+        return None
+
+    def connections(self, origin: str, destination: str, after, k: int = 3, seats: int = 1, max_legs: int = 3,
+                    window=timedelta(hours=24)):
+        settled = {}
+        found = []
+        heap = [(after, 0, origin, (), (origin,))]
+        while heap and len(found) < k:
+            time, legs, city, path, visited = heapq.heappop(heap)
+            if city == destination and path:
+                found.append(self._itinerary(path))
+                continue
+            settled[city] = settled.get(city, 0) + 1
+            if settled[city] > k or legs >= max_legs:
+                continue
+            ready = time + self._min_connection if path else time
+            latest = ready + window
+            for dest, departures in self._edges.get(city, {}).items():
+                if dest in visited:
+                    continue
+                taken = 0
+                for departure_time, number in departures[bisect_left(departures, (ready, '')):]:
+                    if departure_time > latest or taken >= k:
+                        break
+                    if self._bookable(number, seats):
+                        taken += 1
+                        heapq.heappush(heap, (self._flights[number][3], legs + 1, dest,
+                                              path + (number,), visited + (dest,)))
+        return found
+
+    def __contains__(self, flight_number):
+        return flight_number in self._flights
+    def __len__(self):
+        return len(self._flights)
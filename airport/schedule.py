@@ -0,0 +1,94 @@
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+__all__ = ['AircraftSchedule']
+
+from airport import Flight
+
+
+class _Timeline:
+    __slots__ = ('starts', 'intervals', 'longest')
+
+    def __init__(self):
+        self.starts = []
+        self.intervals = []
+        self.longest = timedelta(0)
+
+    def add(self, start, end, flight_number):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.intervals.insert(i, (start, end, flight_number))
+        self.longest = max(self.longest, end - start)
+
+    def remove(self, start, flight_number):
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.intervals[i][2] == flight_number:
+                del self.starts[i]
+                del self.intervals[i]
+                return True
+            i += 1
+        return False
+
+    def overlapping(self, start, end):
+        i = bisect_left(self.starts, end)
+        lower = start - self.longest
+        found = []
+        while i > 0:
+            i -= 1
+            interval = self.intervals[i]
+            if interval[0] < lower:
+                break
+            if interval[1] > start:
+                found.append(interval[2])
+        return found
+
+
+class AircraftSchedule:
+    def __init__(self, turnaround_min: int = 45):
+        self._turnaround = timedelta(minutes=turnaround_min)
+        self._timelines = {}
+        self._flights = {}
+
+    @property
+    def turnaround(self):
+        return self._turnaround
+
+    def add(self, flight_number: str, registration: str, departure_time, duration_min: int):
+        self.remove_flight(flight_number)
+        end = departure_time + timedelta(minutes=duration_min) + self._turnaround
+        self._timelines.setdefault(registration, _Timeline()).add(departure_time, end, flight_number)
+        self._flights[flight_number] = (registration, departure_time)
+
+    def add_flight(self, flight: Flight):
+        if flight.is_cancelled:
+            self.remove_flight(flight.flight_number)
+        else:
+            self.add(flight.flight_number, flight.aircraft.registration, flight.departure_time, flight.duration_min)
+
+    def remove_flight(self, flight_number: str):
+        entry = self._flights.pop(flight_number, None)
+        if entry is not None:
+            registration, start = entry
+            self._timelines[registration].remove(start, flight_number)
+
+    def conflicts(self, registration: str, start, end, ignore: str = None):
+        timeline = self._timelines.get(registration)
+        if timeline is None:
+            return []
+        return [number for number in timeline.overlapping(start, end + self._turnaround) if number != ignore]
+
+    def flight_conflicts(self, flight: Flight):
+        start, end = flight.departure_time, flight.arrival_time
+        return self.conflicts(flight.aircraft.registration, start, end, ignore=flight.flight_number)
+
+    def is_free(self, registration: str, start, end):
+        return not self.conflicts(registration, start, end)
+
+    def free_aircrafts(self, aircrafts, start, end):
+        return [a for a in aircrafts if self.is_free(a.registration, start, end)]
+
+    def __contains__(self, flight_number):
+        return flight_number in self._flights
+    def __len__(self):
+        return len(self._flights)
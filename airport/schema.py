@@ -0,0 +1,223 @@
+import calendar
+import sqlite3
+
+__all__ = ['migrate', 'schema_version', 'data_version', 'timestamp', 'MIGRATIONS',
+           'UPSERT_AIRCRAFT', 'UPSERT_PASSENGER', 'UPSERT_FLIGHT', 'INSERT_BOOKING',
+           'RESERVE_BOOKING']
+
+UPSERT_AIRCRAFT = '''
+    INSERT INTO aircrafts (registration, model, capacity) VALUES (?, ?, ?)
+    ON CONFLICT (registration) DO UPDATE SET model = excluded.model, capacity = excluded.capacity
+'''
+UPSERT_PASSENGER = '''
+    INSERT INTO passengers (passport, name, surname, patronymic, date_of_birth) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (passport) DO UPDATE SET
+        name = excluded.name, surname = excluded.surname,
+        patronymic = excluded.patronymic, date_of_birth = excluded.date_of_birth
+'''
+UPSERT_FLIGHT = '''
+    INSERT INTO flights (flight_number, departure, destination, departure_time, aircraft_registration,
+                         duration_minutes, is_cancelled)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (flight_number) DO UPDATE SET
+        departure = excluded.departure, destination = excluded.destination,
+        departure_time = excluded.departure_time, aircraft_registration = excluded.aircraft_registration,
+        duration_minutes = excluded.duration_minutes, is_cancelled = excluded.is_cancelled
+'''
+INSERT_BOOKING = 'INSERT INTO bookings (flight_number, passenger_passport, booking_time) VALUES (?, ?, ?)'
+RESERVE_BOOKING = '''
+    INSERT INTO bookings (flight_number, passenger_passport, booking_time)
+    SELECT f.flight_number, ?, ?
+    FROM flights f JOIN aircrafts a ON a.registration = f.aircraft_registration
+    WHERE f.flight_number = ? AND f.is_cancelled = 0
+      AND (SELECT COUNT(*) FROM bookings b WHERE b.flight_number = f.flight_number) < a.capacity
+'''
+
+
+def timestamp(dt):
+    return calendar.timegm(dt.timetuple())
+
+
+def _base_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS aircrafts (
+            registration TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            capacity INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS passengers (
+            passport TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            surname TEXT NOT NULL,
+            patronymic TEXT NOT NULL,
+            date_of_birth TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS flights (
+            flight_number TEXT PRIMARY KEY,
+            departure TEXT NOT NULL,
+            destination TEXT NOT NULL,
+            departure_time TEXT NOT NULL,
+            aircraft_registration TEXT NOT NULL,
+            duration_minutes INTEGER NOT NULL,
+            is_cancelled INTEGER DEFAULT 0,
+            FOREIGN KEY (aircraft_registration) REFERENCES aircrafts (registration)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            flight_number TEXT NOT NULL,
+            passenger_passport TEXT NOT NULL,
+            booking_time TEXT NOT NULL,
+            FOREIGN KEY (flight_number) REFERENCES flights (flight_number),
+            FOREIGN KEY (passenger_passport) REFERENCES passengers (passport)
+        )
+    ''')
+
+
+def _unique_bookings(conn):
+    conn.execute('''
+        DELETE FROM bookings WHERE id NOT IN (
+            SELECT MIN(id) FROM bookings GROUP BY flight_number, passenger_passport
+        )
+    ''')
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_bookings_flight_passenger
+        ON bookings (flight_number, passenger_passport)
+    ''')
+
+
+def _secondary_indexes(conn):
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_bookings_passenger ON bookings (passenger_passport)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_flights_departure_time ON flights (departure_time)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_flights_aircraft ON flights (aircraft_registration, departure_time)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_flights_route ON flights (departure, destination, departure_time)')
+
+
+def _surrogate_keys(conn):
+    conn.execute('ALTER TABLE flights ADD COLUMN departure_ts INTEGER')
+    conn.execute('ALTER TABLE bookings ADD COLUMN flight_id INTEGER')
+    conn.execute('ALTER TABLE bookings ADD COLUMN passenger_id INTEGER')
+    conn.execute("UPDATE flights SET departure_ts = CAST(strftime('%s', departure_time) AS INTEGER)")
+    conn.execute('''
+        UPDATE bookings SET
+            flight_id = (SELECT rowid FROM flights f WHERE f.flight_number = bookings.flight_number),
+            passenger_id = (SELECT rowid FROM passengers p WHERE p.passport = bookings.passenger_passport)
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tr_flights_departure_ts_insert AFTER INSERT ON flights
+        BEGIN
+            UPDATE flights SET departure_ts = CAST(strftime('%s', NEW.departure_time) AS INTEGER)
+            WHERE rowid = NEW.rowid;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tr_flights_departure_ts_update AFTER UPDATE OF departure_time ON flights
+        BEGIN
+            UPDATE flights SET departure_ts = CAST(strftime('%s', NEW.departure_time) AS INTEGER)
+            WHERE rowid = NEW.rowid;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tr_bookings_keys AFTER INSERT ON bookings
+        BEGIN
+            UPDATE bookings SET
+                flight_id = (SELECT rowid FROM flights WHERE flight_number = NEW.flight_number),
+                passenger_id = (SELECT rowid FROM passengers WHERE passport = NEW.passenger_passport)
+            WHERE id = NEW.id;
+        END
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_flights_departure_ts ON flights (departure_ts, flight_number)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_bookings_flight_id ON bookings (flight_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS ix_bookings_passenger_id ON bookings (passenger_id)')
+
+
+SEARCH_NAME = "replace(replace({0}surname || ' ' || {0}name || ' ' || {0}patronymic, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _passenger_search(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS passenger_search "
+                     "USING fts5(full_name, passport UNINDEXED, tokenize = 'trigram')")
+    except sqlite3.OperationalError:
+        return
+    conn.execute(f'''
+        INSERT INTO passenger_search (rowid, full_name, passport)
+        SELECT rowid, {SEARCH_NAME.format('')}, passport FROM passengers
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS tr_passengers_search_insert AFTER INSERT ON passengers
+        BEGIN
+            INSERT INTO passenger_search (rowid, full_name, passport)
+            VALUES (NEW.rowid, {SEARCH_NAME.format('NEW.')}, NEW.passport);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS tr_passengers_search_update AFTER UPDATE ON passengers
+        BEGIN
+            UPDATE passenger_search SET full_name = {SEARCH_NAME.format('NEW.')}, passport = NEW.passport
+            WHERE rowid = NEW.rowid;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tr_passengers_search_delete AFTER DELETE ON passengers
+        BEGIN
+            DELETE FROM passenger_search WHERE rowid = OLD.rowid;
+        END
+    ''')
+
+
+def _history_index(conn):
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS ix_bookings_passenger_history
+        ON bookings (passenger_passport, flight_id, booking_time)
+    ''')
+    conn.execute('DROP INDEX IF EXISTS ix_bookings_passenger')
+
+
+def _change_counter(conn):
+    conn.execute('CREATE TABLE IF NOT EXISTS change_counter (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)')
+    conn.execute('INSERT OR IGNORE INTO change_counter (id, value) VALUES (1, 0)')
+    for table in ('aircrafts', 'passengers', 'flights', 'bookings'):
+        for operation in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS tr_{table}_changes_{operation.lower()} AFTER {operation} ON {table}
+                BEGIN
+                    UPDATE change_counter SET value = value + 1;
+                END
+            ''')
+
+
+def data_version(conn):
+    return conn.execute('SELECT value FROM change_counter').fetchone()[0]
+
+
+MIGRATIONS = [
+    (1, "базовые таблицы", _base_tables),
+    (2, "уникальность бронирований", _unique_bookings),
+    (3, "вторичные индексы", _secondary_indexes),
+    (4, "суррогатные ключи и числовое время вылета", _surrogate_keys),
+    (5, "полнотекстовый поиск пассажиров", _passenger_search),
+    (6, "индекс истории бронирований пассажира", _history_index),
+    (7, "счётчик изменений для сверки журнала", _change_counter),
+]
+
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, target: int = None):
+    version = schema_version(conn)
+    applied = []
+    for number, description, apply in MIGRATIONS:
+        if version < number and (target is None or number <= target):
+            apply(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+            version = number
+            applied.append(description)
+    return applied
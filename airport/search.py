@@ -0,0 +1,115 @@
+import re
+
+__all__ = ['PassengerSearch', 'normalize_name']
+
+from airport import Database
+
+PASSENGER_COLUMNS = 'p.passport, p.name, p.surname, p.patronymic, p.date_of_birth'
+_PASSPORT = re.compile(r'[0-9A-Za-z]+')
+
+
+def normalize_name(text: str) -> str:
+    return ' '.join(text.lower().replace('ё', 'е').split())
+
+
+def _bigrams(text):
+    grams = set()
+    for word in text.split():
+        word = f" {word} "
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def _pieces(word):
+    size = max(3, len(word) // 2)
+    if len(word) <= size + 1:
+        return {word}
+    middle = (len(word) - size) // 2
+    return {word[:size], word[middle:middle + size], word[-size:]}
+
+
+def _phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+class PassengerSearch:
+    def __init__(self, db: Database, candidates: int = 200):
+        self._db = db
+        self._candidates = candidates
+        self._fts = None
+        db.create_function('normalize_name', 1, normalize_name)
+
+    @property
+    def has_fts(self):
+        if self._fts is None:
+            self._fts = bool(self._db.query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'passenger_search'"))
+        return self._fts
+
+    def _by_passport(self, prefix, limit):
+        return self._db.query(f'''
+            SELECT {PASSENGER_COLUMNS} FROM passengers p
+            WHERE p.passport >= ? AND p.passport < ?
+            ORDER BY p.passport LIMIT ?
+        ''', (prefix, prefix + '￿', limit))
+
+    def _by_name(self, query, limit, wanted):
+        words = [w for w in normalize_name(query).split() if len(w) >= 3]
+        if not words:
+            return []
+        if not self.has_fts:
+            pattern = '%' + '%'.join(words) + '%'
+            return self._db.query(f'''
+                SELECT {PASSENGER_COLUMNS} FROM passengers p
+                WHERE normalize_name(p.surname || ' ' || p.name || ' ' || p.patronymic) LIKE ?
+                LIMIT ?
+            ''', (pattern, limit))
+        select = f'''
+            SELECT {PASSENGER_COLUMNS} FROM passenger_search s JOIN passengers p ON p.rowid = s.rowid
+            WHERE passenger_search MATCH ?
+        '''
+        rows = self._db.query(select + ' LIMIT ?', (' AND '.join(map(_phrase, words)), limit))
+        pieces = ['(' + ' OR '.join(map(_phrase, sorted(_pieces(w)))) + ')' for w in words]
+        fuzzy = [' AND '.join(pieces)]
+        if len(pieces) > 1:
+            fuzzy.append(' OR '.join('(' + ' AND '.join(pieces[:i] + pieces[i + 1:]) + ')' for i in range(len(pieces))))
+        seen = {row[0] for row in rows}
+        for expression in fuzzy:
+            if len(rows) >= wanted:
+                break
+            for row in self._db.query(select + ' ORDER BY s.rank LIMIT ?', (expression, limit)):
+                if row[0] not in seen:
+                    seen.add(row[0])
+                    rows.append(row)
+        return rows
+
+    @staticmethod
+    def score(query, row):
+        passport, name, surname, patronymic = row[:4]
+        text = query.strip()
+        if passport == text:
+            return 3.0
+        if passport.startswith(text):
+            return 2.0 + len(text) / len(passport)
+        full = normalize_name(f"{surname} {name} {patronymic}")
+        wanted = normalize_name(text)
+        grams, other = _bigrams(wanted), _bigrams(full)
+        score = 2 * len(grams & other) / (len(grams) + len(other))
+        if full.startswith(wanted):
+            score += 0.5
+        words = full.split()
+        prefixes = sum(any(w.startswith(q) for w in words) for q in wanted.split())
+        return score + 0.25 * prefixes / len(wanted.split())
+
+    def search(self, query: str, limit: int = 10):
+        query = query.strip()
+        if not query:
+            return []
+        rows = {}
+        if _PASSPORT.fullmatch(query):
+            rows.update((row[0], row) for row in self._by_passport(query, self._candidates))
+        for row in self._by_name(query, self._candidates, limit):
+            rows.setdefault(row[0], row)
+        ranked = sorted(((self.score(query, row), row) for row in rows.values()),
+                        key=lambda match: (-match[0], match[1][2], match[1][0]))
+        return [(row, score) for score, row in ranked[:limit] if score > 0]
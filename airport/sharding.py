@@ -0,0 +1,248 @@
+import heapq
+import os
+import threading
+from collections import Counter
+
+__all__ = ['ShardRouter', 'ShardedAirport', 'ShardedHistory']
+
+from airport import BookingHistory
+from airport import CancellationReport
+from airport import StatisticsSnapshot
+from airport import timestamp
+
+SHARD_PREFIX = 'shard_'
+
+
+def _cursor(entry):
+    return timestamp(entry.departure_time), entry.flight_number
+
+
+class ShardRouter:
+    STRATEGIES = ('airport', 'month')
+
+    def __init__(self, strategy: str = 'airport', hubs=(), default: str = 'other'):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия шардирования: {strategy}")
+        self._strategy = strategy
+        self._hubs = dict(hubs) if isinstance(hubs, dict) else {hub: hub for hub in hubs}
+        self._default = default
+
+    @property
+    def strategy(self):
+        return self._strategy
+    @property
+    def hubs(self):
+        return dict(self._hubs)
+
+    def shard_for(self, departure: str, departure_time) -> str:
+        if self._strategy == 'month':
+            return departure_time.strftime('%Y-%m')
+        return self._hubs.get(departure, self._default)
+
+    def shard_for_flight(self, flight) -> str:
+        return self.shard_for(flight.departure, flight.departure_time)
+
+    def routes_are_local(self):
+        return self._strategy == 'airport'
+
+
+class ShardedHistory:
+    PAGE_SIZE = BookingHistory.PAGE_SIZE
+
+    def __init__(self, sharded: 'ShardedAirport'):
+        self._sharded = sharded
+
+    def count(self, passport: str, start=None, end=None) -> int:
+        return sum(self._sharded.scatter(lambda s: s.history.count(passport, start, end)).values())
+
+    def cursor(self, flight_number: str):
+        return next((c for c in self._sharded.scatter(lambda s: s.history.cursor(flight_number)).values()
+                     if c is not None), None)
+
+    def page(self, passport: str, start=None, end=None, page_size: int = None, after=None):
+        page_size = page_size or self.PAGE_SIZE
+        if isinstance(after, str):
+            after = self.cursor(after)
+            if after is None:
+                return []
+        pages = self._sharded.scatter(lambda s: s.history.page(passport, start, end, page_size, after))
+        return heapq.nlargest(page_size, (entry for page in pages.values() for entry in page), key=_cursor)
+
+    def pages(self, passport: str, start=None, end=None, page_size: int = None):
+        page_size = page_size or self.PAGE_SIZE
+        after = None
+        while True:
+            page = self.page(passport, start, end, page_size, after)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after = _cursor(page[-1])
+
+    def flight_numbers(self, passport: str, start=None, end=None):
+        pages = self._sharded.scatter(lambda s: s.history.page(passport, start, end, -1))
+        return [entry.flight_number for entry in sorted((e for page in pages.values() for e in page), key=_cursor)]
+
+    def flights_per_year(self, passport: str, start=None, end=None):
+        total = Counter()
+        for years in self._sharded.scatter(lambda s: s.history.flights_per_year(passport, start, end)).values():
+            total.update(years)
+        return dict(sorted(total.items()))
+
+    def top_routes(self, passport: str, n: int = 5, start=None, end=None):
+        limit = n if self._sharded.router.routes_are_local() else -1
+        total = Counter()
+        for routes in self._sharded.scatter(lambda s: s.history.top_routes(passport, limit, start, end)).values():
+            total.update(dict(routes))
+        return sorted(total.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def summary(self, passport: str, start=None, end=None, routes: int = 5):
+        return {'flights': self.count(passport, start, end),
+                'per_year': self.flights_per_year(passport, start, end),
+                'top_routes': [{'departure': dep, 'destination': dest, 'flights': count}
+                               for (dep, dest), count in self.top_routes(passport, routes, start, end)]}
+
+
+class ShardedAirport:
+    def __init__(self, directory: str, router: ShardRouter, open_system, workers: int = 4, profiler=None):
+        from concurrent.futures import ThreadPoolExecutor
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._router = router
+        self._open_system = open_system
+        self._profiler = profiler
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='airport-shard')
+        self._lock = threading.Lock()
+        self._locations = {}
+        self.common = self._attach(open_system(os.path.join(directory, 'common.db')))
+        self.history = ShardedHistory(self)
+        self._shards = {}
+        for filename in sorted(os.listdir(directory)):
+            if filename.startswith(SHARD_PREFIX) and filename.endswith('.db'):
+                self.shard(filename[len(SHARD_PREFIX):-3])
+
+    @property
+    def router(self):
+        return self._router
+    @property
+    def shards(self):
+        return dict(self._shards)
+    @property
+    def profiler(self):
+        return self._profiler
+
+    def _attach(self, system):
+        if self._profiler is not None:
+            self._profiler.attach(system)
+        return system
+
+    def shard_path(self, name: str):
+        return os.path.join(self._directory, f"{SHARD_PREFIX}{name}.db")
+
+    def shard(self, name: str):
+        with self._lock:
+            system = self._shards.get(name)
+            if system is None:
+                system = self._attach(self._open_system(self.shard_path(name)))
+                for aircraft in self.common.aircrafts:
+                    if system.registry.get_aircraft(aircraft.registration) is None:
+                        system.save_aircraft(aircraft)
+                self._shards[name] = system
+            return system
+
+    def scatter(self, func, shards=None):
+        names = list(self._shards) if shards is None else list(shards)
+        futures = {name: self._pool.submit(func, self._shards[name]) for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+    def locate(self, flight_number: str):
+        name = self._locations.get(flight_number)
+        if name is None:
+            found = self.scatter(lambda s: s.db.query('SELECT 1 FROM flights WHERE flight_number = ?',
+                                                      (flight_number,)))
+            name = next((name for name, rows in found.items() if rows), None)
+            if name is not None:
+                self._locations[flight_number] = name
+        return name
+
+    def save_aircraft(self, aircraft):
+        self.common.save_aircraft(aircraft)
+        self.scatter(lambda s: s.save_aircraft(aircraft))
+
+    def save_passenger(self, passenger):
+        self.common.save_passenger(passenger)
+        self.scatter(lambda s: s.save_passenger(passenger)
+                     if s.db.query('SELECT 1 FROM passengers WHERE passport = ?', (passenger.passport,)) else None)
+
+    def get_passenger(self, passport: str):
+        return self.common.get_passenger(passport)
+
+    def search_passengers(self, query: str, limit: int = 10):
+        return self.common.search_passengers(query, limit)
+
+    def save_flight(self, flight):
+        name = self._router.shard_for_flight(flight)
+        previous = self.locate(flight.flight_number)
+        if previous is not None and previous != name:
+            raise ValueError(f"Рейс {flight.flight_number} уже хранится в шарде {previous}")
+        system = self.shard(name)
+        if system.registry.get_aircraft(flight.aircraft.registration) is None:
+            system.save_aircraft(flight.aircraft)
+        system.save_flight(flight)
+        self._locations[flight.flight_number] = name
+
+    def get_flight(self, flight_number: str):
+        name = self.locate(flight_number)
+        return self._shards[name].get_flight(flight_number) if name is not None else None
+
+    def save_flight_status(self, flight):
+        self.shard(self._router.shard_for_flight(flight)).save_flight_status(flight)
+
+    def book(self, flight_number: str, passport: str) -> bool:
+        name = self.locate(flight_number)
+        passenger = self.common.get_passenger(passport)
+        if name is None or passenger is None:
+            return False
+        system = self._shards[name]
+        local = system.get_passenger(passport)
+        if local is None:
+            system.save_passenger(passenger)
+            local = passenger
+        flight = system.get_flight(flight_number)
+        return flight is not None and system.booking.book(flight, local)
+
+    def cancel_booking(self, flight_number: str, passport: str) -> bool:
+        name = self.locate(flight_number)
+        if name is None:
+            return False
+        system = self._shards[name]
+        flight, passenger = system.get_flight(flight_number), system.get_passenger(passport)
+        return flight is not None and passenger is not None and system.booking.cancel_booking(flight, passenger)
+
+    def cancel_flights(self, **predicates):
+        departure = predicates.get('departure')
+        shards = None
+        if departure is not None and self._router.routes_are_local():
+            name = self._router.shard_for(departure, None)
+            shards = [name] if name in self._shards else []
+        reports = self.scatter(lambda s: s.cancel_flights(**predicates), shards)
+        return CancellationReport([n for r in reports.values() for n in r.flights],
+                                  [b for r in reports.values() for b in r.bookings])
+
+    def statistics(self) -> StatisticsSnapshot:
+        snapshots = list(self.scatter(lambda s: s.statistics()).values())
+        common = self.common.db.query('SELECT (SELECT COUNT(*) FROM aircrafts), (SELECT COUNT(*) FROM passengers)')[0]
+        active = sum(s.active_flights for s in snapshots)
+        occupancy = sum(s.average_occupancy * s.active_flights for s in snapshots)
+        return StatisticsSnapshot(common[0], common[1], sum(s.flights for s in snapshots), active,
+                                  sum(s.cancelled_flights for s in snapshots),
+                                  sum(s.booked_passengers for s in snapshots), occupancy / active if active else 0.0)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        for system in [*self._shards.values(), self.common]:
+            if self._profiler is not None:
+                self._profiler.detach(system)
+            system.close()
+        if self._profiler is not None and self._profiler.path:
+            self._profiler.dump()
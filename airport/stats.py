@@ -0,0 +1,137 @@
+from collections import defaultdict
+
+__all__ = ['StatisticsAggregator', 'StatisticsSnapshot']
+
+from airport import Flight
+from airport import parse_date
+
+
+class StatisticsSnapshot:
+    __slots__ = ('aircrafts', 'passengers', 'flights', 'active_flights', 'cancelled_flights',
+                 'booked_passengers', 'average_occupancy')
+
+    def __init__(self, aircrafts, passengers, flights, active_flights, cancelled_flights,
+                 booked_passengers, average_occupancy):
+        self.aircrafts = aircrafts
+        self.passengers = passengers
+        self.flights = flights
+        self.active_flights = active_flights
+        self.cancelled_flights = cancelled_flights
+        self.booked_passengers = booked_passengers
+        self.average_occupancy = average_occupancy
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Bucket:
+    __slots__ = ('flights', 'cancelled', 'passengers', 'occupancy_sum')
+
+    def __init__(self):
+        self.flights = 0
+        self.cancelled = 0
+        self.passengers = 0
+        self.occupancy_sum = 0.0
+
+    @property
+    def active(self):
+        return self.flights - self.cancelled
+    @property
+    def average_occupancy(self):
+        return self.occupancy_sum / self.active if self.active else 0.0
+
+    def add(self, flights, cancelled, passengers, occupancy):
+        self.flights += flights
+        self.cancelled += cancelled
+        self.passengers += passengers
+        self.occupancy_sum += occupancy
+
+    def as_dict(self):
+        return {'flights': self.flights, 'active': self.active, 'cancelled': self.cancelled,
+                'passengers': self.passengers, 'average_occupancy': self.average_occupancy}
+
+
+class StatisticsAggregator:
+    def __init__(self):
+        self._aircrafts = 0
+        self._passengers = 0
+        self._total = _Bucket()
+        self._by_route = defaultdict(_Bucket)
+        self._by_day = defaultdict(_Bucket)
+
+    def _buckets(self, route, day):
+        return self._total, self._by_route[route], self._by_day[day]
+
+    def _flight_buckets(self, flight: Flight):
+        return self._buckets((flight.departure, flight.destination), flight.departure_time.date())
+
+    def _update(self, flight: Flight, flights, cancelled, passengers):
+        occupancy = passengers / flight.aircraft.capacity * 100
+        for bucket in self._flight_buckets(flight):
+            bucket.add(flights, cancelled, passengers, occupancy)
+
+    def aircraft_added(self, count=1):
+        self._aircrafts += count
+    def passenger_registered(self, count=1):
+        self._passengers += count
+
+    def flight_added(self, flight: Flight):
+        if flight.is_cancelled:
+            self._update(flight, 1, 1, 0)
+        else:
+            self._update(flight, 1, 0, flight.passenger_count)
+
+    def flight_removed(self, flight: Flight):
+        if flight.is_cancelled:
+            self._update(flight, -1, -1, 0)
+        else:
+            self._update(flight, -1, 0, -flight.passenger_count)
+
+    def passenger_added(self, flight: Flight, passenger=None):
+        if not flight.is_cancelled:
+            self._update(flight, 0, 0, 1)
+
+    def passenger_removed(self, flight: Flight, passenger=None):
+        if not flight.is_cancelled:
+            self._update(flight, 0, 0, -1)
+
+    def flight_cancelled(self, flight: Flight, passenger_count: int, was_cancelled: bool):
+        if not was_cancelled:
+            self._update(flight, 0, 1, -passenger_count)
+
+    def flight_status_changed(self, flight: Flight):
+        if flight.is_cancelled:
+            self._update(flight, 0, 1, -flight.passenger_count)
+        else:
+            self._update(flight, 0, -1, flight.passenger_count)
+
+    def load_from_database(self, db):
+        self._aircrafts = db.query('SELECT COUNT(*) FROM aircrafts')[0][0]
+        self._passengers = db.query('SELECT COUNT(*) FROM passengers')[0][0]
+        rows = db.query('''
+            SELECT departure, destination, substr(departure_time, 1, 10), is_cancelled,
+                   COUNT(*), SUM(booked), SUM(booked * 100.0 / capacity)
+            FROM (
+                SELECT f.departure, f.destination, f.departure_time, f.is_cancelled, a.capacity,
+                       (SELECT COUNT(*) FROM bookings b WHERE b.flight_number = f.flight_number) AS booked
+                FROM flights f JOIN aircrafts a ON a.registration = f.aircraft_registration
+            )
+            GROUP BY departure, destination, substr(departure_time, 1, 10), is_cancelled
+        ''')
+        for dep, dest, day, cancelled, flights, booked, occupancy in rows:
+            day = parse_date(day)
+            for bucket in self._buckets((dep, dest), day):
+                if cancelled:
+                    bucket.add(flights, flights, 0, 0.0)
+                else:
+                    bucket.add(flights, 0, booked, occupancy)
+
+    def snapshot(self) -> StatisticsSnapshot:
+        total = self._total
+        return StatisticsSnapshot(self._aircrafts, self._passengers, total.flights, total.active,
+                                  total.cancelled, total.passengers, total.average_occupancy)
+
+    def by_route(self):
+        return {route: bucket.as_dict() for route, bucket in self._by_route.items() if bucket.flights}
+    def by_day(self):
+        return {day: bucket.as_dict() for day, bucket in sorted(self._by_day.items()) if bucket.flights}
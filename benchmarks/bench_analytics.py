@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Aircraft, Flight, Passenger, FlightColumns, LoadFactorAnalytics
+from airport import analytics
+
+CITIES = ["Москва", "Санкт-Петербург", "Казань", "Сочи", "Новосибирск", "Екатеринбург", "Калининград"]
+
+
+def build_flights(n, seed=7):
+    rng = random.Random(seed)
+    fleet = [Aircraft(model, capacity, f"RA-{i:05d}")
+             for i, (model, capacity) in enumerate([("Airbus A320", 150), ("Boeing 737", 180), ("Sukhoi Superjet", 98)] * 40)]
+    pool = [Passenger(f"PP{i:08d}", "Иван", "Петров", "Иванович", "1985-05-15") for i in range(400)]
+    start = datetime(2023, 1, 1)
+    flights = []
+    for i in range(n):
+        aircraft = rng.choice(fleet)
+        dep, dest = rng.sample(CITIES, 2)
+        dep_time = (start + timedelta(minutes=37 * i)).strftime('%Y-%m-%d %H:%M')
+        flight = Flight(f"SU-{i:07d}", dep, dest, dep_time, aircraft, 90)
+        for passenger in pool[:rng.randrange(aircraft.capacity)]:
+            flight.add_passenger(passenger)
+        if rng.random() < 0.03:
+            flight.is_cancelled = True
+        flights.append(flight)
+    return flights
+
+
+def naive(flights):
+    reports = {}
+    for name, key in [('route', lambda f: (f.departure, f.destination)), ('model', lambda f: f.aircraft.model),
+                      ('hour', lambda f: f.departure_time.hour), ('month', lambda f: f.departure_time.strftime('%Y-%m'))]:
+        groups = defaultdict(lambda: [0, 0, 0])
+        for f in flights:
+            if not f.is_cancelled:
+                g = groups[key(f)]
+                g[0] += 1
+                g[1] += f.passenger_count
+                g[2] += f.aircraft.capacity
+        reports[name] = {k: g[1] / g[2] * 100 for k, g in groups.items()}
+    reports['underfilled'] = sorted((f.occupancy_rate, f.flight_number) for f in flights if not f.is_cancelled)[:10]
+    return reports
+
+
+def columnar(columns):
+    a = LoadFactorAnalytics(columns)
+    return a.by_route(), a.by_model(), a.by_hour(), a.by_month(), a.underfilled(10)
+
+
+def timed(func, *args, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(n=100000):
+    print(f"Генерация {n} рейсов...")
+    flights = build_flights(n)
+    print(f"numpy: {'да' if analytics._numpy() is not None else 'нет (запасной путь на array)'}")
+    print(f"  цикл по Flight:          {timed(naive, flights):9.1f} мс")
+    build = timed(FlightColumns.from_flights, flights, repeats=1)
+    columns = FlightColumns.from_flights(flights)
+    print(f"  построение колонок:      {build:9.1f} мс (однократно)")
+    print(f"  колоночные group-by:     {timed(columnar, columns):9.1f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
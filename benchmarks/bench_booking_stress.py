@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Aircraft, Flight, Passenger
+from main import AirportSystem
+
+
+def build(db_name, flights=50, capacity=100, passengers=20000):
+    system = AirportSystem(db_name)
+    aircrafts = [Aircraft("Airbus A320", capacity, f"RA-{i:05d}") for i in range(flights)]
+    with system.db.transaction():
+        for aircraft in aircrafts:
+            system.save_aircraft(aircraft)
+        for i, aircraft in enumerate(aircrafts):
+            system.save_flight(Flight(f"SU-{i:04d}", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90))
+        for i in range(passengers):
+            system.save_passenger(Passenger(f"PP{i:08d}", "Иван", "Петров", "Иванович", "1985-05-15"))
+    return system
+
+
+def run(threads, attempts=6000, seed=1):
+    with tempfile.TemporaryDirectory() as tmp:
+        system = build(os.path.join(tmp, "airport.db"))
+        flights = system.flights
+        passengers = system.passengers
+        rng = random.Random(seed)
+        jobs = [(rng.choice(flights), rng.choice(passengers)) for _ in range(attempts)]
+        booked = [0] * threads
+
+        def worker(n):
+            for flight, passenger in jobs[n::threads]:
+                if system.booking.book(flight, passenger):
+                    booked[n] += 1
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+        overbooked = system.db.query('''
+            SELECT COUNT(*) FROM (
+                SELECT b.flight_number FROM bookings b
+                JOIN flights f ON f.flight_number = b.flight_number
+                JOIN aircrafts a ON a.registration = f.aircraft_registration
+                GROUP BY b.flight_number HAVING COUNT(*) > MAX(a.capacity)
+            )
+        ''')[0][0]
+        duplicates = system.db.query('''
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM bookings GROUP BY flight_number, passenger_passport HAVING COUNT(*) > 1
+            )
+        ''')[0][0]
+        system.close()
+        return sum(booked), attempts / elapsed, overbooked, duplicates
+
+
+def main(thread_counts=(1, 2, 4, 8)):
+    print(f"{'threads':>7} {'booked':>7} {'attempts/sec':>13} {'overbooked':>10} {'duplicates':>10}")
+    for threads in thread_counts:
+        booked, rate, overbooked, duplicates = run(threads)
+        print(f"{threads:>7} {booked:>7} {rate:>13.0f} {overbooked:>10} {duplicates:>10}")
+        assert overbooked == 0 and duplicates == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Database
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS bookings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        flight_number TEXT NOT NULL,
+        passenger_passport TEXT NOT NULL,
+        booking_time TEXT NOT NULL
+    )
+'''
+INSERT = 'INSERT INTO bookings (flight_number, passenger_passport, booking_time) VALUES (?, ?, ?)'
+
+
+def booking_rows(n):
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return [(f"SU-{i % 500:04d}", f"PP{i:08d}", now) for i in range(n)]
+
+
+def bench_connect_per_row(db_name, rows):
+    start = time.perf_counter()
+    for row in rows:
+        conn = sqlite3.connect(db_name)
+        conn.execute(INSERT, row)
+        conn.commit()
+        conn.close()
+    return len(rows) / (time.perf_counter() - start)
+
+
+def bench_long_lived(db_name, rows):
+    db = Database(db_name)
+    start = time.perf_counter()
+    for row in rows:
+        db.execute(INSERT, row)
+    result = len(rows) / (time.perf_counter() - start)
+    db.close()
+    return result
+
+
+def bench_unit_of_work(db_name, rows, batch=1000):
+    db = Database(db_name)
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch):
+        with db.transaction() as conn:
+            for row in rows[i:i + batch]:
+                conn.execute(INSERT, row)
+    result = len(rows) / (time.perf_counter() - start)
+    db.close()
+    return result
+
+
+def main(n=2000):
+    rows = booking_rows(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, bench in [('connect per row', bench_connect_per_row),
+                            ('long-lived WAL', bench_long_lived),
+                            ('unit of work', bench_unit_of_work)]:
+            db_name = os.path.join(tmp, name.replace(' ', '_') + '.db')
+            with sqlite3.connect(db_name) as conn:
+                conn.execute(SCHEMA)
+            conn.close()
+            results[name] = bench(db_name, rows)
+        for name, rate in results.items():
+            print(f"{name:>16}: {rate:10.0f} bookings/sec")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import INSERT_BOOKING, LatencyMetrics
+from main import AirportSystem
+from synthetic import SyntheticGenerator
+
+
+def populate(system, passengers, days, bookings):
+    generator = SyntheticGenerator()
+    aircrafts = generator.aircrafts(100)
+    people = generator.passengers(passengers)
+    flights = generator.flights(aircrafts, days)
+    for aircraft in aircrafts:
+        system.save_aircraft(aircraft)
+    with system.db.transaction():
+        for passenger in people:
+            system.save_passenger(passenger)
+        for flight in flights:
+            system.save_flight(flight)
+    rng = random.Random(11)
+    frequent = people[:100]
+    pairs = {(rng.choice(flights).flight_number, rng.choice(frequent if rng.random() < 0.3 else people).passport)
+             for _ in range(bookings)}
+    with system.db.transaction() as conn:
+        conn.executemany(INSERT_BOOKING, [(number, passport, '2025-01-01 00:00:00') for number, passport in pairs])
+    return frequent, len(pairs)
+
+
+def measure(query, passports):
+    samples = []
+    for passport in passports:
+        start = time.perf_counter()
+        query(passport)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return LatencyMetrics.percentile(samples, 50) * 1000, LatencyMetrics.percentile(samples, 99) * 1000
+
+
+def main(passengers=100000, days=365, bookings=300000, n=200):
+    with tempfile.TemporaryDirectory() as directory:
+        system = AirportSystem(os.path.join(directory, 'history.db'), load=False)
+        frequent, booked = populate(system, passengers, days, bookings)
+        history = system.history
+        print(f"Бронирований: {booked}, у постоянного пассажира в среднем {history.count(frequent[0].passport)}")
+        rng = random.Random(5)
+        passports = [rng.choice(frequent).passport for _ in range(n)]
+        print(f"{'запрос':>22} {'p50, мс':>9} {'p99, мс':>9}")
+        for name, query in (('первая страница', history.page),
+                            ('вторая страница', lambda p: history.page(p, after=history.page(p)[-1].flight_number)),
+                            ('количество', history.count),
+                            ('по годам', history.flights_per_year),
+                            ('частые маршруты', history.top_routes)):
+            p50, p99 = measure(query, passports)
+            print(f"{name:>22} {p50:>9.2f} {p99:>9.2f}")
+        system.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Aircraft, Flight, Passenger
+
+
+def make_passengers(n):
+    return [Passenger(f"PP{i:08d}", "Иван", "Петров", "Иванович", "1985-05-15") for i in range(n)]
+
+
+def bench_list(passengers):
+    manifest = []
+    start = time.perf_counter()
+    for passenger in passengers:
+        if passenger not in manifest:
+            manifest.append(passenger)
+    for passenger in passengers:
+        if passenger in manifest:
+            manifest.remove(passenger)
+    return time.perf_counter() - start
+
+
+def bench_flight(passengers):
+    flight = Flight("SU-0001", "Москва", "СПб", "2025-01-20 08:00", Aircraft("Airbus A380", len(passengers), "RA-00001"), 90)
+    start = time.perf_counter()
+    for passenger in passengers:
+        flight.add_passenger(passenger)
+    for passenger in passengers:
+        flight.remove_passenger(passenger)
+    return time.perf_counter() - start
+
+
+def main(sizes=(100, 500, 2000, 5000)):
+    print(f"{'N':>6} {'list, ms':>10} {'Flight, ms':>11}")
+    for n in sizes:
+        passengers = make_passengers(n)
+        print(f"{n:>6} {bench_list(passengers) * 1000:>10.2f} {bench_flight(passengers) * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Aircraft, Flight, Passenger
+
+NAMES = ["Иван", "Мария", "Олег", "Анна", "Пётр"]
+SURNAMES = ["Петров", "Иванова", "Сидоров", "Смирнова", "Кузнецов"]
+PATRONYMICS = ["Иванович", "Денисовна", "Петрович", "Олеговна", "Сергеевич"]
+CITIES = ["Москва", "Санкт-Петербург", "Казань", "Сочи", "Новосибирск"]
+
+
+def measure(factory, n):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    size -= sys.getsizeof(objects)
+    return size / n
+
+
+def main(n=100000):
+    aircraft = Aircraft("Boeing 737", 180, "RA-73651")
+    factories = {
+        'Aircraft': lambda i: Aircraft("Boeing 737", 180, f"RA-{i:06d}"),
+        'Passenger': lambda i: Passenger(f"PP{i:08d}", NAMES[i % 5], SURNAMES[i % 5], PATRONYMICS[i % 5],
+                                         f"19{50 + i % 50}-0{1 + i % 9}-1{i % 10}"),
+        'Flight': lambda i: Flight(f"SU-{i:06d}", CITIES[i % 5], CITIES[(i + 1) % 5],
+                                   f"2025-0{1 + i % 9}-1{i % 10} 08:00", aircraft, 90),
+    }
+    for name, factory in factories.items():
+        print(f"{name:>10}: {measure(factory, n):8.1f} bytes/object")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,79 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Database, migrate, timestamp
+
+QUERIES = {
+    'manifest': ('SELECT p.passport FROM bookings b JOIN passengers p ON p.passport = b.passenger_passport '
+                 'WHERE b.flight_number = ?', lambda rng, n: (f"SU-{rng.randrange(n['flights']):06d}",)),
+    'passenger history': ('SELECT flight_number FROM bookings WHERE passenger_passport = ?',
+                          lambda rng, n: (f"PP{rng.randrange(n['passengers']):08d}",)),
+    'flights by date': ("SELECT flight_number FROM flights WHERE departure_time >= ? AND departure_time < ?",
+                        lambda rng, n: ('2025-03-01 00:00', '2025-03-02 00:00')),
+    'aircraft schedule': ('SELECT flight_number FROM flights WHERE aircraft_registration = ? ORDER BY departure_time',
+                          lambda rng, n: (f"RA-{rng.randrange(n['aircrafts']):05d}",)),
+}
+MIGRATED_QUERIES = {
+    'manifest (integer keys)': ('SELECT p.passport FROM bookings b JOIN passengers p ON p.rowid = b.passenger_id '
+                                'WHERE b.flight_id = ?', lambda rng, n: (rng.randrange(1, n['flights']),)),
+    'flights by date (numeric)': ('SELECT flight_number FROM flights WHERE departure_ts >= ? AND departure_ts < ?',
+                                  lambda rng, n: (timestamp(datetime(2025, 3, 1)), timestamp(datetime(2025, 3, 2)))),
+}
+
+
+def populate(db, bookings, seed=42):
+    rng = random.Random(seed)
+    n = {'aircrafts': 300, 'passengers': bookings // 4, 'flights': bookings // 100}
+    start = datetime(2025, 1, 1)
+    with db.transaction() as conn:
+        conn.executemany('INSERT INTO aircrafts VALUES (?, ?, ?)',
+                         ((f"RA-{i:05d}", "Airbus A320", 180) for i in range(n['aircrafts'])))
+        conn.executemany('INSERT INTO passengers VALUES (?, ?, ?, ?, ?)',
+                         ((f"PP{i:08d}", "Иван", "Петров", "Иванович", "1985-05-15") for i in range(n['passengers'])))
+        conn.executemany('INSERT INTO flights VALUES (?, ?, ?, ?, ?, ?, 0)',
+                         ((f"SU-{i:06d}", "Москва", "СПб",
+                           (start + timedelta(minutes=10 * i)).strftime('%Y-%m-%d %H:%M'),
+                           f"RA-{i % n['aircrafts']:05d}", 90) for i in range(n['flights'])))
+        conn.executemany('INSERT INTO bookings (flight_number, passenger_passport, booking_time) VALUES (?, ?, ?)',
+                         ((f"SU-{i % n['flights']:06d}", f"PP{(i // n['flights'] * 7919 + i) % n['passengers']:08d}",
+                           '2024-12-01 10:00:00') for i in range(bookings)))
+    return n
+
+
+def report(db, queries, n, repeats=20):
+    rng = random.Random(1)
+    for name, (sql, params) in queries.items():
+        plan = '; '.join(row[-1] for row in db.query(f'EXPLAIN QUERY PLAN {sql}', params(rng, n)))
+        start = time.perf_counter()
+        for _ in range(repeats):
+            db.query(sql, params(rng, n))
+        elapsed = (time.perf_counter() - start) / repeats * 1000
+        print(f"  {name:<28} {elapsed:9.2f} ms  {plan}")
+
+
+def main(bookings=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "airport.db"))
+        with db.transaction() as conn:
+            migrate(conn, target=1)
+        print(f"Генерация {bookings} бронирований...")
+        n = populate(db, bookings)
+        print("До миграций:")
+        report(db, QUERIES, n, repeats=3)
+        start = time.perf_counter()
+        with db.transaction() as conn:
+            migrate(conn)
+        print(f"Миграции применены за {time.perf_counter() - start:.1f} с")
+        print("После миграций:")
+        report(db, {**QUERIES, **MIGRATED_QUERIES}, n)
+        db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
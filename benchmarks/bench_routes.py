@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import LatencyMetrics, RouteNetwork
+from synthetic import CITIES, SyntheticGenerator
+
+
+def build(aircrafts, days, legs_per_day):
+    generator = SyntheticGenerator()
+    flights = generator.flights(generator.aircrafts(aircrafts), days, legs_per_day)
+    by_number = {f.flight_number: f for f in flights}
+    network = RouteNetwork(by_number.get)
+    start = time.perf_counter()
+    for flight in flights:
+        network.add_flight(flight)
+    return network, flights, time.perf_counter() - start
+
+
+def measure(query, queries):
+    samples = []
+    for args in queries:
+        start = time.perf_counter()
+        query(*args)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return (LatencyMetrics.percentile(samples, 50) * 1000, LatencyMetrics.percentile(samples, 99) * 1000,
+            len(queries) / sum(samples))
+
+
+def main(aircrafts=1000, days=90, legs_per_day=4, n=500):
+    network, flights, elapsed = build(aircrafts, days, legs_per_day)
+    print(f"Сеть: {len(network)} рейсов, {len(network.cities)} городов, построение {elapsed:.2f} с")
+    rng = random.Random(7)
+    cities = list(CITIES)
+    first = flights[0].departure_time.replace(hour=0, minute=0)
+    queries = [(*rng.sample(cities, 2), first + timedelta(days=rng.randrange(days - 2), hours=rng.randrange(24)))
+               for _ in range(n)]
+    print(f"{'запрос':>24} {'p50, мс':>9} {'p99, мс':>9} {'запросов/с':>11}")
+    for name, query in (('earliest_arrival', lambda o, d, t: network.earliest_arrival(o, d, t)),
+                        ('connections k=3', lambda o, d, t: network.connections(o, d, t, k=3)),
+                        ('connections k=10', lambda o, d, t: network.connections(o, d, t, k=10))):
+        p50, p99, rate = measure(query, queries)
+        print(f"{name:>24} {p50:>9.2f} {p99:>9.2f} {rate:>11.0f}")
+    victims = rng.sample(flights, 1000)
+    start = time.perf_counter()
+    for flight in victims:
+        network.remove_flight(flight.flight_number)
+    for flight in victims:
+        network.add_flight(flight)
+    print(f"Инкрементальное удаление и добавление 1000 рейсов: {(time.perf_counter() - start) * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,52 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Database, LatencyMetrics, PassengerSearch, UPSERT_PASSENGER, migrate
+from synthetic import SyntheticGenerator
+
+
+def typo(text, rng):
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def measure(search, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        search.search(query)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return LatencyMetrics.percentile(samples, 50) * 1000, LatencyMetrics.percentile(samples, 99) * 1000
+
+
+def main(n=200000, queries=200):
+    passengers = SyntheticGenerator().passengers(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'search.db'))
+        migrate(db.connection())
+        start = time.perf_counter()
+        db.executemany(UPSERT_PASSENGER, ((p.passport, p.name, p.surname, p.patronymic,
+                                           p.date_of_birth.strftime('%Y-%m-%d')) for p in passengers))
+        print(f"Загрузка {n} пассажиров с индексом FTS5: {time.perf_counter() - start:.1f} с")
+        rng = random.Random(11)
+        sample = rng.sample(passengers, queries)
+        search = PassengerSearch(db)
+        print(f"{'запрос':>22} {'p50, мс':>9} {'p99, мс':>9}")
+        for name, items in (('паспорт целиком', [p.passport for p in sample]),
+                            ('префикс паспорта', [p.passport[:6] for p in sample]),
+                            ('ФИО', [p.full_name for p in sample]),
+                            ('фамилия', [p.surname for p in sample]),
+                            ('ФИО с опечаткой', [typo(p.full_name, rng) for p in sample])):
+            p50, p99 = measure(search, items)
+            print(f"{name:>22} {p50:>9.2f} {p99:>9.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
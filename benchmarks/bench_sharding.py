@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import LatencyMetrics
+from main import open_shards
+from synthetic import HUBS, SyntheticGenerator
+
+
+def populate(directory, hubs, passengers, days):
+    generator = SyntheticGenerator()
+    sharded = open_shards(directory, hubs=hubs, workers=max(len(hubs), 1))
+    aircrafts = generator.aircrafts(40)
+    for aircraft in aircrafts:
+        sharded.save_aircraft(aircraft)
+    people = generator.passengers(passengers)
+    with sharded.common.db.transaction():
+        for passenger in people:
+            sharded.save_passenger(passenger)
+    flights = [f for f in generator.flights(aircrafts, days) if f.departure in HUBS]
+    for flight in flights:
+        sharded.save_flight(flight)
+    return sharded, flights, people
+
+
+def book_concurrently(sharded, flights, people, threads, per_thread):
+    by_shard = {}
+    for flight in flights:
+        by_shard.setdefault(sharded.locate(flight.flight_number), []).append(flight.flight_number)
+    groups = list(by_shard.values())
+    booked = [0] * threads
+
+    def worker(i):
+        rng = random.Random(i)
+        numbers = groups[i % len(groups)]
+        for _ in range(per_thread):
+            booked[i] += sharded.book(rng.choice(numbers), rng.choice(people).passport)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(booked), time.perf_counter() - start
+
+
+def main(passengers=20000, days=30, threads=4, per_thread=500):
+    print(f"{'шардов':>7} {'броней':>8} {'броней/с':>10} {'история p50, мс':>16} {'статистика, мс':>15}")
+    for hubs in ([], HUBS[:2], HUBS[:4]):
+        with tempfile.TemporaryDirectory() as directory:
+            sharded, flights, people = populate(directory, list(hubs), passengers, days)
+            booked, seconds = book_concurrently(sharded, flights, people, threads, per_thread)
+            samples = []
+            for passenger in random.Random(3).sample(people, 200):
+                start = time.perf_counter()
+                sharded.history.page(passenger.passport)
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            start = time.perf_counter()
+            sharded.statistics()
+            stats_ms = (time.perf_counter() - start) * 1000
+            print(f"{len(sharded.shards):>7} {booked:>8} {booked / seconds:>10.0f} "
+                  f"{LatencyMetrics.percentile(samples, 50) * 1000:>16.2f} {stats_ms:>15.1f}")
+            sharded.close()
+    print("Все шарды работают в одном процессе под общим GIL, поэтому скорость записи не растёт с числом шардов:\n"
+          "шардирование разносит блокировки записи SQLite по файлам и ускоряет запросы внутри шарда.")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
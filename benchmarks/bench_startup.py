@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Database, Passenger, UPSERT_PASSENGER, migrate
+from main import AirportSystem
+
+NAMES = ["Иван", "Мария", "Олег", "Анна", "Пётр"]
+SURNAMES = ["Петров", "Иванова", "Сидоров", "Смирнова", "Кузнецов"]
+PATRONYMICS = ["Иванович", "Денисовна", "Петрович", "Олеговна", "Сергеевич"]
+
+
+def populate(path, n):
+    db = Database(path)
+    migrate(db.connection())
+    first = date(1940, 1, 1)
+    with db.transaction():
+        db.executemany(UPSERT_PASSENGER, ((f"PP{i:08d}", NAMES[i % 5], SURNAMES[i % 5], PATRONYMICS[i % 5],
+                                           (first + timedelta(days=i * 7919 % 25000)).strftime('%Y-%m-%d'))
+                                          for i in range(n)))
+    db.close()
+
+
+def bench_strptime(path):
+    db = Database(path)
+    start = time.perf_counter()
+    passengers = {}
+    for passport, name, surname, patronymic, dob in db.query(
+            'SELECT passport, name, surname, patronymic, date_of_birth FROM passengers'):
+        datetime.strptime(dob, "%Y-%m-%d").date()
+        passengers[passport] = (name, surname, patronymic)
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def bench_startup(path):
+    start = time.perf_counter()
+    system = AirportSystem(path)
+    elapsed = time.perf_counter() - start
+    count = len(system.registry.passengers)
+    system.db.close()
+    return elapsed, count
+
+
+def bench_age(passengers, rounds=3):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for passenger in passengers:
+            passenger.age
+    return (time.perf_counter() - start) / rounds
+
+
+def main(n=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'startup.db')
+        print(f"Заполнение базы: {n} пассажиров...")
+        populate(path, n)
+        print(f"  только strptime по строкам:   {bench_strptime(path):7.2f} с")
+        elapsed, count = bench_startup(path)
+        print(f"  AirportSystem (from_row):     {elapsed:7.2f} с, загружено {count}")
+        passengers = [Passenger.from_row(f"PP{i:08d}", "Иван", "Петров", "Иванович", date(1985, 5, 15))
+                      for i in range(min(n, 200000))]
+        print(f"  age для {len(passengers)} пассажиров:  {bench_age(passengers) * 1000:7.1f} мс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
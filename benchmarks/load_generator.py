@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import LatencyMetrics
+
+
+async def request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                  f"Content-Length: {len(data)}\r\n\r\n").encode('latin-1') + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, paths, deadline, latencies, statuses, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, body = rng.choice(paths)
+            start = time.perf_counter()
+            status = await request(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def discover(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /flights?page_size=100 HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    response = await reader.read()
+    writer.close()
+    return [f['flight_number'] for f in json.loads(response.split(b'\r\n\r\n', 1)[1])['flights']]
+
+
+async def run(host, port, concurrency, duration, passports):
+    flights = await discover(host, port)
+    paths = [('GET', '/flights?page_size=20', None), ('GET', '/statistics', None)]
+    paths += [('GET', f'/flights/{n}', None) for n in flights]
+    paths += [('GET', f'/flights/{n}/passengers', None) for n in flights]
+    paths += [('POST', '/bookings', {'flight_number': n, 'passport': p}) for n in flights[:10] for p in passports]
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, deadline, latencies, statuses, i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    print(f"Запросов: {len(ordered)}, за {elapsed:.1f} с, {len(ordered) / elapsed:.0f} запросов/с")
+    print(f"p50: {LatencyMetrics.percentile(ordered, 50) * 1000:.2f} мс, "
+          f"p99: {LatencyMetrics.percentile(ordered, 99) * 1000:.2f} мс")
+    print(f"Коды ответов: {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный генератор для API аэропорта")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--passport', action='append', default=[], help="паспорт для POST /bookings")
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.concurrency, args.duration, args.passport))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import AirportSystem
+from synthetic import SyntheticGenerator
+
+SCALES = {
+    'small': {'aircrafts': 10, 'passengers': 2000, 'days': 30, 'bookings': 2000},
+    'medium': {'aircrafts': 50, 'passengers': 20000, 'days': 60, 'bookings': 10000},
+    'large': {'aircrafts': 150, 'passengers': 100000, 'days': 90, 'bookings': 30000},
+}
+COLD_START_BUDGETS = {'cold_import_s': 0.3, 'cold_stats_s': 0.5, 'cold_book_s': 0.5}
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def rate(count, seconds):
+    return round(count / seconds, 1) if seconds else None
+
+
+def cold_start(*args):
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, *args], cwd=ROOT, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, text=True)
+    process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.communicate()
+    return round(elapsed, 4)
+
+
+def run_scale(name, params, directory, seed, formats):
+    generator = SyntheticGenerator(seed)
+    aircrafts = generator.aircrafts(params['aircrafts'])
+    passengers = generator.passengers(params['passengers'])
+    flights = generator.flights(aircrafts, params['days'])
+    bookings = generator.bookings(flights, passengers, params['bookings'])
+    db_name = os.path.join(directory, f"{name}.db")
+    result = {'aircrafts': len(aircrafts), 'passengers': len(passengers), 'flights': len(flights),
+              'bookings': len(bookings)}
+
+    system = AirportSystem(db_name)
+    for kind, items, save in (('aircrafts', aircrafts, system.save_aircraft),
+                              ('passengers', passengers, system.save_passenger),
+                              ('flights', flights, system.save_flight)):
+        seconds, _ = timed(lambda: [save(item) for item in items])
+        result[f"save_{kind}_s"] = round(seconds, 4)
+        result[f"save_{kind}_per_s"] = rate(len(items), seconds)
+
+    seconds, booked = timed(lambda: sum(system.booking.book(f, p) for f, p in bookings))
+    result['booking_s'] = round(seconds, 4)
+    result['bookings_per_s'] = rate(booked, seconds)
+
+    seconds, _ = timed(lambda: [system.stats.snapshot() for _ in range(100)])
+    result['stats_snapshot_ms'] = round(seconds * 10, 4)
+    seconds, _ = timed(system.refresh_statistics)
+    result['stats_refresh_s'] = round(seconds, 4)
+    seconds, _ = timed(lambda: system.analytics().by_route())
+    result['analytics_by_route_s'] = round(seconds, 4)
+
+    for fmt in formats:
+        try:
+            seconds, _ = timed(system.export_report, fmt, os.path.join(directory, f"{name}.{fmt}"), background=False)
+            result[f"export_{fmt}_s"] = round(seconds, 4)
+        except ImportError:
+            result[f"export_{fmt}_s"] = None
+    system.close()
+
+    for mode, kwargs in (('eager', {}), ('lazy', {'lazy': True})):
+        seconds, restarted = timed(AirportSystem, db_name, **kwargs)
+        result[f"startup_{mode}_s"] = round(seconds, 4)
+        restarted.close()
+
+    main_py = os.path.join(ROOT, 'main.py')
+    result['cold_import_s'] = cold_start('-c', 'import main; print()')
+    result['cold_stats_s'] = cold_start(main_py, '--db', db_name, 'stats')
+    result['cold_book_s'] = cold_start(main_py, '--db', db_name, 'book', flights[-1].flight_number, '0000000000',
+                                       '--surname', 'Холодов', '--name', 'Старт', '--born', '1990-01-01')
+    return result
+
+
+def over_budget(results, budgets):
+    return [(scale, metric, metrics[metric], limit) for scale, metrics in results.items()
+            for metric, limit in budgets.items() if metrics.get(metric) is not None and metrics[metric] > limit]
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    for scale, metrics in current['results'].items():
+        before = previous.get('results', {}).get(scale)
+        if not before:
+            continue
+        print(f"\n{scale}:")
+        for metric, value in metrics.items():
+            old = before.get(metric)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old and metric.endswith(('_s', '_ms', '_per_s')):
+                change = (value - old) / old * 100
+                print(f"  {metric:>26}: {old:>12} → {value:<12} ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Набор бенчмарков на синтетических данных")
+    parser.add_argument('--scales', nargs='+', choices=SCALES, default=['small', 'medium'])
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--formats', nargs='+', choices=('docx', 'csv'), default=['docx', 'csv'])
+    parser.add_argument('--output', default=None, help="файл результатов JSON")
+    parser.add_argument('--compare', help="предыдущий файл результатов для сравнения")
+    parser.add_argument('--budget-factor', type=float, default=1.0,
+                        help="множитель бюджетов холодного старта для медленных машин")
+    args = parser.parse_args(argv)
+
+    report = {'revision': git_revision(), 'timestamp': datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(), 'platform': platform.platform(), 'seed': args.seed,
+              'results': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.scales:
+            print(f"Масштаб {name}: {SCALES[name]}")
+            report['results'][name] = run_scale(name, SCALES[name], directory, args.seed, args.formats)
+            for metric, value in report['results'][name].items():
+                print(f"  {metric:>26}: {value}")
+    output = args.output or f"bench_{report['revision'] or 'local'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены: {output}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+    budgets = {metric: limit * args.budget_factor for metric, limit in COLD_START_BUDGETS.items()}
+    violations = over_budget(report['results'], budgets)
+    for scale, metric, value, limit in violations:
+        print(f"Превышен бюджет холодного старта ({scale}) {metric}: {value} с > {limit:.2f} с")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
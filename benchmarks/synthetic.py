@@ -0,0 +1,96 @@
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airport import Aircraft, Flight, Passenger
+
+MODELS = [("Sukhoi Superjet 100", 98), ("Airbus A320", 158), ("Airbus A321", 212),
+          ("Boeing 737-800", 189), ("МС-21-300", 211), ("Boeing 777-300", 402)]
+MALE_NAMES = ["Александр", "Алексей", "Андрей", "Дмитрий", "Иван", "Максим", "Михаил", "Никита", "Олег",
+              "Пётр", "Сергей", "Фёдор", "Юрий", "Ярослав"]
+FEMALE_NAMES = ["Анна", "Дарья", "Екатерина", "Елена", "Ирина", "Мария", "Наталья", "Ольга", "Светлана",
+                "Татьяна", "Юлия", "Алёна"]
+SURNAMES = ["Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов", "Новиков",
+            "Фёдоров", "Морозов", "Волков", "Алексеев", "Лебедев", "Семёнов", "Егоров", "Павлов", "Козлов"]
+FATHER_NAMES = [("Александр", "Александрович", "Александровна"), ("Алексей", "Алексеевич", "Алексеевна"),
+                ("Андрей", "Андреевич", "Андреевна"), ("Дмитрий", "Дмитриевич", "Дмитриевна"),
+                ("Иван", "Иванович", "Ивановна"), ("Михаил", "Михайлович", "Михайловна"),
+                ("Пётр", "Петрович", "Петровна"), ("Сергей", "Сергеевич", "Сергеевна"),
+                ("Юрий", "Юрьевич", "Юрьевна"), ("Олег", "Олегович", "Олеговна")]
+CITIES = {"Москва": (55.75, 37.62), "Санкт-Петербург": (59.94, 30.31), "Казань": (55.79, 49.12),
+          "Сочи": (43.60, 39.73), "Екатеринбург": (56.84, 60.61), "Новосибирск": (55.03, 82.92),
+          "Калининград": (54.71, 20.51), "Краснодар": (45.04, 38.98), "Самара": (53.20, 50.15),
+          "Владивосток": (43.12, 131.89), "Мурманск": (68.97, 33.07), "Иркутск": (52.29, 104.28)}
+HUBS = ["Москва", "Санкт-Петербург", "Екатеринбург", "Новосибирск"]
+
+
+def duration_minutes(departure, destination):
+    (lat1, lon1), (lat2, lon2) = CITIES[departure], CITIES[destination]
+    distance = ((lat1 - lat2) ** 2 + ((lon1 - lon2) * 0.6) ** 2) ** 0.5 * 111
+    return int(40 + distance / 13) // 5 * 5
+
+
+class SyntheticGenerator:
+    def __init__(self, seed: int = 2024, start: date = date(2025, 1, 1)):
+        self._seed = seed
+        self._start = start
+
+    def _rng(self, name):
+        return random.Random(f"{self._seed}:{name}")
+
+    def aircrafts(self, n):
+        rng = self._rng('aircrafts')
+        weights = [30, 25, 15, 15, 10, 5]
+        result = []
+        for i in range(n):
+            model, capacity = rng.choices(MODELS, weights)[0]
+            result.append(Aircraft(model, capacity, f"RA-{10000 + i * 37 % 90000:05d}"))
+        return result
+
+    def passengers(self, n):
+        rng = self._rng('passengers')
+        first_day = date(1940, 1, 1).toordinal()
+        span = date(2012, 12, 31).toordinal() - first_day
+        result = []
+        for i in range(n):
+            female = rng.random() < 0.52
+            surname = rng.choice(SURNAMES) + ("а" if female else "")
+            name = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+            patronymic = rng.choice(FATHER_NAMES)[2 if female else 1]
+            passport = f"{4501 + i % 97 + i // 1000000 * 100:04d}{(i * 7919 + 13) % 1000000:06d}"
+            dob = date.fromordinal(first_day + rng.randrange(span)).strftime('%Y-%m-%d')
+            result.append(Passenger(passport, name, surname, patronymic, dob))
+        return result
+
+    def flights(self, aircrafts, days, legs_per_day: int = 2, turnaround_min: int = 60):
+        rng = self._rng('flights')
+        cities = list(CITIES)
+        result = []
+        for index, aircraft in enumerate(aircrafts):
+            location = HUBS[index % len(HUBS)]
+            for day in range(days):
+                clock = datetime.combine(self._start + timedelta(days=day), datetime.min.time())
+                clock += timedelta(hours=6, minutes=5 * rng.randrange(24))
+                for _ in range(legs_per_day):
+                    destination = rng.choice([c for c in (HUBS if location not in HUBS else cities) if c != location])
+                    duration = duration_minutes(location, destination)
+                    number = f"SU-{len(result) + 1:06d}"
+                    result.append(Flight(number, location, destination, clock.strftime('%Y-%m-%d %H:%M'),
+                                         aircraft, duration))
+                    clock += timedelta(minutes=duration + turnaround_min + 5 * rng.randrange(12))
+                    location = destination
+        return result
+
+    def bookings(self, flights, passengers, total):
+        rng = self._rng('bookings')
+        pairs = []
+        for flight in rng.sample(flights, len(flights)):
+            if len(pairs) >= total:
+                break
+            seats = int(flight.aircraft.capacity * rng.uniform(0.4, 0.95))
+            for passenger in rng.sample(passengers, min(seats, len(passengers), total - len(pairs))):
+                pairs.append((flight, passenger))
+        return pairs
@@ -1,204 +1,566 @@
 from airport import *
-from datetime import datetime
-import sqlite3
-from docx import Document
+from datetime import datetime, timedelta
+import argparse
 import os
+import sys
 
 
 class AirportSystem:
+    PAGE_SIZE = 20
+    FLIGHT_COLUMNS = ('flight_number, departure, destination, departure_time, aircraft_registration, '
+                      'duration_minutes, is_cancelled')
 
-    def __init__(self, db_name='airport.db'):
+    def __init__(self, db_name='airport.db', load=True, lazy=False, journal_dir=None, snapshot_interval=10000,
+                 profiler=None, cache_size=10000, cache_ttl=None, preload=True):
+        if lazy and journal_dir:
+            raise ValueError("Журнал недоступен в ленивом режиме")
         self.db_name = db_name
-        self.aircrafts = []
-        self.passengers = []
-        self.flights = []
+        self.db = Database(db_name)
+        self.registry = Registry()
+        self.stats = StatisticsAggregator()
+        self.report_jobs = []
+        self.schedule = AircraftSchedule()
+        self.booking = BookingService(self.db)
+        self.routes = RouteNetwork(self.get_flight)
+        self.search = PassengerSearch(self.db)
+        self.history = BookingHistory(self.db)
+        self.journal = Journal(journal_dir, snapshot_interval) if journal_dir else None
+        self.lazy = lazy
+        self.loaded = bool(lazy and preload or not lazy and load)
+        self.flight_cache = ObjectCache(cache_size, cache_ttl)
+        self.passenger_cache = ObjectCache(cache_size, cache_ttl)
+        self.profiler = Profiler.from_env() if profiler is None else profiler or None
+        if self.profiler is not None:
+            self.profiler.attach(self)
         self.init_database()
-        self.load_from_database()
+        self._journal_version = self.data_version()
+        self._journal_stale = False
+        if self.journal is not None:
+            self.db.set_begin_hook(self._check_journal)
+        if lazy:
+            self.load_aircrafts()
+            if preload:
+                self.stats.load_from_database(self.db)
+                self.load_schedule(datetime.now())
+                self.load_routes(datetime.now())
+        elif load:
+            if not (self.journal is not None and self.journal.exists() and self.restore_from_journal()):
+                self.load_from_database()
+                if self.journal is not None:
+                    self.write_snapshot()
+
+    @property
+    def aircrafts(self):
+        return self.registry.aircrafts
+    @property
+    def passengers(self):
+        return self.registry.passengers
+    @property
+    def flights(self):
+        return self.registry.flights
+
+    def close(self):
+        for job in self.report_jobs:
+            job.wait()
+        if self.journal is not None:
+            if self.journal.pending:
+                self.write_snapshot()
+            self.journal.close()
+        if self.profiler is not None:
+            self.profiler.detach(self)
+            if self.profiler.path and not self.profiler.attached:
+                self.profiler.dump()
+        self.db.close()
 
     def init_database(self):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS aircrafts (
-                registration TEXT PRIMARY KEY,
-                model TEXT NOT NULL,
-                capacity INTEGER NOT NULL
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS passengers (
-                passport TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                surname TEXT NOT NULL,
-                patronymic TEXT NOT NULL,
-                date_of_birth TEXT NOT NULL
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS flights (
-                flight_number TEXT PRIMARY KEY,
-                departure TEXT NOT NULL,
-                destination TEXT NOT NULL,
-                departure_time TEXT NOT NULL,
-                aircraft_registration TEXT NOT NULL,
-                duration_minutes INTEGER NOT NULL,
-                is_cancelled INTEGER DEFAULT 0,
-                FOREIGN KEY (aircraft_registration) REFERENCES aircrafts (registration)
-            )
-        ''')
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS bookings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                flight_number TEXT NOT NULL,
-                passenger_passport TEXT NOT NULL,
-                booking_time TEXT NOT NULL,
-                FOREIGN KEY (flight_number) REFERENCES flights (flight_number),
-                FOREIGN KEY (passenger_passport) REFERENCES passengers (passport)
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            migrate(conn)
+
+    def load_aircrafts(self):
+        for reg, model, capacity in self.db.query('SELECT registration, model, capacity FROM aircrafts'):
+            self.registry.add_aircraft(Aircraft(model, capacity, reg))
 
     def load_from_database(self):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM aircrafts')
-        for row in cursor.fetchall():
-            reg, model, capacity = row
-            aircraft = Aircraft(model, capacity, reg)
-            self.aircrafts.append(aircraft)
-        cursor.execute('SELECT * FROM passengers')
-        for row in cursor.fetchall():
-            passport, name, surname, patronymic, dob = row
-            passenger = Passenger(passport, name, surname, patronymic, dob)
-            self.passengers.append(passenger)
-        cursor.execute('SELECT * FROM flights')
+        self.load_aircrafts()
+        cursor = self.db.connection().cursor()
+        cursor.execute('SELECT passport, name, surname, patronymic, date_of_birth FROM passengers')
+        from_row = Passenger.from_row
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            self.registry.add_passengers([from_row(*row) for row in rows])
+        cursor.execute(f'SELECT {self.FLIGHT_COLUMNS} FROM flights')
         for row in cursor.fetchall():
             number, dep, dest, dep_time, aircraft_reg, duration, cancelled = row
-            aircraft = next((x for x in self.aircrafts if x.registration == aircraft_reg), None)
-            if aircraft:
-                flight = Flight(number, dep, dest, dep_time, aircraft, duration)
-                flight.is_cancelled = bool(cancelled)
-                self.flights.append(flight)
-        cursor.execute('SELECT * FROM bookings')
-        for row in cursor.fetchall():
-            _, flight_num, passport, _ = row
-            flight = next((f for f in self.flights if f.flight_number == flight_num), None)
-            passenger = next((p for p in self.passengers if p.passport == passport), None)
-            if flight and passenger:
+            aircraft = self.registry.get_aircraft(aircraft_reg)
+            if aircraft is not None:
+                self.registry.add_flight(Flight.from_row(number, dep, dest, dep_time, aircraft, duration, cancelled))
+        cursor.execute('SELECT flight_number, passenger_passport FROM bookings ORDER BY id')
+        for flight_num, passport in cursor:
+            flight = self.registry.get_flight(flight_num)
+            passenger = self.registry.get_passenger(passport)
+            if flight is not None and passenger is not None and not flight.is_cancelled:
                 flight.add_passenger(passenger)
-        conn.close()
+        self._index_loaded_state()
+
+    def _index_loaded_state(self):
+        self.stats.aircraft_added(len(self.registry.aircrafts))
+        self.stats.passenger_registered(len(self.registry.passengers))
+        for flight in self.registry.flights:
+            self.stats.flight_added(flight)
+            self.schedule.add_flight(flight)
+            self.routes.add_flight(flight)
+            flight.set_observer(self)
+
+    def data_version(self):
+        return data_version(self.db.connection())
+
+    def _check_journal(self, conn):
+        if data_version(conn) != self._journal_version:
+            self._journal_stale = True
+
+    def restore_from_journal(self):
+        snapshot, events = self.journal.load()
+        if self.journal.watermark is None or self.journal.watermark != self.data_version():
+            return False
+        self._journal_version = self.journal.watermark
+        if snapshot is not None:
+            for reg, model, capacity in snapshot['aircrafts']:
+                self.registry.add_aircraft(Aircraft(model, capacity, reg))
+            self.registry.add_passengers([Passenger.from_row(*row) for row in snapshot['passengers']])
+            for *row, passports in snapshot['flights']:
+                self._apply_event('flight_saved', row)
+                flight = self.registry.get_flight(row[0])
+                for passport in passports:
+                    flight.add_passenger(self.registry.get_passenger(passport))
+        for event, data in events:
+            self._apply_event(event, data)
+        self._index_loaded_state()
+        return True
+
+    def _apply_event(self, event, data):
+        if event == 'aircraft_saved':
+            reg, model, capacity = data
+            self.registry.add_aircraft(Aircraft(model, capacity, reg))
+        elif event == 'passenger_saved':
+            self.registry.add_passenger(Passenger.from_row(*data))
+        elif event == 'flight_saved':
+            number, dep, dest, dep_time, aircraft_reg, duration, cancelled = data
+            self.registry.add_flight(Flight.from_row(number, dep, dest, dep_time,
+                                                     self.registry.get_aircraft(aircraft_reg), duration, cancelled))
+        elif event in ('booking_added', 'booking_removed'):
+            flight = self.registry.get_flight(data[0])
+            passenger = self.registry.get_passenger(data[1])
+            if event == 'booking_added':
+                flight.add_passenger(passenger)
+            else:
+                flight.remove_passenger(passenger)
+        elif event == 'flight_cancelled':
+            self.registry.get_flight(data).cancel_flight()
+        elif event == 'flight_status_changed':
+            self.registry.get_flight(data[0]).is_cancelled = bool(data[1])
+
+    def _memory_state(self):
+        return {
+            'aircrafts': [[a.registration, a.model, a.capacity] for a in self.aircrafts],
+            'passengers': [[p.passport, p.name, p.surname, p.patronymic, p.date_of_birth.strftime('%Y-%m-%d')]
+                           for p in self.passengers],
+            'flights': [[f.flight_number, f.departure, f.destination, f.departure_time.strftime('%Y-%m-%d %H:%M'),
+                         f.aircraft.registration, f.duration_min, int(f.is_cancelled),
+                         [p.passport for p in f.get_passengers()]] for f in self.flights],
+        }
+
+    def _database_state(self, conn):
+        flights = {row[0]: [*row, []] for row in conn.execute(f'SELECT {self.FLIGHT_COLUMNS} FROM flights')}
+        for number, passport in conn.execute('''
+            SELECT b.flight_number, b.passenger_passport FROM bookings b
+            JOIN flights f ON f.rowid = b.flight_id
+            WHERE f.is_cancelled = 0
+            ORDER BY b.id
+        '''):
+            flights[number][-1].append(passport)
+        return {
+            'aircrafts': [list(row) for row in conn.execute('SELECT registration, model, capacity FROM aircrafts')],
+            'passengers': [list(row) for row in conn.execute(
+                'SELECT passport, name, surname, patronymic, date_of_birth FROM passengers')],
+            'flights': list(flights.values()),
+        }
+
+    def write_snapshot(self):
+        with self.db.transaction() as conn:
+            version = data_version(conn)
+            if self._journal_stale or version != self._journal_version:
+                state = self._database_state(conn)
+            else:
+                state = self._memory_state()
+        self.journal.write_snapshot(state, version)
+        self._journal_version = version
+        self._journal_stale = False
+
+    def _record(self, event, data):
+        if self.journal is None:
+            return
+        if self._journal_stale:
+            self.write_snapshot()
+            return
+        self._journal_version = self.data_version()
+        self.journal.append(event, data, self._journal_version)
+        if self.journal.needs_snapshot:
+            self.write_snapshot()
+
+    def passenger_added(self, flight, passenger):
+        self.stats.passenger_added(flight, passenger)
+        self._record('booking_added', [flight.flight_number, passenger.passport])
+
+    def passenger_removed(self, flight, passenger):
+        self.stats.passenger_removed(flight, passenger)
+        self._record('booking_removed', [flight.flight_number, passenger.passport])
+
+    def flight_cancelled(self, flight, passenger_count, was_cancelled):
+        self.stats.flight_cancelled(flight, passenger_count, was_cancelled)
+        self.routes.remove_flight(flight.flight_number)
+        self._record('flight_cancelled', flight.flight_number)
+
+    def flight_status_changed(self, flight):
+        self.stats.flight_status_changed(flight)
+        self.routes.add_flight(flight)
+
+    def load_schedule(self, since=None):
+        query = ('SELECT flight_number, aircraft_registration, departure_time, duration_minutes '
+                 'FROM flights WHERE is_cancelled = 0')
+        params = ()
+        if since is not None:
+            query += ' AND departure_ts >= ?'
+            params = (timestamp(since - timedelta(days=2)),)
+        for number, registration, dep_time, duration in self.db.query(query, params):
+            self.schedule.add(number, registration, parse_datetime(dep_time), duration)
+
+    def load_schedule_window(self, registration, start, end):
+        rows = self.db.query('''
+            SELECT flight_number, departure_time, duration_minutes FROM flights
+            WHERE aircraft_registration = ? AND is_cancelled = 0 AND departure_ts >= ? AND departure_ts < ?
+        ''', (registration, timestamp(start - timedelta(days=2)), timestamp(end + self.schedule.turnaround)))
+        for number, dep_time, duration in rows:
+            self.schedule.add(number, registration, parse_datetime(dep_time), duration)
+
+    def load_routes(self, since=None):
+        query = ('SELECT flight_number, departure, destination, departure_time, duration_minutes '
+                 'FROM flights WHERE is_cancelled = 0')
+        params = ()
+        if since is not None:
+            query += ' AND departure_ts >= ?'
+            params = (timestamp(since - timedelta(days=1)),)
+        for number, dep, dest, dep_time, duration in self.db.query(query, params):
+            start = parse_datetime(dep_time)
+            self.routes.add(number, dep, dest, start, start + timedelta(minutes=duration))
+
+    def find_itineraries(self, origin, destination, after=None, k=3, seats=1, max_legs=3):
+        return self.routes.connections(origin, destination, after or datetime.now(), k, seats, max_legs)
+
+    def search_passengers(self, query, limit=10):
+        return [self._passenger_from_row(row) for row, _ in self.search.search(query, limit)]
+
+    def book_itinerary(self, itinerary, passenger):
+        booked = []
+        for flight in itinerary.flights:
+            if not self.booking.book(flight, passenger):
+                for done in booked:
+                    self.booking.cancel_booking(done, passenger)
+                return False
+            booked.append(flight)
+        return True
+
+    def refresh_statistics(self):
+        self.stats = StatisticsAggregator()
+        self.stats.load_from_database(self.db)
+
+    def statistics(self):
+        if not self.loaded:
+            self.refresh_statistics()
+            self.loaded = True
+        return self.stats.snapshot()
+
+    def _known_flight(self, flight_number):
+        if self.lazy:
+            return self.flight_cache.get(flight_number)
+        return self.registry.get_flight(flight_number)
+
+    def _known_passenger(self, passport):
+        if self.lazy:
+            return self.passenger_cache.get(passport)
+        return self.registry.get_passenger(passport)
+
+    def _remember_flight(self, flight):
+        if self.lazy:
+            self.flight_cache.put(flight.flight_number, flight)
+        else:
+            self.registry.add_flight(flight)
+
+    def _remember_passenger(self, passenger):
+        if self.lazy:
+            self.passenger_cache.put(passenger.passport, passenger)
+        else:
+            self.registry.add_passenger(passenger)
+
+    def cache_stats(self):
+        return {'flights': self.flight_cache.stats(), 'passengers': self.passenger_cache.stats()}
+
+    def _passenger_from_row(self, row):
+        passenger = self._known_passenger(row[0])
+        if passenger is None:
+            passenger = Passenger.from_row(*row)
+            self._remember_passenger(passenger)
+        return passenger
+
+    def _build_flight(self, row):
+        number, dep, dest, dep_time, aircraft_reg, duration, cancelled = row
+        aircraft = self.registry.get_aircraft(aircraft_reg)
+        if aircraft is None:
+            return None
+        flight = Flight.from_row(number, dep, dest, dep_time, aircraft, duration, cancelled)
+        flight.set_passenger_loader(self.load_manifest)
+        flight.set_observer(self)
+        return flight
+
+    def _flight_from_row(self, row):
+        flight = self._known_flight(row[0])
+        if flight is None:
+            flight = self._build_flight(row)
+            if flight is not None:
+                self._remember_flight(flight)
+        return flight
+
+    def _load_flight(self, flight_number):
+        rows = self.db.query(f'SELECT {self.FLIGHT_COLUMNS} FROM flights WHERE flight_number = ?', (flight_number,))
+        return self._build_flight(rows[0]) if rows else None
+
+    def _load_passenger(self, passport):
+        rows = self.db.query('SELECT passport, name, surname, patronymic, date_of_birth '
+                             'FROM passengers WHERE passport = ?', (passport,))
+        return Passenger.from_row(*rows[0]) if rows else None
+
+    def get_flight(self, flight_number):
+        if self.lazy:
+            return self.flight_cache.get_or_load(flight_number, self._load_flight)
+        return self.registry.get_flight(flight_number)
+
+    def get_passenger(self, passport):
+        if self.lazy:
+            return self.passenger_cache.get_or_load(passport, self._load_passenger)
+        return self.registry.get_passenger(passport)
+
+    def load_flights(self, start, end):
+        rows = self.db.query(f'''
+            SELECT {self.FLIGHT_COLUMNS} FROM flights
+            WHERE departure_ts >= ? AND departure_ts < ?
+            ORDER BY departure_ts, flight_number
+        ''', (timestamp(start), timestamp(end)))
+        return [f for f in map(self._flight_from_row, rows) if f is not None]
+
+    def load_manifest(self, flight):
+        rows = self.db.query('''
+            SELECT p.passport, p.name, p.surname, p.patronymic, p.date_of_birth
+            FROM bookings b JOIN passengers p ON p.rowid = b.passenger_id
+            WHERE b.flight_number = ?
+            ORDER BY b.id
+        ''', (flight.flight_number,))
+        return [self._passenger_from_row(row) for row in rows]
+
+    def flight_pages(self, active_only=False, page_size=None, after=None):
+        page_size = page_size or self.PAGE_SIZE
+        status = 'AND is_cancelled = 0' if active_only else ''
+        cursor = self.db.connection().cursor()
+        last = (-1, '')
+        if after is not None:
+            rows = self.db.query('SELECT departure_ts FROM flights WHERE flight_number = ?', (after,))
+            if not rows:
+                return
+            last = (rows[0][0], after)
+        while True:
+            cursor.execute(f'''
+                SELECT {self.FLIGHT_COLUMNS}, departure_ts FROM flights
+                WHERE (departure_ts, flight_number) > (?, ?) {status}
+                ORDER BY departure_ts, flight_number
+                LIMIT ?
+            ''', (*last, page_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            page = [f for f in (self._flight_from_row(row[:-1]) for row in rows) if f is not None]
+            if page:
+                yield page
+            last = (rows[-1][-1], rows[-1][0])
+
+    def choose_flight(self, prompt, describe, active_only=False, empty_message="Нет рейсов."):
+        number = 0
+        for page in self.flight_pages(active_only):
+            first = number
+            for flight in page:
+                number += 1
+                print(f"{number}. {describe(flight)}")
+            choice = input(f"{prompt} (Enter - следующая страница): ").strip()
+            if not choice:
+                continue
+            try:
+                index = int(choice) - 1 - first
+                if not 0 <= index < len(page):
+                    raise IndexError
+                return page[index]
+            except (ValueError, IndexError):
+                print("Неверный выбор рейса.")
+                return None
+        print(empty_message if number == 0 else "Больше рейсов нет.")
+        return None
 
     def save_aircraft(self, aircraft):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO aircrafts 
-            (registration, model, capacity)
-            VALUES (?, ?, ?)
-        ''', (aircraft.registration, aircraft.model, aircraft.capacity))
-        conn.commit()
-        conn.close()
-        self.aircrafts.append(aircraft)
+        if self.registry.get_aircraft(aircraft.registration) is None:
+            self.stats.aircraft_added()
+        with self.db.transaction() as conn:
+            conn.execute(UPSERT_AIRCRAFT, (aircraft.registration, aircraft.model, aircraft.capacity))
+            self.registry.add_aircraft(aircraft)
+            self._record('aircraft_saved', [aircraft.registration, aircraft.model, aircraft.capacity])
 
     def del_aircraft(self):
         pass
 
     def save_passenger(self, passenger):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO passengers 
-            (passport, name, surname, patronymic, date_of_birth)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (passenger.passport, passenger.name, passenger.surname, passenger.patronymic, passenger.date_of_birth.strftime('%Y-%m-%d')))
-        conn.commit()
-        conn.close()
-        self.passengers.append(passenger)
+        if self.get_passenger(passenger.passport) is None:
+            self.stats.passenger_registered()
+        row = (passenger.passport, passenger.name, passenger.surname, passenger.patronymic,
+               passenger.date_of_birth.strftime('%Y-%m-%d'))
+        with self.db.transaction() as conn:
+            conn.execute(UPSERT_PASSENGER, row)
+            self.passenger_cache.invalidate(passenger.passport)
+            self._remember_passenger(passenger)
+            self._record('passenger_saved', row)
 
     def save_flight(self, flight):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO flights 
-            (flight_number, departure, destination, departure_time, aircraft_registration, 
-             duration_minutes, is_cancelled)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (flight.flight_number, flight.departure, flight.destination,
-              flight.departure_time.strftime('%Y-%m-%d %H:%M'), flight.aircraft.registration,
-              flight.duration_min, int(flight.is_cancelled)))
-        conn.commit()
-        conn.close()
-        self.flights.append(flight)
+        if not flight.is_cancelled:
+            if self.lazy or not self.loaded:
+                self.load_schedule_window(flight.aircraft.registration, flight.departure_time, flight.arrival_time)
+            conflicts = self.schedule.flight_conflicts(flight)
+            if conflicts:
+                raise ValueError(f"Самолёт {flight.aircraft.registration} занят рейсами {', '.join(conflicts)}")
+        old = self.get_flight(flight.flight_number)
+        if old is not flight:
+            if old is not None:
+                old.set_observer(None)
+                self.stats.flight_removed(old)
+            self.stats.flight_added(flight)
+            flight.set_observer(self)
+        self.schedule.add_flight(flight)
+        self.routes.add_flight(flight)
+        row = (flight.flight_number, flight.departure, flight.destination,
+               flight.departure_time.strftime('%Y-%m-%d %H:%M'), flight.aircraft.registration,
+               flight.duration_min, int(flight.is_cancelled))
+        with self.db.transaction() as conn:
+            conn.execute(UPSERT_FLIGHT, row)
+            self.flight_cache.invalidate(flight.flight_number)
+            self._remember_flight(flight)
+            self._record('flight_saved', row)
 
     def save_booking(self, flight, passenger):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO bookings (flight_number, passenger_passport, booking_time)
-            VALUES (?, ?, ?)
-        ''', (flight.flight_number, passenger.passport, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as conn:
+            conn.execute(INSERT_BOOKING, (flight.flight_number, passenger.passport,
+                                          datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            self._record('booking_added', [flight.flight_number, passenger.passport])
+
+    def bulk_import(self, kind, path, chunk_size=5000):
+        registry = self.registry if self.loaded and not self.lazy else None
+        report = BulkImporter(self.db, registry, chunk_size, self.schedule).import_file(kind, path)
+        self.flight_cache.clear()
+        self.passenger_cache.clear()
+        if kind == 'aircrafts' and self.lazy:
+            self.load_aircrafts()
+        if kind == 'flights':
+            self.load_routes(datetime.now() if self.lazy else None)
+        if self.loaded:
+            self.refresh_statistics()
+        if self.journal is not None:
+            self.write_snapshot()
+        return report
+
+    def analytics(self):
+        return LoadFactorAnalytics(FlightColumns.from_database(self.db))
+
+    def cancel_flights(self, **predicates):
+        with self.db.transaction():
+            numbers, rows = self.booking.cancel_flights(**predicates)
+            released = {}
+            bookings = []
+            for row in rows:
+                passenger = self._passenger_from_row(row[1:])
+                released.setdefault(row[0], []).append(passenger)
+                bookings.append((row[0], passenger))
+            unloaded = 0
+            for number in numbers:
+                flight = self.flight_cache.peek(number) if self.lazy else self.registry.get_flight(number)
+                self.flight_cache.invalidate(number)
+                self.schedule.remove_flight(number)
+                self.routes.remove_flight(number)
+                if flight is None:
+                    unloaded += 1
+                    continue
+                with self.booking.lock_for(number):
+                    flight.set_passenger_loader(lambda f, passengers=released.get(number, []): passengers)
+                    flight.cancel_flight()
+        for _, passenger in bookings:
+            self.passenger_cache.invalidate(passenger.passport)
+        if unloaded and self.loaded:
+            self.refresh_statistics()
+        return CancellationReport(numbers, bookings)
+
+    def save_flight_status(self, flight):
+        self.schedule.add_flight(flight)
+        self.routes.add_flight(flight)
+        with self.db.transaction() as conn:
+            conn.execute('UPDATE flights SET is_cancelled = ? WHERE flight_number = ?',
+                         (int(flight.is_cancelled), flight.flight_number))
+            self._record('flight_status_changed', [flight.flight_number, int(flight.is_cancelled)])
 
 
     def display_statistics(self):
         print("АЭРОПОРТ - СТАТИСТИКА")
-        aircrafts_num = len(self.aircrafts)
-        passengers_num = len(self.passengers)
-        flights_num = len(self.flights)
-        active_flights = [f for f in self.flights if not f.is_cancelled]
-        cancelled_flights = [f for f in self.flights if f.is_cancelled]
+        snapshot = self.stats.snapshot()
+        aircrafts_num = snapshot.aircrafts
+        passengers_num = snapshot.passengers
+        flights_num = snapshot.flights
+        avg_occupancy = snapshot.average_occupancy
         print(f"Всего самолетов: {aircrafts_num}")
         print(f"Всего пассажиров: {passengers_num}")
         print(f"Всего рейсов: {flights_num}")
-        print(f"Активных рейсов: {len(active_flights)}")
-        print(f"Отмененных рейсов: {len(cancelled_flights)}")
-        avg_occupancy = 0
-        if active_flights:
-            avg_occupancy = sum(f.occupancy_rate for f in active_flights) / len(active_flights)
+        print(f"Активных рейсов: {snapshot.active_flights}")
+        print(f"Отмененных рейсов: {snapshot.cancelled_flights}")
+        if snapshot.active_flights:
             print(f"Средняя заполненность: {avg_occupancy:.1f}%")
         print("Самолеты:")
         status = ''
         for aircraft in self.aircrafts:
             status = "Доступен" if aircraft.is_available else "Не доступен"
             print(f"  - {aircraft} {status}")
-        print("Хотите экспортировать этот отчёт в DOC?\nНажмите 'y', чтобы экспортировать.")
-        try:
-            yn = input("ВВОД: ")
-            if yn == 'y':
-                doc = Document()
-                title = doc.add_heading('СТАТИСТИКА', 0)
-                doc.add_paragraph()
-                text = [
-                    f"Всего самолётов: {aircrafts_num}\n"
-                    f"Всего пассажиров: {passengers_num}\n"
-                    f"Всего рейсов: {flights_num}\n"
-                    f"Активных рейсов: {len(active_flights)}\n"
-                    f"Отменённых рейсов: {len(cancelled_flights)}\n"
-                    f"Средняя заполненность: {avg_occupancy}%\n"
-                ]
-                for w in text:
-                    doc.add_paragraph(w)
-                doc.add_paragraph()
-                doc.add_heading('Самолёты:', level=1)
-                for a in self.aircrafts:
-                    doc.add_paragraph(f" - {a} {status}")
-                doc.add_paragraph()
-                doc.add_heading('Рейсы:', level=1)
-                for f in self.flights:
-                    status = "ОТМЕНЁН" if f.is_cancelled else "АКТИВЕН"
-                    doc.add_paragraph(
-                        f"  - {f.flight_number}: {f.departure} → {f.destination} ({status})")
-                    doc.add_paragraph(f"Пассажиров: {f.passenger_count}/{f.aircraft.capacity}")
-                filename = f"REPORT_{datetime.now().strftime('%Y%m%d_%H%M')}.docx"
-                doc.save(filename)
-                print(f"Файл сохранён: {filename}")
-            else:
-                return
-        except (ValueError, IndexError):
-            print("Неверный выбор")
-            return
+        print("Хотите экспортировать этот отчёт в DOC?\nНажмите 'y', чтобы экспортировать, или 'c' для CSV.")
+        yn = input("ВВОД: ").strip()
+        if yn == 'y':
+            self.export_report('docx')
+        elif yn == 'c':
+            self.export_report('csv')
+
+    def export_report(self, fmt='docx', path=None, background=True):
+        exporter = ReportExporter(self.db, self.stats.snapshot(), self.aircrafts)
+        if not background:
+            return exporter.export(fmt, path)
+        job = exporter.start(fmt, path, on_done=self._report_done)
+        self.report_jobs.append(job)
+        print(f"Экспорт запущен в фоне ({job.total} рейсов): {job.path}")
+        return job
+
+    @staticmethod
+    def _report_done(job):
+        if job.error is not None:
+            print(f"\nОшибка экспорта {job.path}: {job.error}")
+        else:
+            print(f"\nФайл сохранён: {job.path}")
 
     def run(self):
         while True:
@@ -247,7 +609,9 @@ class AirportSystem:
                     print("3. ДОБАВИТЬ ПАССАЖИРА НА РЕЙС")
                     print("4. СНЯТЬ ПАССАЖИРА С РЕЙСА")
                     print("5. ПОКАЗАТЬ РЕЙСЫ")
-                    print("6. ВЫХОД")
+                    print("6. МАССОВАЯ ОТМЕНА РЕЙСОВ")
+                    print("7. ПОИСК МАРШРУТА С ПЕРЕСАДКАМИ")
+                    print("8. ВЫХОД")
                     choice = input("ВВОД: ").strip()
                     if choice == '1':
                         print("ДОБАВЛЕНИЕ РЕЙСА")
@@ -264,6 +628,10 @@ class AirportSystem:
                         print("ПОКАЗАТЬ РЕЙСЫ")
                         self.show_flight_info()
                     elif choice == '6':
+                        self.cancel_flights_menu()
+                    elif choice == '7':
+                        self.itinerary_menu()
+                    elif choice == '8':
                         break
                     else:
                         print("Неверный выбор. Попробуйте снова.")
@@ -276,31 +644,18 @@ class AirportSystem:
 
     def add_passenger_to_flight(self):
         print("ДОБАВЛЕНИЕ ПАССАЖИРА НА РЕЙС")
-        active_flights = [f for f in self.flights if not f.is_cancelled]
-        if not active_flights:
-            print("Нет активных рейсов.")
-            return
         print("Активные рейсы:")
-        for i, flight in enumerate(active_flights, 1):
-            print(
-                f"{i}. {flight.flight_number}: {flight.departure} → {flight.destination} (свободно мест: {flight.available_seats})")
-        try:
-            flight_choice = int(input("Выберите рейс: ")) - 1
-            selected_flight = active_flights[flight_choice]
-        except (ValueError, IndexError):
-            print("Неверный выбор рейса.")
+        selected_flight = self.choose_flight(
+            "Выберите рейс",
+            lambda f: f"{f.flight_number}: {f.departure} → {f.destination} (свободно мест: {f.available_seats})",
+            active_only=True, empty_message="Нет активных рейсов.")
+        if selected_flight is None:
             return
-        print("\nВведите данные пассажира:")
-        passport = input("Номер паспорта: ")
-        surname = input("Фамилия: ")
-        name = input("Имя: ")
-        patronymic = input("Отчество: ")
-        dob = input("Дата рождения (ГГГГ-ММ-ДД): ")
         try:
-            new_passenger = Passenger(passport, name, surname, patronymic, dob)
-            self.save_passenger(new_passenger)
-            if selected_flight.add_passenger(new_passenger):
-                self.save_booking(selected_flight, new_passenger)
+            new_passenger = self.choose_passenger()
+            if new_passenger is None:
+                return
+            if self.booking.book(selected_flight, new_passenger):
                 print(f"Пассажир {new_passenger.full_name} успешно добавлен на рейс {selected_flight.flight_number}")
                 print(f"Заполненность рейса: {selected_flight.occupancy_rate}%")
                 print(f"Свободно мест: {selected_flight.available_seats}")
@@ -308,26 +663,52 @@ class AirportSystem:
                 print("Не удалось добавить пассажира. Рейс заполнен!")
                 if selected_flight.passenger_count >= selected_flight.aircraft.capacity:
                     print("Рейс отменен из-за недостатка мест!")
-                    selected_flight.cancel_flight()
-                    conn = sqlite3.connect(self.db_name)
-                    cursor = conn.cursor()
-                    cursor.execute('UPDATE flights SET is_cancelled = 1 WHERE flight_number = ?',(selected_flight.flight_number,))
-                    conn.commit()
-                    conn.close()
+                    self.cancel_flights(flight_numbers=[selected_flight.flight_number])
         except ValueError as e:
             print(f"Ошибка в данных: {e}")
 
+    def choose_passenger(self):
+        query = input("Поиск пассажира (ФИО или паспорт, Enter - новый пассажир): ").strip()
+        if query:
+            matches = self.search_passengers(query)
+            for i, passenger in enumerate(matches, 1):
+                print(f"{i}. {passenger.full_name} (Паспорт: {passenger.passport}, "
+                      f"дата рождения: {passenger.date_of_birth.strftime('%Y-%m-%d')})")
+            if not matches:
+                print("Пассажиры не найдены.")
+            choice = input("Выберите пассажира (Enter - новый пассажир): ").strip() if matches else ''
+            if choice:
+                try:
+                    index = int(choice) - 1
+                    if not 0 <= index < len(matches):
+                        raise IndexError
+                    return matches[index]
+                except (ValueError, IndexError):
+                    print("Неверный выбор пассажира.")
+                    return None
+        print("\nВведите данные пассажира:")
+        passport = input("Номер паспорта: ").strip()
+        existing = self.get_passenger(passport)
+        if existing is not None:
+            print(f"Пассажир с паспортом {passport} уже зарегистрирован: {existing.full_name}")
+            return existing
+        surname = input("Фамилия: ")
+        name = input("Имя: ")
+        patronymic = input("Отчество: ")
+        dob = input("Дата рождения (ГГГГ-ММ-ДД): ")
+        passenger = Passenger(passport, name, surname, patronymic, dob)
+        self.save_passenger(passenger)
+        return passenger
+
     def add_new_flight(self):
-        available_aircrafts = [x for x in self.aircrafts if x.is_available]
-        if not available_aircrafts:
-            print("Нет доступных самолётов")
         try:
             flight_number = input("Номер рейса: ").strip()
             if not flight_number:
                 print("Номер не может быть пустым")
                 return
-            if next((x for x in self.flights if x.flight_number == flight_number), None):
+            if self.get_flight(flight_number) is not None:
                 print("Рейс уже существует")
+                return
             departure = input("Город вылета: ").strip()
             if not departure:
                 print("Город вылета не может быть пустым")
@@ -338,7 +719,7 @@ class AirportSystem:
                 return
             departure_time = input("Вылет: ГГГГ-ММ-ДД ЧЧ:ММ ").strip()
             try:
-                datetime.strptime(departure_time, "%Y-%m-%d %H:%M")
+                start = datetime.strptime(departure_time, "%Y-%m-%d %H:%M")
             except ValueError:
                 print("Неверный формат")
                 return
@@ -350,6 +731,11 @@ class AirportSystem:
             except ValueError:
                 print("Введите число")
                 return
+            end = start + timedelta(minutes=duration_min)
+            available_aircrafts = self.schedule.free_aircrafts([x for x in self.aircrafts if x.is_available], start, end)
+            if not available_aircrafts:
+                print("Нет доступных самолётов")
+                return
             print("Доступные самолёты:")
             for i, aircraft in enumerate(available_aircrafts, 1):
                 print(f"{i}. {aircraft.model} ({aircraft.registration}) - {aircraft.capacity} мест")
@@ -368,47 +754,330 @@ class AirportSystem:
 
     def cancel_flight(self):
         print("ОТМЕНА РЕЙСА")
-        active_flights = [f for f in self.flights if not f.is_cancelled]
-        if not active_flights:
-            print("Нет активных рейсов для отмены.")
-            return
         print("Активные рейсы:")
-        for i, flight in enumerate(active_flights, 1):
-            print(f"{i}. {flight.flight_number}: {flight.departure} → {flight.destination}")
+        selected_flight = self.choose_flight(
+            "Выберите рейс для отмены",
+            lambda f: f"{f.flight_number}: {f.departure} → {f.destination}",
+            active_only=True, empty_message="Нет активных рейсов для отмены.")
+        if selected_flight is None:
+            return
+        report = self.cancel_flights(flight_numbers=[selected_flight.flight_number])
+        print(f"Рейс {selected_flight.flight_number} отменен. Снято бронирований: {report.released}")
+
+    def cancel_flights_menu(self):
+        print("МАССОВАЯ ОТМЕНА РЕЙСОВ (Enter - условие не задано)")
+        airport = input("Аэропорт (вылет или прилёт): ").strip() or None
+        aircraft = input("Регистрация самолёта: ").strip() or None
+        try:
+            start = input("С (ГГГГ-ММ-ДД ЧЧ:ММ): ").strip()
+            end = input("По (ГГГГ-ММ-ДД ЧЧ:ММ): ").strip()
+            start = parse_datetime(start) if start else None
+            end = parse_datetime(end) if end else None
+            report = self.cancel_flights(airport=airport, aircraft=aircraft, start=start, end=end)
+        except ValueError as e:
+            print(f"Ошибка в данных: {e}")
+            return
+        print(report)
+        for passport, numbers in report.affected.items():
+            passenger = self.get_passenger(passport)
+            print(f"  - {passenger.full_name} (Паспорт: {passport}): {', '.join(numbers)}")
+
+    def itinerary_menu(self):
+        print("ПОИСК МАРШРУТА")
+        origin = input("Откуда: ").strip()
+        destination = input("Куда: ").strip()
+        after = input("Не раньше (ГГГГ-ММ-ДД ЧЧ:ММ, Enter - сейчас): ").strip()
         try:
-            flight_choice = int(input("Выберите рейс для отмены: ")) - 1
-            selected_flight = active_flights[flight_choice]
-            selected_flight.cancel_flight()
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute('UPDATE flights SET is_cancelled = 1 WHERE flight_number = ?',(selected_flight.flight_number,))
-            conn.commit()
-            conn.close()
-            print(f"Рейс {selected_flight.flight_number} отменен.")
+            itineraries = self.find_itineraries(origin, destination, parse_datetime(after) if after else None)
+        except ValueError as e:
+            print(f"Ошибка в данных: {e}")
+            return
+        if not itineraries:
+            print("Маршрутов не найдено.")
+            return
+        for i, itinerary in enumerate(itineraries, 1):
+            print(f"{i}. {itinerary} (свободно мест: {itinerary.available_seats})")
+        choice = input("Забронировать маршрут (номер, Enter - нет): ").strip()
+        if not choice:
+            return
+        try:
+            itinerary = itineraries[int(choice) - 1]
         except (ValueError, IndexError):
-            print("Неверный выбор рейса.")
+            print("Неверный выбор маршрута.")
+            return
+        try:
+            passenger = self.choose_passenger()
+        except ValueError as e:
+            print(f"Ошибка в данных: {e}")
+            return
+        if passenger is None:
+            return
+        if self.book_itinerary(itinerary, passenger):
+            print(f"Пассажир {passenger.full_name} забронирован: {itinerary}")
+        else:
+            print("Не удалось забронировать все сегменты маршрута.")
 
     def show_flight_info(self):
         print("ИНФОРМАЦИЯ О РЕЙСАХ")
-        if not self.flights:
-            print("Нет рейсов.")
-            return
         print("Все рейсы:")
-        for i, flight in enumerate(self.flights, 1):
-            print(f"{i}. {flight.flight_number}: {flight.departure} → {flight.destination}")
+        selected_flight = self.choose_flight(
+            "Выберите рейс", lambda f: f"{f.flight_number}: {f.departure} → {f.destination}")
+        if selected_flight is None:
+            return
+        print(f"\n{selected_flight.get_flight_info()}")
+        if selected_flight.passenger_count > 0:
+            print("\nПассажиры:")
+            for passenger in selected_flight.get_passengers():
+                print(f"  - {passenger.full_name} (Паспорт: {passenger.passport})")
+        else:
+            print("\nНа рейсе нет пассажиров")
+
+
+def open_shards(directory, strategy='airport', hubs=(), workers=4, profiler=None, **kwargs):
+    return ShardedAirport(directory, ShardRouter(strategy, hubs),
+                          lambda path: AirportSystem(path, lazy=True, preload=False, profiler=False, **kwargs),
+                          workers, profiler if profiler is not None else Profiler.from_env())
+
+
+def batch_system(args):
+    if args.shards:
+        return open_shards(args.shards, args.shard_by, args.hubs or (), args.shard_workers,
+                           profiler=args.profiler, cache_size=args.cache_size, cache_ttl=args.cache_ttl)
+    return AirportSystem(args.db, lazy=True, preload=False, profiler=args.profiler, cache_size=args.cache_size,
+                         cache_ttl=args.cache_ttl)
+
+
+def book_command(args):
+    system = batch_system(args)
+    try:
+        flight = system.get_flight(args.flight)
+        if flight is None:
+            print(f"Рейс {args.flight} не найден", file=sys.stderr)
+            return 1
+        passenger = system.get_passenger(args.passport)
+        if passenger is None:
+            if not (args.surname and args.name and args.born):
+                print(f"Пассажир с паспортом {args.passport} не найден, укажите --surname, --name и --born",
+                      file=sys.stderr)
+                return 1
+            passenger = Passenger(args.passport, args.name, args.surname, args.patronymic, args.born)
+            system.save_passenger(passenger)
+        if args.shards:
+            booked = system.book(flight.flight_number, passenger.passport)
+        else:
+            booked = system.booking.book(flight, passenger)
+        if not booked:
+            print(f"Не удалось забронировать {passenger.full_name} на рейс {flight.flight_number}", file=sys.stderr)
+            return 1
+        print(f"Пассажир {passenger.full_name} забронирован на рейс {flight.flight_number}")
+        return 0
+    except ValueError as e:
+        print(f"Ошибка в данных: {e}", file=sys.stderr)
+        return 1
+    finally:
+        system.close()
+
+
+def cancel_command(args):
+    system = batch_system(args)
+    try:
+        report = system.cancel_flights(
+            airport=args.airport, departure=args.departure, destination=args.destination,
+            start=parse_datetime(args.start) if args.start else None, end=parse_datetime(args.end) if args.end else None,
+            aircraft=args.aircraft, flight_numbers=args.flights or None)
+        print(report)
+        return 0
+    except ValueError as e:
+        print(f"Ошибка в данных: {e}", file=sys.stderr)
+        return 1
+    finally:
+        system.close()
+
+
+def stats_command(args):
+    system = batch_system(args)
+    try:
+        snapshot = system.statistics()
+        if args.json:
+            import json
+            print(json.dumps(snapshot.as_dict(), ensure_ascii=False))
+        else:
+            print('\n'.join(ReportExporter(None, snapshot, ()).summary_lines()))
+        return 0
+    finally:
+        system.close()
+
+
+def history_command(args):
+    system = batch_system(args)
+    try:
+        start = parse_datetime(args.start) if args.start else None
+        end = parse_datetime(args.end) if args.end else None
+        if args.summary:
+            summary = system.history.summary(args.passport, start, end)
+            print(f"Всего перелётов: {summary['flights']}")
+            for year, count in summary['per_year'].items():
+                print(f"  {year}: {count}")
+            print("Частые маршруты:")
+            for route in summary['top_routes']:
+                print(f"  {route['departure']} → {route['destination']}: {route['flights']}")
+            return 0
+        page = system.history.page(args.passport, start, end, args.page_size, args.after)
+        for entry in page:
+            print(entry)
+        if not page:
+            print("Бронирований не найдено.")
+        elif len(page) == (args.page_size or system.history.PAGE_SIZE):
+            print(f"Следующая страница: --after {page[-1].flight_number}")
+        return 0
+    except ValueError as e:
+        print(f"Ошибка в данных: {e}", file=sys.stderr)
+        return 1
+    finally:
+        system.close()
+
+
+def export_command(args):
+    system = batch_system(args)
+    try:
+        system.refresh_statistics()
+        print(f"Файл сохранён: {system.export_report(args.format, args.out, background=False)}")
+        return 0
+    finally:
+        system.close()
+
+
+def import_command(args):
+    system = AirportSystem(args.db, load=False, profiler=args.profiler)
+    if args.kind == 'flights':
+        system.load_schedule()
+    try:
+        for path in args.files:
+            report = system.bulk_import(args.kind, path, args.chunk_size)
+            print(f"{path}: {report}")
+            for line, reason in report.rejected:
+                print(f"  строка {line}: {reason}")
+    finally:
+        system.close()
+    return 0
+
+
+def manifests_command(args):
+    start = end = None
+    if args.date:
+        start = parse_date(args.date)
+        end = start + timedelta(days=1)
+    elif args.month:
+        start = parse_date(f"{args.month}-01")
+        end = (start + timedelta(days=32)).replace(day=1)
+    generator = ManifestGenerator(args.db, args.workers, args.format)
+    started = datetime.now()
+    paths = generator.generate(args.out, start, end, args.merged)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"Сформировано файлов: {len(paths)} в {args.out} за {elapsed:.1f} с (процессов: {generator.workers})")
+    return 0
+
+
+def serve_command(args):
+    import asyncio
+    system = AirportSystem(args.db, lazy=True, profiler=args.profiler, cache_size=args.cache_size,
+                           cache_ttl=args.cache_ttl)
+    server = ApiServer(system, args.host, args.port, args.workers)
+
+    async def serve():
+        await server.start()
+        print(f"API доступно на http://{args.host}:{server.port}")
         try:
-            flight_choice = int(input("Выберите рейс: ")) - 1
-            selected_flight = self.flights[flight_choice]
-            print(f"\n{selected_flight.get_flight_info()}")
-            if selected_flight.passenger_count > 0:
-                print("\nПассажиры:")
-                for passenger in selected_flight.get_passengers():
-                    print(f"  - {passenger.full_name} (Паспорт: {passenger.passport})")
-            else:
-                print("\nНа рейсе нет пассажиров")
-        except (ValueError, IndexError):
-            print("Неверный выбор рейса")
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        system.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Система управления аэропортом")
+    parser.add_argument('--db', default='airport.db', help="файл базы данных")
+    parser.add_argument('--lazy', action='store_true', help="загружать рейсы и пассажиров по требованию")
+    parser.add_argument('--journal', help="каталог журнала событий для быстрого перезапуска")
+    parser.add_argument('--cache-size', type=int, default=10000, help="размер кэша рейсов и пассажиров в ленивом режиме")
+    parser.add_argument('--cache-ttl', type=float, default=None, help="время жизни записи кэша, секунд")
+    parser.add_argument('--profile', nargs='?', const='profile.json', metavar='PATH',
+                        help=f"собирать профиль операций и сохранить его в JSON или .prom (также {PROFILE_ENV})")
+    parser.add_argument('--shards', metavar='DIR', help="каталог шардов для команд book, cancel, history и stats")
+    parser.add_argument('--shard-by', choices=ShardRouter.STRATEGIES, default='airport',
+                        help="разбиение рейсов по аэропорту вылета или месяцу")
+    parser.add_argument('--hubs', type=lambda value: [hub.strip() for hub in value.split(',') if hub.strip()],
+                        help="аэропорты с отдельным шардом через запятую, остальные попадают в общий")
+    parser.add_argument('--shard-workers', type=int, default=4, help="потоков для запросов по всем шардам")
+    subparsers = parser.add_subparsers(dest='command')
+    book_parser = subparsers.add_parser('book', help="забронировать место без интерактивного меню")
+    book_parser.add_argument('flight', help="номер рейса")
+    book_parser.add_argument('passport', help="номер паспорта")
+    book_parser.add_argument('--surname', help="фамилия нового пассажира")
+    book_parser.add_argument('--name', help="имя нового пассажира")
+    book_parser.add_argument('--patronymic', default='', help="отчество нового пассажира")
+    book_parser.add_argument('--born', help="дата рождения нового пассажира, ГГГГ-ММ-ДД")
+    cancel_parser = subparsers.add_parser('cancel', help="отменить рейсы по номерам или условиям")
+    cancel_parser.add_argument('flights', nargs='*', help="номера рейсов")
+    cancel_parser.add_argument('--airport', help="аэропорт вылета или прилёта")
+    cancel_parser.add_argument('--departure', help="город вылета")
+    cancel_parser.add_argument('--destination', help="город назначения")
+    cancel_parser.add_argument('--start', help="вылет не раньше, ГГГГ-ММ-ДД ЧЧ:ММ")
+    cancel_parser.add_argument('--end', help="вылет раньше, ГГГГ-ММ-ДД ЧЧ:ММ")
+    cancel_parser.add_argument('--aircraft', help="регистрация самолёта")
+    history_parser = subparsers.add_parser('history', help="история перелётов пассажира")
+    history_parser.add_argument('passport', help="номер паспорта")
+    history_parser.add_argument('--start', help="вылет не раньше, ГГГГ-ММ-ДД ЧЧ:ММ")
+    history_parser.add_argument('--end', help="вылет раньше, ГГГГ-ММ-ДД ЧЧ:ММ")
+    history_parser.add_argument('--page-size', type=int, default=None)
+    history_parser.add_argument('--after', help="номер последнего рейса предыдущей страницы")
+    history_parser.add_argument('--summary', action='store_true', help="перелёты по годам и частые маршруты")
+    stats_parser = subparsers.add_parser('stats', help="сводная статистика")
+    stats_parser.add_argument('--json', action='store_true', help="вывести в формате JSON")
+    export_parser = subparsers.add_parser('export', help="выгрузить отчёт")
+    export_parser.add_argument('format', choices=ReportExporter.FORMATS)
+    export_parser.add_argument('--out', default=None, help="путь к файлу отчёта")
+    import_parser = subparsers.add_parser('import', help="массовый импорт из CSV/JSONL")
+    import_parser.add_argument('kind', choices=BulkImporter.KINDS)
+    import_parser.add_argument('files', nargs='+')
+    import_parser.add_argument('--chunk-size', type=int, default=5000)
+    manifests_parser = subparsers.add_parser('manifests', help="манифесты рейсов за день или месяц")
+    period = manifests_parser.add_mutually_exclusive_group()
+    period.add_argument('--date', help="день вылета, ГГГГ-ММ-ДД")
+    period.add_argument('--month', help="месяц вылета, ГГГГ-ММ")
+    manifests_parser.add_argument('--out', default='manifests', help="каталог для документов")
+    manifests_parser.add_argument('--format', choices=ManifestGenerator.FORMATS, default='docx')
+    manifests_parser.add_argument('--merged', action='store_true', help="один общий документ вместо файла на рейс")
+    manifests_parser.add_argument('--workers', type=int, default=None, help="число процессов (по умолчанию все ядра)")
+    serve_parser = subparsers.add_parser('serve', help="HTTP/JSON API")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8080)
+    serve_parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+    if args.lazy and args.journal:
+        parser.error("--journal нельзя сочетать с --lazy")
+    args.profiler = Profiler(path=args.profile) if args.profile else None
+    if args.shards and args.command not in ('book', 'cancel', 'history', 'stats'):
+        parser.error("--shards поддерживается только командами book, cancel, history и stats")
+    commands = {'book': book_command, 'cancel': cancel_command, 'history': history_command, 'stats': stats_command,
+                'export': export_command, 'import': import_command, 'manifests': manifests_command, 'serve': serve_command}
+    if args.command in commands:
+        return commands[args.command](args)
+    system = AirportSystem(args.db, lazy=args.lazy, journal_dir=args.journal, profiler=args.profiler,
+                           cache_size=args.cache_size, cache_ttl=args.cache_ttl)
+    try:
+        system.run()
+    finally:
+        system.close()
+    return 0
 
 
 if __name__ == "__main__":
-    AirportSystem().run()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,5 +1,9 @@
 import pytest
+import os
+import json
 from airport import *
+from main import AirportSystem
+from datetime import datetime
 
 class TestAircraft:
     def test_aircraft_creation(self):
@@ -18,10 +22,38 @@ class TestPassenger:
         assert passenger.passport == "AB123456"
         assert passenger.name == "Иван"
         assert passenger.full_name == "Петров Иван Иванович"
-    def test_passenger_booking(self):
+    def test_passenger_booking(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 180, "RA-73651")
+        system.save_aircraft(aircraft)
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90)
+        system.save_flight(flight)
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        system.save_passenger(passenger)
+        system.booking.book(flight, passenger)
+        assert "SU-1001" in system.history.flight_numbers(passenger.passport)
+        system.close()
+    def test_passenger_slots(self):
         passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
-        passenger.book_flight("SU-1001")
-        assert "SU-1001" in passenger.get_booked_flights()
+        assert not hasattr(passenger, "__dict__")
+    def test_passenger_from_row(self):
+        passenger = Passenger.from_row("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        assert passenger == Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        assert passenger.date_of_birth == parse_date("1985-05-15")
+        assert Passenger.from_row("CD789012", "Мария", "Иванова", "Денисовна", passenger.date_of_birth).age == passenger.age
+        assert passenger.age == today().year - 1985 - ((today().month, today().day) < (5, 15))
+
+
+class TestDates:
+    def test_parse_matches_strptime(self):
+        assert parse_date("1985-05-15") == datetime.strptime("1985-05-15", "%Y-%m-%d").date()
+        assert parse_datetime("2025-01-20 08:00") == datetime(2025, 1, 20, 8, 0)
+        assert parse_datetime("2025-01-20 8:05") == datetime(2025, 1, 20, 8, 5)
+        assert parse_datetime("2025-01-20 08:00") is parse_datetime("2025-01-20 08:00")
+    def test_parse_rejects_invalid(self):
+        for value in ("1985-13-01", "1985-02-30", "15.05.1985", ""):
+            with pytest.raises(ValueError):
+                parse_date(value)
 
 
 class TestFlight:
@@ -34,6 +66,11 @@ class TestFlight:
         assert flight.flight_number == "SU-1001"
         assert flight.departure == "Москва"
         assert not flight.is_cancelled
+    def test_flight_from_row(self):
+        flight = Flight.from_row("SU-1001", "Москва", "СПб", "2025-01-20 08:00", self.aircraft, 90, 1)
+        assert flight.departure_time == datetime(2025, 1, 20, 8, 0)
+        assert flight.is_cancelled
+        assert flight.add_passenger(self.passenger1)
     def test_add_passenger(self):
         flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", self.aircraft, 90)
         assert flight.add_passenger(self.passenger1) == True
@@ -47,9 +84,818 @@ class TestFlight:
         assert flight.occupancy_rate == 100.0
         assert flight.available_seats == 0
 
+    def test_manifest_order(self):
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", Aircraft("Boeing 777", 3, "RA-77701"), 90)
+        passenger3 = Passenger("EF345678", "Олег", "Сидоров", "Петрович", "1970-01-01")
+        for passenger in (self.passenger1, self.passenger2, passenger3):
+            flight.add_passenger(passenger)
+        flight.remove_passenger(self.passenger2)
+        assert flight.get_passengers() == [self.passenger1, passenger3]
+        assert self.passenger2 not in flight
+        assert Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15") in flight
+        assert len(flight) == 2
+        assert len({self.passenger1, Passenger("AB123456", "И", "П", "И", "1985-05-15")}) == 1
+
     def test_flight_cancellation(self):
         flight = Flight("SU-1001", "Москва", "СПб", "2024-01-20 08:00", self.aircraft, 90)
         flight.add_passenger(self.passenger1)
         flight.cancel_flight()
         assert flight.is_cancelled == True
-        assert flight.passenger_count == 0
\ No newline at end of file
+        assert flight.passenger_count == 0
+
+class TestRegistry:
+    def setup_method(self):
+        self.registry = Registry()
+        self.aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        self.registry.add_aircraft(self.aircraft)
+    def test_lookup(self):
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        self.registry.add_passenger(passenger)
+        assert self.registry.get_aircraft("RA-73651") is self.aircraft
+        assert self.registry.get_passenger("AB123456") is passenger
+        assert self.registry.get_passenger("XX000000") is None
+    def test_secondary_indexes(self):
+        flight1 = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", self.aircraft, 90)
+        flight2 = Flight("SU-1002", "Москва", "Казань", "2025-01-20 12:00", self.aircraft, 90)
+        self.registry.add_flight(flight1)
+        self.registry.add_flight(flight2)
+        assert self.registry.flights_by_route("Москва", "СПб") == [flight1]
+        assert len(self.registry.flights_by_date(flight1.departure_time.date())) == 2
+        self.registry.remove_flight("SU-1001")
+        assert self.registry.flights_by_route("Москва", "СПб") == []
+        assert not self.registry.has_flight("SU-1001")
+
+
+class TestAirportSystem:
+    def test_reload(self, tmp_path):
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90)
+        system.save_aircraft(aircraft)
+        system.save_passenger(passenger)
+        system.save_flight(flight)
+        flight.add_passenger(passenger)
+        system.save_booking(flight, passenger)
+        reloaded = AirportSystem(db_name)
+        assert reloaded.registry.get_flight("SU-1001").aircraft.registration == "RA-73651"
+        assert "AB123456" in [p.passport for p in reloaded.registry.get_flight("SU-1001").get_passengers()]
+        system.close()
+        reloaded.close()
+    def test_lazy_loading(self, tmp_path):
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        system.save_aircraft(aircraft)
+        system.save_passenger(passenger)
+        for number, departure_time in [("SU-1001", "2025-01-20 08:00"), ("SU-1002", "2025-01-21 08:00")]:
+            flight = Flight(number, "Москва", "СПб", departure_time, aircraft, 90)
+            system.save_flight(flight)
+        flight.add_passenger(passenger)
+        system.save_booking(flight, passenger)
+        system.close()
+        lazy = AirportSystem(db_name, lazy=True)
+        assert lazy.flights == [] and lazy.passengers == []
+        window = lazy.load_flights(datetime(2025, 1, 21), datetime(2025, 1, 22))
+        assert [f.flight_number for f in window] == ["SU-1002"]
+        assert lazy.passengers == []
+        assert [p.passport for p in window[0].get_passengers()] == ["AB123456"]
+        pages = list(lazy.flight_pages(page_size=1))
+        assert [[f.flight_number for f in page] for page in pages] == [["SU-1001"], ["SU-1002"]]
+        lazy.close()
+
+
+class TestAircraftSchedule:
+    def setup_method(self):
+        self.schedule = AircraftSchedule(turnaround_min=30)
+        self.aircraft = Aircraft("Boeing 737", 180, "RA-73651")
+        self.schedule.add_flight(Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", self.aircraft, 90))
+        self.schedule.add_flight(Flight("SU-1002", "СПб", "Москва", "2025-01-20 12:00", self.aircraft, 90))
+    def test_conflicts(self):
+        overlapping = Flight("SU-1003", "Москва", "Казань", "2025-01-20 09:45", self.aircraft, 60)
+        assert self.schedule.flight_conflicts(overlapping) == ["SU-1001"]
+        after_turnaround = Flight("SU-1004", "Москва", "Казань", "2025-01-20 14:00", self.aircraft, 60)
+        assert self.schedule.flight_conflicts(after_turnaround) == []
+        other = Aircraft("Airbus A320", 150, "RA-32042")
+        assert self.schedule.free_aircrafts([self.aircraft, other], datetime(2025, 1, 20, 11), datetime(2025, 1, 20, 13)) == [other]
+    def test_cancelled_flight_frees_aircraft(self):
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", self.aircraft, 90)
+        flight.cancel_flight()
+        self.schedule.add_flight(flight)
+        assert "SU-1001" not in self.schedule
+        assert self.schedule.is_free("RA-73651", datetime(2025, 1, 20, 8), datetime(2025, 1, 20, 9))
+    def test_save_flight_rejects_conflicts_outside_lazy_window(self, tmp_path):
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        system.save_aircraft(self.aircraft)
+        system.save_flight(Flight("SU-1001", "Москва", "СПб", "2020-01-20 08:00", self.aircraft, 90))
+        with pytest.raises(ValueError):
+            system.save_flight(Flight("SU-1002", "Москва", "Казань", "2020-01-20 09:00", self.aircraft, 60))
+        system.close()
+        lazy = AirportSystem(db_name, lazy=True)
+        assert "SU-1001" not in lazy.schedule
+        with pytest.raises(ValueError):
+            lazy.save_flight(Flight("SU-1003", "Москва", "Казань", "2020-01-20 07:30", self.aircraft, 60))
+        lazy.save_flight(Flight("SU-1004", "Москва", "Казань", "2020-01-20 11:00", self.aircraft, 60))
+        assert lazy.db.query("SELECT flight_number FROM flights ORDER BY flight_number") == [("SU-1001",), ("SU-1004",)]
+        lazy.close()
+
+
+class TestDatabase:
+    def setup_method(self):
+        self.db = Database(":memory:")
+        self.db.execute("CREATE TABLE t (x INTEGER)")
+    def teardown_method(self):
+        self.db.close()
+    def test_transaction_commit(self):
+        with self.db.transaction():
+            with self.db.transaction():
+                self.db.execute("INSERT INTO t VALUES (1)")
+            assert self.db.in_transaction
+        assert self.db.query("SELECT COUNT(*) FROM t") == [(1,)]
+    def test_transaction_rollback(self):
+        with pytest.raises(RuntimeError):
+            with self.db.transaction():
+                self.db.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError
+        assert not self.db.in_transaction
+        assert self.db.query("SELECT COUNT(*) FROM t") == [(0,)]
+
+
+class TestStatistics:
+    def test_incremental_statistics(self, tmp_path):
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        aircraft = Aircraft("Boeing 737", 4, "RA-73651")
+        system.save_aircraft(aircraft)
+        flights = [Flight(f"SU-100{i}", "Москва", "СПб", f"2025-01-2{i} 08:00", aircraft, 90) for i in range(3)]
+        for flight in flights:
+            system.save_flight(flight)
+        for i in range(3):
+            passenger = Passenger(f"AB00000{i}", "Иван", "Петров", "Иванович", "1985-05-15")
+            system.save_passenger(passenger)
+            flights[0].add_passenger(passenger)
+            system.save_booking(flights[0], passenger)
+        flights[0].remove_passenger(passenger)
+        system.db.execute("DELETE FROM bookings WHERE passenger_passport = ?", (passenger.passport,))
+        flights[2].cancel_flight()
+        system.save_flight_status(flights[2])
+        snapshot = system.stats.snapshot()
+        assert (snapshot.aircrafts, snapshot.passengers, snapshot.flights) == (1, 3, 3)
+        assert (snapshot.active_flights, snapshot.cancelled_flights, snapshot.booked_passengers) == (2, 1, 2)
+        assert snapshot.average_occupancy == pytest.approx(25.0)
+        assert system.stats.by_route()[("Москва", "СПб")]["passengers"] == 2
+        system.close()
+        for reloaded in (AirportSystem(db_name), AirportSystem(db_name, lazy=True)):
+            assert reloaded.stats.snapshot().as_dict() == pytest.approx(snapshot.as_dict())
+            reloaded.close()
+
+
+class TestBulkImporter:
+    def setup_method(self):
+        self.system = AirportSystem(":memory:")
+        self.importer = BulkImporter(self.system.db, self.system.registry, chunk_size=2)
+    def teardown_method(self):
+        self.system.close()
+    def test_import_with_rejections(self):
+        self.importer.import_rows('aircrafts', [(1, {"registration": "RA-73651", "model": "Boeing 737", "capacity": "1"})])
+        self.importer.import_rows('passengers', [
+            (1, {"passport": "AB123456", "name": "Иван", "surname": "Петров", "patronymic": "Иванович", "date_of_birth": "1985-05-15"}),
+            (2, {"passport": "CD789012", "name": "Мария", "surname": "Иванова", "patronymic": "Денисовна", "date_of_birth": "1990-08-22"}),
+            (3, {"passport": "EF000000", "name": "Ошибка", "surname": "Даты", "patronymic": "", "date_of_birth": "15.05.1985"}),
+        ])
+        report = self.importer.import_rows('flights', [
+            (1, {"flight_number": "SU-1001", "departure": "Москва", "destination": "СПб",
+                 "departure_time": "2025-01-20 08:00", "aircraft_registration": "RA-73651", "duration_minutes": "90"}),
+            (2, {"flight_number": "SU-1002", "departure": "Москва", "destination": "СПб",
+                 "departure_time": "2025-01-20 08:00", "aircraft_registration": "RA-00000", "duration_minutes": "90"}),
+        ])
+        assert report.accepted == 1
+        assert [line for line, _ in report.rejected] == [2]
+        report = self.importer.import_rows('bookings', [
+            (1, {"flight_number": "SU-1001", "passenger_passport": "AB123456"}),
+            (2, {"flight_number": "SU-1001", "passenger_passport": "CD789012"}),
+            (3, {"flight_number": "SU-1001", "passenger_passport": "EF000000"}),
+        ])
+        assert report.accepted == 1
+        assert len(report.rejected) == 2
+        assert self.system.db.query("SELECT COUNT(*) FROM bookings") == [(1,)]
+        assert self.system.registry.get_flight("SU-1001").passenger_count == 1
+        self.system.db.execute("UPDATE aircrafts SET capacity = 2")
+        rows = [(1, {"flight_number": "SU-1001", "passenger_passport": "AB123456"}),
+                (2, {"flight_number": "SU-1001", "passenger_passport": "CD789012"})]
+        report = BulkImporter(self.system.db).import_rows('bookings', rows)
+        assert report.accepted == 1
+        assert report.rejected == [(1, "пассажир AB123456 уже на рейсе SU-1001")]
+        report = BulkImporter(self.system.db).import_rows('bookings', rows)
+        assert report.accepted == 0 and len(report.rejected) == 2
+        assert self.system.db.query("SELECT COUNT(*) FROM bookings") == [(2,)]
+
+    def test_unloaded_system_streams_into_database_only(self, tmp_path):
+        path = tmp_path / "passengers.csv"
+        path.write_text("passport,name,surname,patronymic,date_of_birth\n"
+                        + "".join(f"AB{i:06},Иван,Петров,Иванович,1985-05-15\n" for i in range(5)), encoding="utf-8")
+        system = AirportSystem(str(tmp_path / "airport.db"), load=False)
+        assert system.bulk_import("passengers", str(path), chunk_size=2).accepted == 5
+        assert system.registry.passengers == [] and len(system.passenger_cache) == 0
+        assert system.db.query("SELECT COUNT(*) FROM passengers") == [(5,)]
+        system.close()
+
+
+class TestReportExporter:
+    def test_background_export(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        system.save_aircraft(aircraft)
+        for i in range(5):
+            system.save_flight(Flight(f"SU-100{i}", "Москва", "СПб", f"2025-01-2{i} 08:00", aircraft, 90))
+        exporter = ReportExporter(system.db, system.stats.snapshot(), system.aircrafts, batch_size=2)
+        job = exporter.start('csv', str(tmp_path / "report.csv"))
+        assert job.wait(10)
+        assert job.error is None and job.done == job.total == 5
+        lines = (tmp_path / "report.csv").read_text(encoding="utf-8-sig").splitlines()
+        assert len(lines) == 6 and lines[1].startswith("SU-1000;Москва;СПб")
+        path = system.export_report('docx', str(tmp_path / "report.docx"), background=False)
+        assert (tmp_path / "report.docx").exists() and path.endswith(".docx")
+        system.close()
+
+
+class TestBookingService:
+    def test_concurrent_bookings_never_overbook(self, tmp_path):
+        import threading
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 5, "RA-73651")
+        system.save_aircraft(aircraft)
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90)
+        system.save_flight(flight)
+        passengers = [Passenger(f"AB{i:06d}", "Иван", "Петров", "Иванович", "1985-05-15") for i in range(20)]
+        for passenger in passengers:
+            system.save_passenger(passenger)
+        results = []
+        def worker(chunk):
+            for passenger in chunk:
+                results.append(system.booking.book(flight, passenger))
+                results.append(system.booking.book(flight, passenger))
+        threads = [threading.Thread(target=worker, args=(passengers[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results.count(True) == 5
+        assert system.booking.booked_count("SU-1001") == flight.passenger_count == 5
+        assert system.stats.snapshot().booked_passengers == 5
+        system.close()
+    def test_rejected_in_memory_add_releases_row(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 1, "RA-73651")
+        system.save_aircraft(aircraft)
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90)
+        system.save_flight(flight)
+        flight.add_passenger(Passenger("CD789012", "Мария", "Иванова", "Денисовна", "1990-08-22"))
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        system.save_passenger(passenger)
+        assert not system.booking.book(flight, passenger)
+        assert system.booking.booked_count("SU-1001") == 0
+        system.close()
+
+
+class TestSchema:
+    def test_migrate_legacy_database(self, tmp_path):
+        db = Database(str(tmp_path / "airport.db"))
+        with db.transaction() as conn:
+            migrate(conn, target=1)
+            conn.execute("INSERT INTO aircrafts VALUES ('RA-73651', 'Boeing 737', 2)")
+            conn.execute("INSERT INTO passengers VALUES ('AB123456', 'Иван', 'Петров', 'Иванович', '1985-05-15')")
+            conn.execute("INSERT INTO flights VALUES ('SU-1001', 'Москва', 'СПб', '2025-01-20 08:00', 'RA-73651', 90, 0)")
+            for _ in range(2):
+                conn.execute(INSERT_BOOKING, ("SU-1001", "AB123456", "2025-01-01 10:00:00"))
+        with db.transaction() as conn:
+            assert len(migrate(conn)) == len(MIGRATIONS) - 1
+            assert schema_version(conn) == MIGRATIONS[-1][0]
+        assert db.query("SELECT departure_ts FROM flights") == [(timestamp(datetime(2025, 1, 20, 8, 0)),)]
+        assert db.query("SELECT flight_id, passenger_id FROM bookings") == [(1, 1)]
+        plan = " ".join(row[-1] for row in db.query(
+            "EXPLAIN QUERY PLAN SELECT * FROM bookings WHERE passenger_passport = ?", ("AB123456",)))
+        assert "SEARCH" in plan
+        assert PassengerSearch(db).search("петров")[0][0][0] == "AB123456"
+        db.close()
+
+
+class TestApiServer:
+    def test_endpoints(self, tmp_path):
+        import asyncio
+        import json
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 1, "RA-73651")
+        system.save_aircraft(aircraft)
+        system.save_flight(Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90))
+        for passport in ("AB123456", "CD789012"):
+            system.save_passenger(Passenger(passport, "Иван", "Петров", "Иванович", "1985-05-15"))
+
+        async def call(port, method, path, body=None):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            data = json.dumps(body).encode() if body is not None else b""
+            writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+            head, _, payload = (await reader.read()).partition(b"\r\n\r\n")
+            writer.close()
+            return int(head.split()[1]), json.loads(payload)
+
+        async def scenario():
+            server = await ApiServer(system, port=0).start()
+            try:
+                assert (await call(server.port, "GET", "/flights"))[1]["flights"][0]["flight_number"] == "SU-1001"
+                assert (await call(server.port, "POST", "/bookings", {"flight_number": "SU-1001", "passport": "AB123456"}))[0] == 201
+                assert (await call(server.port, "POST", "/bookings", {"flight_number": "SU-1001", "passport": "CD789012"}))[0] == 409
+                status, manifest = await call(server.port, "GET", "/flights/SU-1001/passengers")
+                assert [p["passport"] for p in manifest["passengers"]] == ["AB123456"]
+                assert (await call(server.port, "GET", "/flights/XX-0000"))[0] == 404
+                assert (await call(server.port, "GET", "/statistics"))[1]["booked_passengers"] == 1
+                assert "GET /flights/{id}/passengers" in (await call(server.port, "GET", "/metrics"))[1]
+                assert (await call(server.port, "GET", "/flights/SU%2D1001"))[1]["flight_number"] == "SU-1001"
+                assert (await call(server.port, "GET", "/flights?page_size=-1"))[1]["next"] == "SU-1001"
+                assert (await call(server.port, "GET", "/flights?page_size=x"))[0] == 400
+                assert (await call(server.port, "POST", "/bookings", []))[0] == 400
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(b"GARBAGE\r\n\r\n")
+                assert (await reader.read()).startswith(b"HTTP/1.1 400 Bad Request")
+                writer.close()
+            finally:
+                await server.stop()
+
+        asyncio.run(scenario())
+        system.close()
+
+
+class TestJournal:
+    def test_restart_from_snapshot_and_tail(self, tmp_path, monkeypatch):
+        db_name, journal_dir = str(tmp_path / "airport.db"), str(tmp_path / "journal")
+        system = AirportSystem(db_name, journal_dir=journal_dir, snapshot_interval=3)
+        aircraft = Aircraft("Boeing 737", 3, "RA-73651")
+        system.save_aircraft(aircraft)
+        flights = [Flight(f"SU-100{i}", "Москва", "СПб", f"2025-01-2{i} 08:00", aircraft, 90) for i in range(2)]
+        for flight in flights:
+            system.save_flight(flight)
+        passengers = [Passenger(f"AB00000{i}", "Иван", "Петров", "Иванович", "1985-05-15") for i in range(3)]
+        for passenger in passengers:
+            system.save_passenger(passenger)
+            system.booking.book(flights[0], passenger)
+            system.booking.book(flights[1], passenger)
+        system.booking.cancel_booking(flights[0], passengers[0])
+        system.cancel_flights(flight_numbers=["SU-1001"])
+        assert 0 < system.journal.pending < 3
+        system.journal.close()
+        monkeypatch.setattr(AirportSystem, "load_from_database", lambda self: pytest.fail("журнал не использован"))
+        restarted = AirportSystem(db_name, journal_dir=journal_dir)
+        assert [p.passport for p in restarted.registry.get_flight("SU-1000").get_passengers()] == ["AB000001", "AB000002"]
+        assert restarted.registry.get_flight("SU-1001").is_cancelled
+        assert restarted.registry.get_flight("SU-1001").passenger_count == 0
+        assert restarted.stats.snapshot().as_dict() == pytest.approx(system.stats.snapshot().as_dict())
+        restarted.close()
+        system.db.close()
+
+    def test_falls_back_to_database_after_unjournaled_writes(self, tmp_path):
+        db_name, journal_dir = str(tmp_path / "airport.db"), str(tmp_path / "journal")
+        system = AirportSystem(db_name, journal_dir=journal_dir)
+        aircraft = Aircraft("Boeing 737", 3, "RA-73651")
+        system.save_aircraft(aircraft)
+        for i in range(2):
+            system.save_flight(Flight(f"SU-100{i}", "Москва", "СПб", f"2025-01-2{i} 08:00", aircraft, 90))
+        system.save_passenger(Passenger("AB000001", "Иван", "Петров", "Иванович", "1985-05-15"))
+        system.close()
+        restarted = AirportSystem(db_name, journal_dir=journal_dir)
+        assert restarted.journal.watermark == restarted.data_version()
+        restarted.close()
+        batch = AirportSystem(db_name, lazy=True, preload=False)
+        batch.cancel_flights(flight_numbers=["SU-1001"])
+        assert batch.booking.book(batch.get_flight("SU-1000"), batch.get_passenger("AB000001"))
+        batch.close()
+        restarted = AirportSystem(db_name, journal_dir=journal_dir)
+        assert restarted.registry.get_flight("SU-1001").is_cancelled
+        assert [p.passport for p in restarted.registry.get_flight("SU-1000").get_passengers()] == ["AB000001"]
+        restarted.close()
+
+    def test_foreign_write_during_session_rebuilds_snapshot(self, tmp_path, monkeypatch):
+        db_name, journal_dir = str(tmp_path / "airport.db"), str(tmp_path / "journal")
+        system = AirportSystem(db_name, journal_dir=journal_dir)
+        aircraft = Aircraft("Boeing 737", 3, "RA-73651")
+        system.save_aircraft(aircraft)
+        system.save_flight(Flight("SU-1000", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90))
+        system.save_passenger(Passenger("AB000001", "Иван", "Петров", "Иванович", "1985-05-15"))
+        assert system.journal.pending == 3
+        batch = AirportSystem(db_name, lazy=True, preload=False)
+        assert batch.booking.book(batch.get_flight("SU-1000"), batch.get_passenger("AB000001"))
+        batch.close()
+        system.save_aircraft(Aircraft("Airbus A320", 4, "RA-32042"))
+        assert system.journal.pending == 0
+        system.close()
+        monkeypatch.setattr(AirportSystem, "load_from_database", lambda self: pytest.fail("журнал не использован"))
+        restarted = AirportSystem(db_name, journal_dir=journal_dir)
+        assert [p.passport for p in restarted.registry.get_flight("SU-1000").get_passengers()] == ["AB000001"]
+        assert restarted.registry.get_aircraft("RA-32042").capacity == 4
+        restarted.close()
+
+    def test_journal_requires_eager_mode(self, tmp_path):
+        import main
+        with pytest.raises(SystemExit):
+            main.main(["--db", str(tmp_path / "airport.db"), "--lazy", "--journal", str(tmp_path / "journal")])
+
+
+class TestAnalytics:
+    def test_load_factor_reports(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        small, large = Aircraft("Boeing 737", 2, "RA-73651"), Aircraft("Airbus A320", 4, "RA-32042")
+        system.save_aircraft(small)
+        system.save_aircraft(large)
+        flights = [Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", small, 90),
+                   Flight("SU-1002", "Москва", "СПб", "2025-02-20 08:30", large, 90),
+                   Flight("SU-1003", "СПб", "Москва", "2025-02-21 18:00", large, 90)]
+        for flight in flights:
+            system.save_flight(flight)
+        for i in range(3):
+            passenger = Passenger(f"AB00000{i}", "Иван", "Петров", "Иванович", "1985-05-15")
+            system.save_passenger(passenger)
+            system.booking.book(flights[0 if i < 2 else 1], passenger)
+        flights[2].cancel_flight()
+        system.save_flight_status(flights[2])
+        for columns in (FlightColumns.from_database(system.db), FlightColumns.from_flights(system.flights)):
+            analytics = LoadFactorAnalytics(columns)
+            assert analytics.by_route() == {("Москва", "СПб"): {"flights": 2, "passengers": 3, "seats": 6, "load_factor": 50.0}}
+            assert analytics.by_model()["Airbus A320"]["load_factor"] == 25.0
+            assert set(analytics.by_hour()) == {8}
+            assert set(analytics.by_month()) == {"2025-01", "2025-02"}
+            assert analytics.underfilled(1) == [("SU-1002", 25.0)]
+        system.close()
+
+
+class TestProfiler:
+    def test_disabled_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        assert system.profiler is None
+        assert "save_flight" not in vars(system)
+        assert not hasattr(Flight.add_passenger, "__wrapped__")
+        system.close()
+
+    def test_operations_and_sql_counts(self, tmp_path, monkeypatch):
+        path = tmp_path / "profile.prom"
+        monkeypatch.setenv(PROFILE_ENV, str(path))
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        system.save_aircraft(aircraft)
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90)
+        system.save_flight(flight)
+        for passport in ("AB123456", "CD789012"):
+            passenger = Passenger(passport, "Иван", "Петров", "Иванович", "1985-05-15")
+            system.save_passenger(passenger)
+            system.booking.book(flight, passenger)
+        system.export_report("csv", str(tmp_path / "report.csv"), background=False)
+        stats = system.profiler.as_dict()
+        assert stats["save_passenger"]["count"] == 2
+        assert stats["save_flight"]["sql_statements"] >= 1 and stats["save_flight"]["sql_rows"] >= 1
+        assert stats["booking.book"]["count"] == 2 and stats["booking.book"]["sql_rows"] >= 2
+        assert stats["Flight.add_passenger"]["count"] == 2
+        assert stats["ReportExporter.export"]["count"] == 1
+        assert stats["load_from_database"]["sql_statements"] >= 4
+        system.close()
+        assert not hasattr(Flight.add_passenger, "__wrapped__")
+        text = path.read_text(encoding="utf-8")
+        assert 'airport_operation_seconds_count{operation="save_passenger"} 2' in text
+        assert 'airport_sql_statements_total{operation="booking.book"}' in text
+
+    def test_shared_between_systems(self, tmp_path):
+        path = tmp_path / "profile.json"
+        profiler = Profiler(path=str(path))
+        first = AirportSystem(str(tmp_path / "first.db"), profiler=profiler)
+        second = AirportSystem(str(tmp_path / "second.db"), profiler=profiler)
+        assert profiler.attached == 2
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        second.save_aircraft(aircraft)
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90)
+        second.save_flight(flight)
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        second.save_passenger(passenger)
+        assert second.booking.book(flight, passenger)
+        stats = profiler.as_dict()
+        assert stats["Flight.add_passenger"]["count"] == 1
+        assert stats["booking.book"]["sql_rows"] >= 1
+        second.close()
+        assert hasattr(Flight.add_passenger, "__wrapped__") and not path.exists()
+        first.close()
+        assert not hasattr(Flight.add_passenger, "__wrapped__")
+        assert json.loads(path.read_text(encoding="utf-8"))["booking.book"]["count"] == 1
+
+
+class TestManifestGenerator:
+    def setup_method(self):
+        self.aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+
+    def test_per_flight_and_merged(self, tmp_path):
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        system.save_aircraft(self.aircraft)
+        for i, day in enumerate(("2025-01-20", "2025-01-21", "2025-02-01")):
+            flight = Flight(f"SU-100{i}", "Москва", "СПб", f"{day} 08:00", self.aircraft, 90)
+            system.save_flight(flight)
+            passenger = Passenger(f"AB00000{i}", "Иван", "Петров", "Иванович", "1985-05-15")
+            system.save_passenger(passenger)
+            system.booking.book(flight, passenger)
+        system.close()
+        generator = ManifestGenerator(db_name, workers=2, fmt="txt")
+        assert [len(s) for s in generator.shards(["a", "b", "c"])] == [1, 1, 1]
+        paths = generator.generate(str(tmp_path / "jan"), datetime(2025, 1, 1), datetime(2025, 2, 1))
+        assert sorted(os.path.basename(p) for p in paths) == ["SU-1000.txt", "SU-1001.txt"]
+        assert "AB000000" in open(paths[0], encoding="utf-8").read()
+        merged, = ManifestGenerator(db_name, workers=2, fmt="csv").generate(str(tmp_path / "all"), merged=True)
+        with open(merged, encoding="utf-8-sig") as f:
+            lines = f.read().splitlines()
+        assert [line.split(";")[0] for line in lines] == ["Рейс", "SU-1000", "SU-1001", "SU-1002"]
+        assert os.listdir(tmp_path / "all") == ["MANIFESTS.csv"]
+
+
+class TestBulkCancellation:
+    def populate(self, system):
+        aircraft = Aircraft("Boeing 737", 3, "RA-73651")
+        system.save_aircraft(aircraft)
+        routes = [("SU-1001", "Москва", "Сочи", "2025-01-20 08:00"), ("SU-1002", "Сочи", "Казань", "2025-01-20 14:00"),
+                  ("SU-1003", "Казань", "Москва", "2025-01-21 08:00"), ("SU-1004", "Москва", "Сочи", "2025-01-25 08:00")]
+        flights = []
+        for number, dep, dest, dep_time in routes:
+            flights.append(Flight(number, dep, dest, dep_time, aircraft, 90))
+            system.save_flight(flights[-1])
+        passengers = [Passenger(f"AB00000{i}", "Иван", "Петров", "Иванович", "1985-05-15") for i in range(3)]
+        for passenger in passengers:
+            system.save_passenger(passenger)
+            for flight in flights:
+                system.booking.book(flight, passenger)
+        return flights, passengers
+
+    def test_cancel_by_airport_and_window(self, tmp_path):
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        flights, passengers = self.populate(system)
+        report = system.cancel_flights(airport="Сочи", start=datetime(2025, 1, 20), end=datetime(2025, 1, 21))
+        assert sorted(report.flights) == ["SU-1001", "SU-1002"]
+        assert report.released == 6 and len(report.passengers) == 3
+        assert report.affected["AB000000"] == ["SU-1001", "SU-1002"]
+        assert flights[0].is_cancelled and flights[0].passenger_count == 0
+        assert system.history.flight_numbers("AB000000") == ["SU-1003", "SU-1004"]
+        assert "SU-1001" not in system.schedule
+        assert system.booking.booked_count("SU-1001") == 0
+        assert system.cancel_flights(airport="Сочи", end=datetime(2025, 1, 21)).flights == []
+        with pytest.raises(ValueError):
+            system.cancel_flights()
+        snapshot = system.stats.snapshot()
+        assert (snapshot.cancelled_flights, snapshot.booked_passengers) == (2, 6)
+        system.close()
+        lazy = AirportSystem(db_name, lazy=True)
+        lazy.get_flight("SU-1003").get_passengers()
+        report = lazy.cancel_flights(aircraft="RA-73651")
+        assert sorted(report.flights) == ["SU-1003", "SU-1004"]
+        assert lazy.stats.snapshot().as_dict() == AirportSystem(db_name).stats.snapshot().as_dict()
+        lazy.close()
+
+
+class TestObjectCache:
+    def test_lru_eviction_and_ttl(self):
+        now = [0.0]
+        cache = ObjectCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert "b" not in cache and cache.get("a") == 1
+        now[0] = 11
+        assert cache.get("a") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (2, 1, 1, 1)
+
+    def test_lazy_lookups_and_invalidation(self, tmp_path):
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        system.save_aircraft(aircraft)
+        for i in range(3):
+            system.save_flight(Flight(f"SU-100{i}", "Москва", "СПб", f"2025-01-2{i} 08:00", aircraft, 90))
+        system.save_passenger(Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15"))
+        system.close()
+        lazy = AirportSystem(db_name, lazy=True, cache_size=2)
+        flight = lazy.get_flight("SU-1000")
+        assert lazy.get_flight("SU-1000") is flight
+        lazy.get_flight("SU-1001")
+        lazy.get_flight("SU-1002")
+        assert "SU-1000" not in lazy.flight_cache and len(lazy.registry.flights) == 0
+        assert (lazy.cache_stats()["flights"]["hits"], lazy.cache_stats()["flights"]["misses"]) == (1, 3)
+        passenger = lazy.get_passenger("AB123456")
+        renamed = Passenger("AB123456", "Пётр", "Петров", "Иванович", "1985-05-15")
+        lazy.save_passenger(renamed)
+        assert lazy.get_passenger("AB123456") is renamed
+        lazy.booking.book(lazy.get_flight("SU-1001"), renamed)
+        lazy.cancel_flights(flight_numbers=["SU-1001"])
+        assert "SU-1001" not in lazy.flight_cache and "AB123456" not in lazy.passenger_cache
+        assert lazy.get_flight("SU-1001").is_cancelled
+        assert lazy.get_passenger("AB123456") is not passenger
+        lazy.close()
+
+
+class TestRouteNetwork:
+    def setup_method(self):
+        self.aircraft = Aircraft("Boeing 737", 1, "RA-73651")
+        self.other = Aircraft("Airbus A320", 2, "RA-32042")
+        self.spare = Aircraft("Sukhoi Superjet 100", 2, "RA-89001")
+
+    def test_earliest_arrival_and_k_best(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        system.save_aircraft(self.aircraft)
+        system.save_aircraft(self.other)
+        system.save_aircraft(self.spare)
+        schedule = [("SU-1", "Москва", "Казань", "2025-01-20 08:00", 90, self.aircraft),
+                    ("SU-2", "Казань", "Сочи", "2025-01-20 10:30", 120, self.aircraft),
+                    ("SU-3", "Казань", "Сочи", "2025-01-20 09:45", 60, self.spare),
+                    ("SU-4", "Москва", "Сочи", "2025-01-20 09:00", 240, self.other),
+                    ("SU-5", "Москва", "Сочи", "2025-01-20 15:00", 150, self.other)]
+        for number, dep, dest, dep_time, duration, aircraft in schedule:
+            system.save_flight(Flight(number, dep, dest, dep_time, aircraft, duration))
+        after = datetime(2025, 1, 20, 7, 0)
+        best = system.routes.earliest_arrival("Москва", "Сочи", after)
+        assert [f.flight_number for f in best.flights] == ["SU-1", "SU-2"]
+        assert best.connections[0].total_seconds() == 60 * 60
+        options = system.find_itineraries("Москва", "Сочи", after, k=3)
+        assert [[f.flight_number for f in i.flights] for i in options] == [["SU-1", "SU-2"], ["SU-4"], ["SU-5"]]
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        system.save_passenger(passenger)
+        assert system.book_itinerary(best, passenger)
+        assert system.find_itineraries("Москва", "Сочи", after, k=1)[0].legs == 1
+        assert not system.book_itinerary(best, Passenger("CD789012", "Мария", "Иванова", "Денисовна", "1990-08-22"))
+        system.cancel_flights(flight_numbers=["SU-4"])
+        assert "SU-4" not in system.routes
+        assert system.routes.earliest_arrival("Москва", "Сочи", after, seats=2).flights[0].flight_number == "SU-5"
+        system.close()
+        lazy = AirportSystem(str(tmp_path / "airport.db"), lazy=True)
+        lazy.load_routes()
+        assert [f.flight_number for f in lazy.routes.earliest_arrival("Москва", "Сочи", after).flights] == ["SU-5"]
+        lazy.close()
+
+
+class TestPassengerSearch:
+    def test_ranked_fuzzy_and_passport_prefix(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        for row in [("4501123456", "Фёдор", "Семёнов", "Петрович", "1985-05-15"),
+                    ("4501654321", "Фёдор", "Семенович", "Иванович", "1990-01-01"),
+                    ("4509000001", "Мария", "Иванова", "Денисовна", "1990-08-22")]:
+            system.save_passenger(Passenger(*row))
+        assert [p.passport for p in system.search_passengers("семенов федор")][:1] == ["4501123456"]
+        assert system.search_passengers("СЕМЁНОВ ФЁДОР ПЕТРОВИЧ")[0].passport == "4501123456"
+        assert system.search_passengers("Ивонова Мария")[0].passport == "4509000001"
+        assert {p.passport for p in system.search_passengers("4501")} == {"4501123456", "4501654321"}
+        assert system.search_passengers("Петров")[0] is system.get_passenger("4501123456")
+        system.save_passenger(Passenger("4509000001", "Мария", "Смирнова", "Денисовна", "1990-08-22"))
+        assert system.search_passengers("Смирнова")[0].passport == "4509000001"
+        assert system.search_passengers("") == []
+        system.close()
+
+    def test_fallback_without_fts_folds_cyrillic_case(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        system.save_passenger(Passenger("4501123456", "Фёдор", "Семёнов", "Петрович", "1985-05-15"))
+        search = PassengerSearch(system.db)
+        search._fts = False
+        assert [row[0] for row, _ in search.search("СЕМЕНОВ федор")] == ["4501123456"]
+        system.close()
+
+    def test_booking_flow_reuses_existing_passenger(self, tmp_path, monkeypatch):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        system.save_aircraft(aircraft)
+        flight = Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90)
+        system.save_flight(flight)
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        system.save_passenger(passenger)
+        answers = iter(["1", "петров иван", "1"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+        system.add_passenger_to_flight()
+        assert flight.get_passengers() == [passenger]
+        assert system.db.query("SELECT COUNT(*) FROM passengers")[0][0] == 1
+        system.close()
+
+
+class TestBatchCli:
+    def test_commands_without_prompts(self, tmp_path, capsys, monkeypatch):
+        import main
+        db_name = str(tmp_path / "airport.db")
+        system = AirportSystem(db_name)
+        aircraft = Aircraft("Boeing 737", 2, "RA-73651")
+        system.save_aircraft(aircraft)
+        system.save_flight(Flight("SU-1001", "Москва", "СПб", "2025-01-20 08:00", aircraft, 90))
+        system.save_passenger(Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15"))
+        system.close()
+        monkeypatch.setattr("builtins.input", lambda prompt="": pytest.fail("интерактивный ввод"))
+        assert main.main(["--db", db_name, "book", "SU-1001", "AB123456"]) == 0
+        assert main.main(["--db", db_name, "book", "SU-1001", "CD654321", "--surname", "Сидоров",
+                          "--name", "Пётр", "--born", "1990-01-01"]) == 0
+        assert main.main(["--db", db_name, "book", "SU-1001", "EF000000"]) == 1
+        assert main.main(["--db", db_name, "stats", "--json"]) == 0
+        assert '"booked_passengers": 2' in capsys.readouterr().out
+        assert main.main(["--db", db_name, "cancel"]) == 1
+        assert main.main(["--db", db_name, "cancel", "SU-1001"]) == 0
+        assert "снято бронирований: 2" in capsys.readouterr().out
+        assert main.main(["--db", db_name, "export", "csv", "--out", str(tmp_path / "report.csv")]) == 0
+        assert os.path.exists(tmp_path / "report.csv")
+
+    def test_batch_system_defers_loading(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"), lazy=True, preload=False)
+        assert not system.loaded and len(system.routes) == 0
+        system.close()
+
+
+class TestBookingHistory:
+    def test_paging_filters_and_aggregates(self, tmp_path):
+        system = AirportSystem(str(tmp_path / "airport.db"))
+        aircraft = Aircraft("Boeing 737", 10, "RA-73651")
+        system.save_aircraft(aircraft)
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        system.save_passenger(passenger)
+        legs = [("Москва", "Сочи", "2024-03-01 08:00"), ("Сочи", "Москва", "2024-03-05 08:00"),
+                ("Москва", "Сочи", "2025-01-20 08:00"), ("Москва", "Казань", "2025-02-01 08:00"),
+                ("Москва", "Сочи", "2025-06-10 08:00")]
+        flights = []
+        for i, (dep, dest, dep_time) in enumerate(legs, 1):
+            flights.append(Flight(f"SU-100{i}", dep, dest, dep_time, aircraft, 90))
+            system.save_flight(flights[-1])
+            system.booking.book(flights[-1], passenger)
+        history = system.history
+        assert history.count("AB123456") == 5
+        first = history.page("AB123456", page_size=2)
+        assert [e.flight_number for e in first] == ["SU-1005", "SU-1004"]
+        second = history.page("AB123456", page_size=2, after=first[-1].flight_number)
+        assert [e.flight_number for e in second] == ["SU-1003", "SU-1002"]
+        assert [len(page) for page in history.pages("AB123456", page_size=2)] == [2, 2, 1]
+        assert history.count("AB123456", start=datetime(2025, 1, 1), end=datetime(2025, 3, 1)) == 2
+        assert history.flights_per_year("AB123456") == {2024: 2, 2025: 3}
+        assert history.top_routes("AB123456", 1) == [(("Москва", "Сочи"), 3)]
+        system.booking.cancel_booking(flights[0], passenger)
+        system.cancel_flights(flight_numbers=["SU-1005"])
+        assert history.flight_numbers("AB123456") == ["SU-1002", "SU-1003", "SU-1004"]
+        assert history.summary("AB123456")["per_year"] == {2024: 1, 2025: 2}
+        assert history.count("XX000000") == 0
+        system.close()
+
+
+class TestSharding:
+    def test_router_and_scatter_gather(self, tmp_path, monkeypatch):
+        from main import open_shards
+        directory = str(tmp_path / "shards")
+        sharded = open_shards(directory, hubs={"Москва": "mow", "Сочи": "aer"}, workers=2)
+        aircraft = Aircraft("Boeing 737", 3, "RA-73651")
+        sharded.save_aircraft(aircraft)
+        passenger = Passenger("AB123456", "Иван", "Петров", "Иванович", "1985-05-15")
+        sharded.save_passenger(passenger)
+        legs = [("SU-1001", "Москва", "Сочи", "2024-12-20 08:00"), ("SU-1002", "Сочи", "Москва", "2025-01-05 08:00"),
+                ("SU-1003", "Казань", "Москва", "2025-01-10 08:00"), ("SU-1004", "Москва", "Сочи", "2025-02-01 08:00")]
+        for number, dep, dest, dep_time in legs:
+            sharded.save_flight(Flight(number, dep, dest, dep_time, aircraft, 90))
+            assert sharded.book(number, passenger.passport)
+        assert sorted(sharded.shards) == ["aer", "mow", "other"]
+        assert sharded.locate("SU-1003") == "other"
+        assert os.path.exists(sharded.shard_path("aer"))
+        assert not sharded.book("SU-1001", passenger.passport)
+        assert not sharded.book("SU-9999", passenger.passport)
+        history = sharded.history
+        assert history.count(passenger.passport) == 4
+        assert history.flight_numbers(passenger.passport) == ["SU-1001", "SU-1002", "SU-1003", "SU-1004"]
+        first = history.page(passenger.passport, page_size=3)
+        assert [e.flight_number for e in first] == ["SU-1004", "SU-1003", "SU-1002"]
+        assert [e.flight_number for e in history.page(passenger.passport, page_size=3, after="SU-1002")] == ["SU-1001"]
+        assert history.flights_per_year(passenger.passport) == {2024: 1, 2025: 3}
+        assert history.top_routes(passenger.passport, 1) == [(("Москва", "Сочи"), 2)]
+        report = sharded.cancel_flights(departure="Москва")
+        assert sorted(report.flights) == ["SU-1001", "SU-1004"] and report.released == 2
+        snapshot = sharded.statistics()
+        assert (snapshot.aircrafts, snapshot.passengers, snapshot.flights, snapshot.cancelled_flights,
+                snapshot.booked_passengers) == (1, 1, 4, 2, 2)
+        monkeypatch.setattr(AirportSystem, "refresh_statistics", lambda self: pytest.fail("полный пересчёт статистики"))
+        sharded.save_passenger(Passenger("CD789012", "Мария", "Иванова", "Денисовна", "1990-08-22"))
+        assert sharded.book("SU-1003", "CD789012")
+        assert sharded.statistics().booked_passengers == 3
+        monkeypatch.undo()
+        sharded.close()
+        profile = tmp_path / "profile.json"
+        reopened = open_shards(directory, "airport", {"Москва": "mow", "Сочи": "aer"}, profiler=Profiler(path=str(profile)))
+        assert sorted(reopened.shards) == ["aer", "mow", "other"]
+        assert reopened.profiler.attached == 4 and reopened.common.profiler is None
+        assert reopened.get_flight("SU-1002").passenger_count == 1
+        assert reopened.cancel_booking("SU-1002", passenger.passport) and reopened.book("SU-1002", passenger.passport)
+        assert reopened.profiler.as_dict()["Flight.add_passenger"]["count"] == 1
+        with pytest.raises(ValueError):
+            reopened.save_flight(Flight("SU-1003", "Москва", "Казань", "2025-01-10 08:00", aircraft, 90))
+        counts = reopened.scatter(lambda s: s.db.query("SELECT COUNT(*) FROM flights WHERE flight_number = 'SU-1003'"))
+        assert counts == {"aer": [(0,)], "mow": [(0,)], "other": [(1,)]}
+        reopened.close()
+        assert not hasattr(Flight.add_passenger, "__wrapped__")
+        assert json.loads(profile.read_text(encoding="utf-8"))["booking.book"]["count"] == 1
+
+    def test_month_strategy(self):
+        router = ShardRouter("month")
+        assert router.shard_for("Москва", datetime(2025, 3, 1, 8)) == "2025-03"
+        with pytest.raises(ValueError):
+            ShardRouter("hash")